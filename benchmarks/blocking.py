@@ -0,0 +1,56 @@
+# coding=utf-8
+""" Pairs checked by the string and head sieves with and without the blocking
+of the candidates.
+
+Resolves synthetic NAF documents of growing size twice, with the candidate
+blocking of the ESM, RSM, SHM* and RHM sieves and without it, and reports for
+each of these sieves the pairs checked and the time. The output of both runs
+is checked to be the same.
+
+Usage: python benchmarks/blocking.py [words per sentence] [sentences...]
+"""
+
+import io
+import sys
+
+from synthetic import build_naf
+from corefgraph.process.file import generate_parser, Pipeline
+from corefgraph.multisieve.sieves.stringMatch import ExactStringMatch
+from corefgraph.multisieve.sieves.headMatch import StrictHeadMatching
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+SIEVES = ("ESM", "RSM", "SHMA", "SHMB", "SHMC", "SHMD", "RHM")
+BLOCKED = (ExactStringMatch, StrictHeadMatching)
+
+
+def resolve(pipeline, document, blocking):
+    """ Resolve the document with the blocking of the sieves on or off.
+
+    :return: The output and the timings of the stages by name.
+    """
+    for sieve_class in BLOCKED:
+        sieve_class.BLOCKING = blocking
+    output = io.BytesIO()
+    pipeline.process(document, output, document_id="document#0")
+    timings = dict((stage["stage"], stage) for stage in pipeline.processor.get_timings())
+    return output.getvalue(), timings
+
+
+def main(words_per_sentence=20, *sizes):
+    pipeline = Pipeline(generate_parser().parse_args(["--writer", "CONLL"]))
+    print("{0:<10}{1:<8}{2:>12}{3:>12}{4:>12}{5:>12}".format(
+        "sentences", "sieve", "pairs", "blocked", "time (s)", "blocked"))
+    for sentences in sizes or (10, 20, 40):
+        naf, penn, speakers = build_naf(sentences, words_per_sentence)
+        output, timings = resolve(pipeline, (naf, None, speakers), False)
+        blocked_output, blocked_timings = resolve(pipeline, (naf, None, speakers), True)
+        assert output == blocked_output
+        for name in SIEVES:
+            stage, blocked_stage = timings["sieve " + name], blocked_timings["sieve " + name]
+            print("{0:<10}{1:<8}{2:>12}{3:>12}{4:>12.3f}{5:>12.3f}".format(
+                sentences, name, stage["pairs"], blocked_stage["pairs"], stage["wall"], blocked_stage["wall"]))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,106 @@
+# coding=utf-8
+""" A fake IXA POS server, to use and benchmark the multiword expansion
+offline.
+
+The server reads NAF documents ended by the closing tag of the root and replies
+each one with its words tagged: the lemma is the lowercase form and the POS is
+NP00000 for the capitalized words and NCMS000 for the rest. The connections are
+kept open, unless keep_alive is off, and each reply is delayed by the given
+latency.
+
+Usage: python benchmarks/fakepos.py [port] [latency ms]
+"""
+
+import sys
+import threading
+import time
+
+try:
+    import SocketServer as socketserver
+except ImportError:
+    import socketserver
+
+from lxml import etree
+from pynaf import NAFDocument
+
+from corefgraph.posclient import TERMINATOR
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+def tag(request):
+    """ Tag the words of a NAF document.
+
+    :param request: The NAF document.
+    :return: The tagged NAF document.
+    """
+    # pynaf can not read a document without terms
+    root = etree.fromstring(request)
+    reply = NAFDocument(language=root.attrib.get(NAFDocument.LANGUAGE_ATTRIBUTE))
+    words = root.findall("{0}/{1}".format(NAFDocument.TEXT_LAYER_TAG, NAFDocument.WORD_OCCURRENCE_TAG))
+    for index, word in enumerate(words):
+        attributes = dict(word.attrib)
+        word_id = attributes.pop(NAFDocument.WORD_ID_ATTRIBUTE)
+        reply.add_word(word.text, word_id, **attributes)
+        reply.add_term(
+            "t{0}".format(index), lemma=word.text.lower(),
+            morphofeat="NP00000" if word.text[:1].isupper() else "NCMS000",
+            words=[word_id])
+    return str(reply)
+
+
+class FakePOSHandler(socketserver.BaseRequestHandler):
+    """ Reply the documents of a connection until it is closed."""
+
+    def handle(self):
+        pending = b""
+        while True:
+            data = self.request.recv(65536)
+            if not data:
+                return
+            pending += data
+            while TERMINATOR in pending:
+                request, pending = pending.split(TERMINATOR, 1)
+                self.server.requests += 1
+                if self.server.latency:
+                    time.sleep(self.server.latency)
+                self.request.sendall(tag(request + TERMINATOR))
+                if not self.server.keep_alive:
+                    return
+
+
+class FakePOSServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """ The fake server, that runs in a thread with start."""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=0, latency=0.0, keep_alive=True):
+        """
+        :param port: The port of the server, any free one if 0.
+        :param latency: The seconds each reply is delayed.
+        :param keep_alive: Keep the connections open after each reply.
+        """
+        socketserver.TCPServer.__init__(self, ("127.0.0.1", port), FakePOSHandler)
+        self.latency = latency
+        self.keep_alive = keep_alive
+        self.requests = 0
+
+    def start(self):
+        """ Serve in a daemon thread.
+
+        :return: The port of the server.
+        """
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self.server_address[1]
+
+
+def main(port=1337, latency=0):
+    server = FakePOSServer(port, latency / 1000.0)
+    print("Fake POS server in port {0}".format(server.server_address[1]))
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
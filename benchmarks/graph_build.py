@@ -0,0 +1,65 @@
+# coding=utf-8
+""" Graph building time and peak memory of a document.
+
+Builds the graph of a NAF document (for example a CoNLL-2012 dev document
+converted to NAF) twice, each time in a fresh process: with word edges from
+every constituent to its words, and with constituents that only keep their
+span over the sentence words.
+
+Usage: python benchmarks/graph_build.py document.naf [repetitions]
+"""
+
+import codecs
+import multiprocessing
+import resource
+import sys
+import time
+
+from corefgraph import properties
+properties.set_lang("en_conll", "utf-8")
+
+from corefgraph.graph.nafbuilder import NafAndTreeGraphBuilder
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+def build(text, constituent_word_edges, repetitions, results):
+    """ Build the graph of the document and put the measures in results."""
+    NafAndTreeGraphBuilder.constituent_word_edges = constituent_word_edges
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    times = []
+    for repetition in range(repetitions):
+        start = time.time()
+        builder = NafAndTreeGraphBuilder("NAF")
+        builder.process_document((text, None, None))
+        for index, sentence in enumerate(builder.get_sentences()):
+            builder.process_sentence(
+                sentence=sentence, sentence_namespace="text@{0}".format(index),
+                root_index=index)
+        times.append(time.time() - start)
+        graph = builder.graph
+    results.put((
+        min(times), graph.number_of_nodes(), graph.number_of_edges(),
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0,
+        (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start_rss) / 1024.0))
+
+
+def main(document, repetitions=3):
+    with codecs.open(document, "r", "utf-8") as document_file:
+        text = document_file.read()
+    print("{0:<25}{1:>10}{2:>10}{3:>10}{4:>15}{5:>12}".format(
+        "representation", "time (s)", "nodes", "edges", "peak RSS (MB)", "build (MB)"))
+    for name, constituent_word_edges in (("constituent word edges", True),
+                                         ("word spans", False)):
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=build, args=(text, constituent_word_edges, repetitions, results))
+        process.start()
+        build_time, nodes, edges, rss, build_rss = results.get()
+        process.join()
+        print("{0:<25}{1:>10.3f}{2:>10}{3:>10}{4:>15.1f}{5:>12.1f}".format(
+            name, build_time, nodes, edges, rss, build_rss))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1], *[int(arg) for arg in sys.argv[2:3]])
@@ -0,0 +1,69 @@
+# coding=utf-8
+""" Micro-benchmark of the typed neighbour lookups of the graph.
+
+Compares the typed adjacency index of GraphWrapper with the previous
+implementation, that scanned every in/out edge of the node and compared the
+edge key.
+
+Usage: python benchmarks/graph_lookup.py [sentences] [repetitions]
+"""
+
+import sys
+import timeit
+
+from corefgraph.constants import ID
+from corefgraph.graph.wrapper import GraphWrapper
+from synthetic import build_document
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+def scan_out_neighbours(graph, node, relation_type):
+    """ Edge scan version of get_out_neighbours_by_relation_type."""
+    return [graph.node[target] for source, target, key in graph.out_edges(node[ID], keys=True)
+            if key == relation_type]
+
+
+def scan_in_neighbour(graph, node, relation_type):
+    """ Edge scan version of get_in_neighbour_by_relation_type."""
+    for source, target, key in graph.in_edges(node[ID], keys=True):
+        if key == relation_type:
+            return graph.node[source]
+    return None
+
+
+def main(sentences=100, repetitions=5):
+    builder = build_document(sentences)
+    graph = builder.graph
+    roots = builder.get_all_sentences()
+    elements = builder.get_all_words() + builder.get_all_constituents()
+    cases = (
+        ("get_root", lambda: [
+            GraphWrapper.get_in_neighbour_by_relation_type(graph, e, builder.root_edge_type)
+            for e in elements],
+            lambda: [scan_in_neighbour(graph, e, builder.root_edge_type) for e in elements]),
+        ("get_syntactic_parent", lambda: [
+            GraphWrapper.get_in_neighbour_by_relation_type(graph, e, builder.syntactic_edge_type)
+            for e in elements],
+            lambda: [scan_in_neighbour(graph, e, builder.syntactic_edge_type) for e in elements]),
+        ("get_words", lambda: [
+            GraphWrapper.get_out_neighbours_by_relation_type(graph, e, builder.word_edge_type)
+            for e in elements],
+            lambda: [scan_out_neighbours(graph, e, builder.word_edge_type) for e in elements]),
+        ("get_syntactic_children(root)", lambda: [
+            GraphWrapper.get_out_neighbours_by_relation_type(graph, r, builder.syntactic_edge_type)
+            for r in roots],
+            lambda: [scan_out_neighbours(graph, r, builder.syntactic_edge_type) for r in roots]),
+    )
+    print("{0} sentences, {1} nodes, {2} edges".format(
+        sentences, graph.number_of_nodes(), graph.number_of_edges()))
+    print("{0:<30}{1:>12}{2:>12}{3:>10}".format("lookup", "scan (s)", "index (s)", "speed-up"))
+    for name, indexed, scan in cases:
+        indexed_time = min(timeit.repeat(indexed, number=1, repeat=repetitions))
+        scan_time = min(timeit.repeat(scan, number=1, repeat=repetitions))
+        print("{0:<30}{1:>12.4f}{2:>12.4f}{3:>9.1f}x".format(
+            name, scan_time, indexed_time, scan_time / indexed_time))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,162 @@
+# coding=utf-8
+""" Scaling of the document ingestion and the mention traversal.
+
+Builds synthetic documents of growing size (long documents of short sentences
+and documents of a few very long sentences) and measures:
+ - The NAF ingestion, with the NAF trees and speakers.
+ - The NAF ingestion with Penn Treebank trees.
+ - The breadth-first and deep-first mention traversals of the extractors,
+   compared with the previous traversals, that consumed a list from its
+   front.
+
+Each time is reported with its ratio to the time of the previous size; a
+linear step doubles the time.
+
+Usage: python benchmarks/linear_scaling.py [repetitions]
+"""
+
+import sys
+import timeit
+
+from synthetic import build_naf
+from corefgraph.constants import ID, SPAN, TAG
+from corefgraph.graph.nafbuilder import NafAndTreeGraphBuilder
+from corefgraph.multisieve.extractors.base import BreathFistSimple, DeepFirstSimple
+from corefgraph.resources.tagset import constituent_tags
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+SIZES = (
+    ("document", ((500, 25), (1000, 25), (2000, 25))),
+    ("sentence", ((4, 1250), (4, 2500), (4, 5000))),
+)
+
+
+def build_graph(document):
+    """ Build the graph of a document.
+
+    :param document: The tuple of the NAF, the trees and the speakers.
+    :return: The graph builder and the sentence roots.
+    """
+    builder = NafAndTreeGraphBuilder("NAF")
+    builder.process_document(document)
+    roots = [builder.process_sentence(
+        sentence=sentence, sentence_namespace="text@{0}".format(index), root_index=index)
+        for index, sentence in enumerate(builder.get_sentences())]
+    return builder, roots
+
+
+class PreviousBreadth(BreathFistSimple):
+    """ The breadth-first traversal over a list."""
+
+    def _extract_mentions(self, order, nodes, validation, named_entities_by_constituent, gold_mentions_by_constituent):
+        # Process all the nodes
+        visited = []
+        while nodes:
+            # Extract the first candidate
+            node = nodes.pop(0)
+            visited.append(node)
+            # Constituents Gold mentions
+            for gold in gold_mentions_by_constituent.get(node[ID], []):
+                # check if is an accepted mention
+                if validation(gold, order):
+                    # Add it to the order
+                    order.append(gold)
+            # Search in the constituent named entities
+            for ner in named_entities_by_constituent.get(node[ID], []):
+                # check the entity
+                if validation(ner, order):
+                    order.append(ner)
+            # Check the Constituents or word
+            if validation(node, order):
+                order.append(node)
+            # Order the children of the nodes
+            if self.SUBORDINATE_RESTART and constituent_tags.clause(node.get(TAG)):
+                self.extract(order, node, validation, named_entities_by_constituent, gold_mentions_by_constituent)
+            else:
+                # Order the children of the nodes
+                ordered_children = sorted(
+                    self.graph_builder.get_syntactic_children_sorted(node),
+                    key=lambda child: child[SPAN])
+                # Add the children to the search
+                nodes.extend(ordered_children)
+
+
+class PreviousDeep(DeepFirstSimple):
+    """ The deep-first traversal over a list."""
+
+    def _extract_mentions(self, order, nodes, validation, named_entities_by_constituent, gold_mentions_by_constituent):
+        # The ordered nodes of the constituent tha can be candidates
+
+        # Process all the nodes
+        while nodes:
+            # Extract the first candidate
+            node = nodes.pop(0)
+            # Constituents Gold mentions
+            for gold in gold_mentions_by_constituent.get(node[ID], []):
+                # check if is an accepted mention
+                if validation(gold, order):
+                    # Add it to the order
+                    order.append(gold)
+            # constituent entities
+            # Fetch constituents NES
+            for ner in named_entities_by_constituent.get(node[ID], []):
+                # check if is an accepted mention
+                if validation(ner, order):
+                    # Add it to the order
+                    order.append(ner)
+            # Constituents and words
+            # check if is an accepted mention
+            if validation(node, order):
+                # add it to the order
+                order.append(node)
+            # Are clause  traversed in same way as roots?
+            if self.SUBORDINATE_RESTART and constituent_tags.clause(node.get(TAG)):
+                # start a new search for the clause
+                self.extract(order, node, validation, named_entities_by_constituent, gold_mentions_by_constituent)
+            else:
+                # Order the children of the nodes
+                ordered_children = self.graph_builder.get_syntactic_children_sorted(node)
+                # Add the children to the search
+                nodes = ordered_children + nodes
+
+
+def traverse(graph_builder, roots, extractor_class):
+    """ Collect every node of the sentences with an extractor."""
+    extractor = extractor_class(graph_builder)
+    order = []
+    for root in roots:
+        extractor.extract(order, root, lambda mention, mentions: True, {}, {})
+    return order
+
+
+def main(repetitions=3):
+    print("{0:<10}{1:>8}{2:>8}  {3:<22}{4:>10}{5:>8}".format(
+        "shape", "tokens", "words", "measure", "time (s)", "ratio"))
+    for shape, sizes in SIZES:
+        previous_times = {}
+        for sentences, words in sizes:
+            naf, penn, speakers = build_naf(sentences, words)
+            builder, roots = build_graph((naf, None, speakers))
+            for current, previous in ((BreathFistSimple, PreviousBreadth),
+                                      (DeepFirstSimple, PreviousDeep)):
+                assert traverse(builder, roots, current) == \
+                    traverse(builder, roots, previous)
+            measures = (
+                ("NAF ingestion", lambda: build_graph((naf, None, speakers))),
+                ("Penn ingestion", lambda: build_graph((naf, penn, speakers))),
+                ("breadth-first", lambda: traverse(builder, roots, BreathFistSimple)),
+                ("breadth-first previous", lambda: traverse(builder, roots, PreviousBreadth)),
+                ("deep-first", lambda: traverse(builder, roots, DeepFirstSimple)),
+                ("deep-first previous", lambda: traverse(builder, roots, PreviousDeep)),
+            )
+            for name, measure in measures:
+                measure_time = min(timeit.repeat(measure, number=1, repeat=repetitions))
+                ratio = measure_time / previous_times[name] if name in previous_times else 1.0
+                previous_times[name] = measure_time
+                print("{0:<10}{1:>8}{2:>8}  {3:<22}{4:>10.3f}{5:>8.2f}".format(
+                    shape, sentences * words, words, name, measure_time, ratio))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
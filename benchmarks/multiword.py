@@ -0,0 +1,81 @@
+# coding=utf-8
+""" Cost of the multiword expansion with the fake POS server.
+
+Expands the multiwords of synthetic documents in three modes and compares the
+time per document:
+ - token: A new connection and a request for each multiword, as the
+   annotator did before.
+ - batch: A request for the multiwords of each document, over a pooled
+   connection.
+ - cache: As batch, but the expansions are kept in the LRU cache shared by
+   the documents.
+
+The expansions of the three modes are checked to be the same.
+
+Usage: python benchmarks/multiword.py [documents] [multiwords per document] [vocabulary] [latency ms]
+"""
+
+import random
+import sys
+import timeit
+from time import time
+
+from fakepos import FakePOSServer
+from corefgraph.posclient import POSClient
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+PARTS = ("Banco", "de", "España", "Real", "Madrid", "Comunidad", "Valenciana",
+         "Partido", "Popular", "Naciones", "Unidas", "sin", "embargo", "a", "pesar")
+
+
+def build_documents(documents, multiwords, vocabulary):
+    """ Documents of multiwords taken from a vocabulary of multiwords."""
+    generator = random.Random(1337)
+    forms = ["_".join(generator.choice(PARTS) for _ in range(generator.randint(2, 4))) + "_{0}".format(index)
+             for index in range(vocabulary)]
+    return [[generator.choice(forms) for _ in range(multiwords)] for _ in range(documents)]
+
+
+def expand(client, corpus, batch):
+    """ Expand the multiwords of each document."""
+    results = []
+    for forms in corpus:
+        deadline = time() + 60
+        if batch:
+            expansions = client.expand(forms, deadline)
+        else:
+            expansions = {}
+            for form in forms:
+                expansions.update(client.expand([form], deadline))
+        results.append(expansions)
+    return results
+
+
+def main(documents=20, multiwords=50, vocabulary=200, latency=2):
+    corpus = build_documents(documents, multiwords, vocabulary)
+    server = FakePOSServer(latency=latency / 1000.0)
+    port = server.start()
+    print("{0} documents of {1} multiwords from {2}, {3} ms of latency".format(
+        documents, multiwords, vocabulary, latency))
+    print("{0:<10}{1:>12}{2:>12}{3:>12}{4:>12}".format("mode", "ms/doc", "ratio", "requests", "hit rate"))
+    results = []
+    base_time = None
+    for mode, pool_size, cache_size, batch in (
+            ("token", 0, 0, False), ("batch", 2, 0, True), ("cache", 2, 10000, True)):
+        client = POSClient(port=port, language="es", pool_size=pool_size, cache_size=cache_size)
+        results.append(expand(client, corpus, batch))
+        elapsed = min(timeit.repeat(lambda: expand(client, corpus, batch), number=1, repeat=3))
+        base_time = base_time or elapsed
+        stats = client.get_stats()
+        asked = stats["cache_hits"] + stats["cache_misses"]
+        print("{0:<10}{1:>12.2f}{2:>11.2f}x{3:>12}{4:>11.1f}%".format(
+            mode, elapsed / documents * 1000, elapsed / base_time, stats["requests"],
+            100.0 * stats["cache_hits"] / (asked or 1)))
+        client.close()
+    server.shutdown()
+    assert results[0] == results[1] == results[2]
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:5]])
@@ -0,0 +1,60 @@
+# coding=utf-8
+""" Peak memory of the ingestion of a NAF document.
+
+Builds the graph of a NAF document in a fresh process for each mode: streaming
+the document with the incremental reader, and keeping the whole pynaf DOM of
+the document alive while the graph is built, as the builder did before.
+
+Usage: python benchmarks/naf_ingestion.py document.naf
+"""
+
+import codecs
+import multiprocessing
+import resource
+import sys
+import time
+
+from corefgraph import properties
+properties.set_lang("en_conll", "utf-8")
+
+from corefgraph.graph.nafbuilder import NafAndTreeGraphBuilder
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+def build(text, keep_dom, results):
+    """ Build the graph of the document and put the measures in results."""
+    start_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    builder = NafAndTreeGraphBuilder("NAF")
+    builder.process_document((text, None, None))
+    if keep_dom:
+        builder.get_original()
+    for index, sentence in enumerate(builder.get_sentences()):
+        builder.process_sentence(
+            sentence=sentence, sentence_namespace="text@{0}".format(index),
+            root_index=index)
+    build_time = time.time() - start
+    results.put((
+        build_time, builder.graph.number_of_nodes(),
+        (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start_rss) / 1024.0))
+
+
+def main(document):
+    with codecs.open(document, "r", "utf-8") as document_file:
+        text = document_file.read()
+    print("{0:<20}{1:>10}{2:>10}{3:>12}".format(
+        "ingestion", "time (s)", "nodes", "build (MB)"))
+    for name, keep_dom in (("DOM", True), ("streamed", False)):
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=build, args=(text, keep_dom, results))
+        process.start()
+        build_time, nodes, build_rss = results.get()
+        process.join()
+        print("{0:<20}{1:>10.3f}{2:>10}{3:>12.1f}".format(
+            name, build_time, nodes, build_rss))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -0,0 +1,85 @@
+# coding=utf-8
+""" Corpus throughput of the reusable pipeline.
+
+Resolves a corpus of short synthetic NAF documents in two ways and compares
+the documents per second:
+ - Per document: a new pipeline for each document, as the file processor and
+   the corpus processor did before. The language, the options, the sieves,
+   the catchers, the filters, the purges and the annotators are loaded again
+   for each document.
+ - Pipeline: one pipeline, loaded once, that only clears the state of the
+   previous document.
+
+The output of both ways is checked to be the same for every document. The
+per document setup cost, loading a pipeline or clearing the state of a loaded
+one, is also reported.
+
+Usage: python benchmarks/pipeline_throughput.py [documents] [sentences] [words per sentence] [meta]
+"""
+
+import io
+import sys
+import time
+import timeit
+
+from synthetic import build_naf
+from corefgraph.process.file import generate_parser, process, Pipeline
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+def per_document(documents, arguments):
+    """ Resolve each document with a new pipeline."""
+    parser = generate_parser()
+    outputs = []
+    for index, (naf, penn, speakers) in enumerate(documents):
+        config = parser.parse_args(arguments + ["--document_id", "doc{0}".format(index)])
+        output = io.BytesIO()
+        meta = process(config, naf, None, speakers, output)
+        outputs.append((output.getvalue(), meta))
+    return outputs
+
+
+def reused(documents, arguments):
+    """ Resolve every document with the same pipeline."""
+    pipeline = Pipeline(generate_parser().parse_args(arguments))
+    outputs = []
+    for index, (naf, penn, speakers) in enumerate(documents):
+        output = io.BytesIO()
+        meta = pipeline.process(
+            (naf, None, speakers), output, document_id="doc{0}".format(index))
+        outputs.append((output.getvalue(), meta))
+    return outputs
+
+
+def main(documents=1000, sentences=3, words_per_sentence=8, meta=0):
+    corpus = [build_naf(sentences, words_per_sentence) for _ in range(documents)]
+    arguments = ["--writer", "CONLL"] + (["--meta_json"] if meta else [])
+    print("{0} documents of {1} sentences of {2} words{3}".format(
+        documents, sentences, words_per_sentence, ", with meta" if meta else ""))
+    print("{0:<16}{1:>10}{2:>14}{3:>10}".format(
+        "mode", "time (s)", "documents/s", "ms/doc"))
+    results = []
+    for name, function in (("per document", per_document), ("pipeline", reused)):
+        start = time.time()
+        results.append(function(corpus, arguments))
+        elapsed = time.time() - start
+        print("{0:<16}{1:>10.2f}{2:>14.1f}{3:>10.2f}".format(
+            name, elapsed, documents / elapsed, elapsed / documents * 1000))
+    assert results[0] == results[1]
+
+    parser = generate_parser()
+    pipeline = Pipeline(parser.parse_args(arguments))
+    pipeline.processor.reset_graph()
+
+    def load():
+        Pipeline(parser.parse_args(arguments)).processor.reset_graph()
+
+    load_time = min(timeit.repeat(load, number=100, repeat=3)) / 100
+    reset_time = min(timeit.repeat(pipeline.processor.reset_graph, number=100, repeat=3)) / 100
+    print("setup per document: load {0:.3f} ms, reset {1:.3f} ms".format(
+        load_time * 1000, reset_time * 1000))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:5]])
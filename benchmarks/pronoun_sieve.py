@@ -0,0 +1,147 @@
+# coding=utf-8
+""" Micro-benchmark of the attribute agreement of the pronoun sieve.
+
+Compares the per-pair cost of Sieve.agree_attributes using the attribute
+aggregates kept by the EntityStore with the previous implementation, that
+rebuilt the gender, number, animacy and NE sets from every mention of both
+entities for each pair.
+
+Usage: python benchmarks/pronoun_sieve.py [entities] [entity size] [repetitions]
+"""
+
+import random
+import sys
+import timeit
+
+import synthetic  # Sets the language
+from corefgraph.constants import ID, SPAN, NER
+from corefgraph.multisieve.entities import EntityStore
+from corefgraph.multisieve.features.constants import GENDER, NUMBER, ANIMACY, \
+    UNKNOWN, MALE, FEMALE, NEUTRAL, SINGULAR, PLURAL, ANIMATE, INANIMATE
+from corefgraph.multisieve.sieves.pronounMatch import PronounMatch
+from corefgraph.resources.tagset import ner_tags
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+class PreviousPronounMatch(PronounMatch):
+    """ PronounMatch with the attribute sets rebuilt for each pair."""
+
+    def entity_property(self, entity, property_name):
+        combined_property = set(
+            (mention.get(property_name, UNKNOWN) for mention in entity))
+        if len(combined_property) > 1:
+            combined_property = combined_property.difference(
+                self.UNKNOWN_VALUES)
+        if len(combined_property) == 0:
+            combined_property.add(UNKNOWN)
+        return combined_property
+
+    def entity_ne(self, entity):
+        combined_property = set(
+            (mention.get(NER, None) for mention in entity))
+        return set(ner for ner in combined_property if ner_tags.mention_ner(ner))
+
+    def agree_attributes(self, entity, candidate_entity):
+        candidate_gender = self.entity_property(candidate_entity, GENDER)
+        entity_gender = self.entity_property(entity, GENDER)
+        if not (self.UNKNOWN_VALUES.intersection(entity_gender) or
+                self.UNKNOWN_VALUES.intersection(candidate_gender)):
+            if candidate_gender.difference(entity_gender) \
+                    and entity_gender.difference(candidate_gender):
+                self.logger.debug(
+                    "Gender disagree %s %s",
+                    entity_gender, candidate_gender)
+                return False
+
+        candidate_number = self.entity_property(candidate_entity, NUMBER)
+        entity_number = self.entity_property(entity, NUMBER)
+        if not(self.UNKNOWN_VALUES.intersection(entity_number) or
+                self.UNKNOWN_VALUES.intersection(candidate_number)):
+            if candidate_number.difference(entity_number) \
+                    and entity_number.difference(candidate_number):
+                self.logger.debug(
+                    "Number disagree %s %s",
+                    entity_number, candidate_number)
+                return False
+
+        candidate_animacy = self.entity_property(candidate_entity, ANIMACY)
+        entity_animacy = self.entity_property(entity, ANIMACY)
+        if not(self.UNKNOWN_VALUES.intersection(entity_animacy) or
+                self.UNKNOWN_VALUES.intersection(candidate_animacy)):
+            if candidate_animacy.difference(entity_animacy) \
+                    and entity_animacy.difference(candidate_animacy):
+                self.logger.debug(
+                    "Animacy disagree %s %s",
+                    entity_animacy, candidate_animacy)
+                return False
+
+        candidate_ner = self.entity_ne(candidate_entity)
+        entity_ner = self.entity_ne(entity)
+        if not(entity_ner is None or candidate_ner is None):
+            if candidate_ner.difference(entity_ner) and \
+                    entity_ner.difference(candidate_ner):
+                self.logger.debug(
+                    "NER disagree %s %s",
+                    entity_ner, candidate_ner)
+                return False
+        return True
+
+
+def build_entities(entities, entity_size, seed=0):
+    """ Build a store with random mentions merged in entities of the same
+    size.
+
+    :param entities: Number of entities.
+    :param entity_size: Mentions in each entity.
+    :param seed: Seed of the random attributes.
+    :return: The store and the list of entities.
+    """
+    rng = random.Random(seed)
+    store = EntityStore()
+    result = []
+    for index_entity in range(entities):
+        mentions = []
+        for index_mention in range(entity_size):
+            mention = {
+                ID: "m{0}_{1}".format(index_entity, index_mention),
+                SPAN: (index_mention * entities + index_entity,) * 2,
+                GENDER: rng.choice((MALE, FEMALE, NEUTRAL, UNKNOWN)),
+                NUMBER: rng.choice((SINGULAR, PLURAL, UNKNOWN)),
+                ANIMACY: rng.choice((ANIMATE, INANIMATE, UNKNOWN)),
+                NER: rng.choice(("PERSON", "ORG", "O")),
+            }
+            store.add(mention)
+            mentions.append(mention)
+        for mention in mentions[1:]:
+            store.merge(mentions[0], mention)
+        result.append(store.get_entity(mentions[0])[1])
+    return store, result
+
+
+def main(entities=200, entity_size=8, repetitions=5):
+    store, entity_list = build_entities(entities, entity_size)
+    pairs = [(entity_a, entity_b)
+             for index, entity_a in enumerate(entity_list)
+             for entity_b in entity_list[:index]]
+    print("{0} entities of {1} mentions, {2} pairs".format(
+        entities, entity_size, len(pairs)))
+    print("{0:<30}{1:>14}{2:>14}{3:>10}".format(
+        "sieve", "previous (us)", "cached (us)", "speed-up"))
+    previous = PreviousPronounMatch(meta_info=False)
+    cached = PronounMatch(meta_info=False)
+    previous.entities = cached.entities = store
+
+    def run(sieve):
+        return [sieve.agree_attributes(entity_a, entity_b) for entity_a, entity_b in pairs]
+
+    assert run(previous) == run(cached)
+    previous_time = min(timeit.repeat(lambda: run(previous), number=1, repeat=repetitions))
+    cached_time = min(timeit.repeat(lambda: run(cached), number=1, repeat=repetitions))
+    print("{0:<30}{1:>14.2f}{2:>14.2f}{3:>9.1f}x".format(
+        "agree_attributes", previous_time / len(pairs) * 1e6,
+        cached_time / len(pairs) * 1e6, previous_time / cached_time))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:4]])
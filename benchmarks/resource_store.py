@@ -0,0 +1,93 @@
+# coding=utf-8
+""" Memory and lookup time of the compiled resource store.
+
+Loads the gazetteers and the Bergsma counters of a language in a fresh
+process for each mode: reading the text files into sets and dicts, and mapping
+the compiled store. The private memory (anonymous pages, that each worker
+process pays again) and the file backed memory (shared by every process
+through the page cache) are reported after a lookup of every word of the
+resources. The time of a lookup of a known and of an unknown word is also
+reported for each mode, as the mean of the first words of the largest table
+and of the same words with a suffix.
+
+The store of the language must be built before (corefgraph_resources).
+
+Usage: python benchmarks/resource_store.py [language] [lookups]
+"""
+
+import multiprocessing
+import os
+import sys
+import timeit
+
+from corefgraph.resources.files import store
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+def memory():
+    """ The private and the file backed resident memory of the process in MB."""
+    values = {}
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(("RssAnon:", "RssFile:")):
+                key, value = line.split(":")
+                values[key] = int(value.split()[0]) / 1024.0
+    return values["RssAnon"], values["RssFile"]
+
+
+def load_text(language):
+    """ Read every table from the text files. The missing files are skipped."""
+    path = store.language_path(language)
+    tables = {}
+    for names, source, loader in store.TABLES:
+        filename = os.path.join(path, source)
+        if not os.path.exists(filename):
+            continue
+        content = loader(filename)
+        if len(names) == 1:
+            content = (content,)
+        tables.update(zip(names, content))
+    return tables
+
+
+def load_store(language):
+    """ Map every table of the compiled store."""
+    return store.ResourceStore(os.path.join(
+        store.language_path(language), store.STORE_NAME)).tables
+
+
+def measure(loader, language, lookups, results):
+    """ Load the tables, touch every word and put the measures in results."""
+    # The language path imports the properties of corefgraph, not measured
+    store.language_path(language)
+    start_anon, start_file = memory()
+    tables = loader(language)
+    found = sum(1 for table in tables.values() for word in table if word in table)
+    anon, file_backed = memory()
+    table = max(tables.values(), key=len)
+    known = [word for word, _ in zip(table, range(lookups))]
+    unknown = [word + "#" for word in known]
+    hit = min(timeit.repeat(
+        lambda: [word in table for word in known], number=1, repeat=3)) / len(known)
+    miss = min(timeit.repeat(
+        lambda: [word in table for word in unknown], number=1, repeat=3)) / len(known)
+    results.put((found, anon - start_anon, file_backed - start_file, hit, miss))
+
+
+def main(language="en", lookups=10000):
+    print("{0:<10}{1:>10}{2:>15}{3:>15}{4:>10}{5:>10}".format(
+        "mode", "words", "private (MB)", "shared (MB)", "hit (us)", "miss (us)"))
+    for name, loader in (("text", load_text), ("store", load_store)):
+        results = multiprocessing.Queue()
+        process = multiprocessing.Process(
+            target=measure, args=(loader, language, lookups, results))
+        process.start()
+        found, private, shared, hit, miss = results.get()
+        process.join()
+        print("{0:<10}{1:>10}{2:>15.1f}{3:>15.1f}{4:>10.3f}{5:>10.3f}".format(
+            name, found, private, shared, hit * 1e6, miss * 1e6))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2] + [int(arg) for arg in sys.argv[2:3]])
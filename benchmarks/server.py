@@ -0,0 +1,80 @@
+# coding=utf-8
+""" Check and throughput of the coreference server with the default writer.
+
+Starts a server with the default options (the NAF writer) on a free port and
+posts synthetic NAF documents to it from several threads. Each response must
+be a 200 with the same output as the pipeline of the file processor, ignoring
+the timestamps. The documents per second are reported.
+
+Usage: python benchmarks/server.py [workers] [documents] [sentences]
+"""
+
+import sys
+import threading
+import time
+
+try:
+    from httplib import HTTPConnection
+except ImportError:
+    from http.client import HTTPConnection
+
+from synthetic import build_naf
+from corefgraph.process.file import Pipeline
+from corefgraph.process.server import ResponseBuffer, create_server, generate_parser
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+def without_timestamps(output):
+    return b"\n".join(line for line in output.splitlines() if b"Timestamp" not in line)
+
+
+def post(port, naf, document_id):
+    """ Post a document to the server.
+
+    :return: The status and the body of the response.
+    """
+    connection = HTTPConnection("127.0.0.1", port)
+    connection.request("POST", "/?document_id={0}".format(document_id), naf.encode("utf-8"))
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response.status, body
+
+
+def main(workers=2, documents=8, sentences=5):
+    config = generate_parser().parse_args(["--port", "0", "--workers", str(workers)])
+    naf, penn, speakers = build_naf(sentences, 20)
+    expected = ResponseBuffer(config.encoding)
+    Pipeline(config).process((naf, None, None), expected, document_id="doc")
+    expected = without_timestamps(expected.getvalue())
+
+    server = create_server(config)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    responses = []
+
+    def client(index):
+        responses.append(post(server.server_port, naf, "doc"))
+
+    start = time.time()
+    clients = [threading.Thread(target=client, args=(index,)) for index in range(documents)]
+    for client_thread in clients:
+        client_thread.start()
+    for client_thread in clients:
+        client_thread.join()
+    wall = time.time() - start
+    server.shutdown()
+    server.pool.terminate()
+
+    failed = [status for status, body in responses if status != 200]
+    different = [body for status, body in responses if status == 200 and without_timestamps(body) != expected]
+    print("{0} documents, {1} workers: {2:.2f} documents/s, {3} failed, {4} different".format(
+        documents, workers, documents / wall, len(failed), len(different)))
+    if failed or different:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
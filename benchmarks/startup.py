@@ -0,0 +1,74 @@
+# coding=utf-8
+""" Startup time of the pipeline.
+
+Measures, each time in a fresh interpreter, the import of the top level
+pipeline, the load of the pipeline (language, sieves, catchers, filters,
+purges, annotators and the preloaded resources) and the resolution of a first
+short synthetic document, where the lazy resources are loaded:
+ - lazy: The default, each resource is loaded the first time it is used.
+ - preload: Every resource is loaded with the pipeline (--preload).
+ - lazy, string match: Only the string match sieves, without the gender,
+   number, animacy and demonym annotators, so their gazetteers are never
+   read.
+
+Usage: python benchmarks/startup.py [repetitions]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+MODES = (
+    ("lazy", []),
+    ("preload", ["--preload"]),
+    ("lazy, string match", [
+        "--sieves", "ESM", "--sieves", "RSM",
+        "--mention_features", "ner", "--mention_features", "type",
+        "--mention_features", "construction", "--mention_features", "speaker",
+        "--mention_features", "generic", "--mention_features", "person",
+        "--mention_features", "dependency"]),
+)
+
+SCRIPT = """
+import io, json, logging, sys, time
+logging.disable(logging.CRITICAL)
+start = time.time()
+from corefgraph.process.file import generate_parser, Pipeline
+imported = time.time()
+pipeline = Pipeline(generate_parser().parse_args(["--writer", "CONLL"] + sys.argv[1:]))
+loaded = time.time()
+from synthetic import build_naf
+naf, penn, speakers = build_naf(3, 8)
+document = time.time()
+pipeline.process((naf, None, speakers), io.BytesIO(), document_id="doc")
+resolved = time.time()
+sys.stdout.write(json.dumps([imported - start, loaded - imported, resolved - document]))
+"""
+
+
+def measure(arguments):
+    """ Run the startup in a new interpreter.
+
+    :param arguments: The command line arguments of the pipeline.
+    :return: The import, load and first document times.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.check_output(
+        [sys.executable, "-c", SCRIPT] + arguments, cwd=directory)
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def main(repetitions=3):
+    print("{0:<22}{1:>12}{2:>12}{3:>16}{4:>12}".format(
+        "mode", "import (s)", "load (s)", "first doc (s)", "total (s)"))
+    for name, arguments in MODES:
+        times = min((measure(arguments) for _ in range(repetitions)), key=sum)
+        print("{0:<22}{1:>12.3f}{2:>12.3f}{3:>16.3f}{4:>12.3f}".format(
+            name, times[0], times[1], times[2], sum(times)))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,174 @@
+# coding=utf-8
+""" Synthetic documents for the benchmarks.
+
+The documents are built directly with the graph builder API, so the benchmarks
+do not need parsed NAF files. Each sentence has the shape of a CoNLL sentence:
+a flat list of words grouped in nested binary constituents.
+"""
+
+from corefgraph import properties
+properties.set_lang("en_conll", "utf-8")
+
+from corefgraph.constants import SENTENCE, POS
+from corefgraph.graph.builder import BaseGraphBuilder
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+WORDS = ("the", "man", "saw", "a", "dog", "in", "his", "old", "house", "and",
+         "she", "said", "that", "it", "was", "John", "'s", "car", "yesterday")
+POS_TAGS = ("DT", "NN", "VBD", "DT", "NN", "IN", "PRP$", "JJ", "NN", "CC",
+            "PRP", "VBD", "IN", "PRP", "VBD", "NNP", "POS", "NN", "NN")
+
+
+def _build_constituents(builder, sentence, sentence_namespace, children,
+                        counter):
+    """ Group the children in nested binary constituents until only one
+    remains. The last child of each group is its head.
+
+    :param builder: The graph builder
+    :param sentence: The sentence root node
+    :param sentence_namespace: prefix of the node ids
+    :param children: The ordered nodes to group
+    :param counter: list with the next constituent number
+    :return: The top constituent
+    """
+    while len(children) > 1:
+        groups = []
+        for index in range(0, len(children), 2):
+            group = children[index:index + 2]
+            counter[0] += 1
+            constituent = builder.add_constituent(
+                node_id="{0}_c{1}".format(sentence_namespace, counter[0]),
+                sentence=sentence, tag="NP", order=counter[0])
+            for child in group:
+                if child[builder.node_type] == builder.word_node_type:
+                    builder.link_syntax_terminal(constituent, child)
+                else:
+                    builder.link_syntax_non_terminal(constituent, child)
+            builder.set_head(constituent, group[-1])
+            groups.append(constituent)
+        children = groups
+    return children[0]
+
+
+def build_document(sentences=100, words_per_sentence=25):
+    """ Build a synthetic document graph.
+
+    :param sentences: Number of sentences of the document
+    :param words_per_sentence: Number of words of each sentence
+    :return: The graph builder that contains the document
+    """
+    builder = BaseGraphBuilder()
+    builder.set_speakers({})
+    builder.graph.graph[builder.doc_type] = builder.doc_article
+    span = 0
+    char = 0
+    for sentence_index in range(sentences):
+        namespace = "s{0}".format(sentence_index)
+        sentence = builder.add_sentence(
+            root_index=sentence_index, form="", label=namespace,
+            node_id=namespace)
+        sentence[SENTENCE] = sentence_index
+        words = []
+        for word_index in range(words_per_sentence):
+            form = WORDS[(sentence_index + word_index) % len(WORDS)]
+            word = builder.add_word(
+                form=form, node_id="{0}_w{1}".format(namespace, word_index),
+                label=form, lemma=form.lower(),
+                pos=POS_TAGS[(sentence_index + word_index) % len(POS_TAGS)],
+                span=(span, span), begin=char, end=char + len(form),
+                sentence=sentence)
+            words.append(word)
+            span += 1
+            char += len(form) + 1
+        top = _build_constituents(builder, sentence, namespace, words, [0])
+        builder.link_syntax_non_terminal(sentence, top)
+        builder.set_head(sentence, top)
+        builder.fill_constituent(sentence)
+        sentence[POS] = builder.root_pos
+    return builder
+
+
+def _group(children, new_node):
+    """ Group the children in nested binary nodes until only one remains.
+
+    :param children: The ordered nodes to group
+    :param new_node: Function that receives a group and returns its node
+    :return: The top node
+    """
+    while len(children) > 1:
+        children = [new_node(children[index:index + 2])
+                    for index in range(0, len(children), 2)]
+    return children[0]
+
+
+def _penn_node(group):
+    """ Build a Penn Treebank NP from its children. The last one is the head.
+
+    :param group: The Penn Treebank strings of the children
+    """
+    group = group[:-1] + [group[-1].replace(" ", "=H ", 1)]
+    return "(NP {0})".format(" ".join(group))
+
+
+def build_naf(sentences=100, words_per_sentence=25):
+    """ Build a synthetic NAF document with the same shape as build_document.
+
+    :param sentences: Number of sentences of the document
+    :param words_per_sentence: Number of words of each sentence
+    :return: A tuple of the NAF string, the Penn Treebank trees and the
+        speakers of the words, as expected by the NAF graph builder.
+    """
+    text, terms, trees, penn_trees, speakers = [], [], [], [], []
+    char = 0
+    counter = [0]
+
+    def new_id(prefix):
+        counter[0] += 1
+        return "{0}{1}".format(prefix, counter[0])
+
+    for sentence_index in range(sentences):
+        non_terminals, terminals, edges = [], [], []
+        leaves, penn_leaves = [], []
+        for word_index in range(words_per_sentence):
+            index = sentence_index * words_per_sentence + word_index
+            form = WORDS[(sentence_index + word_index) % len(WORDS)]
+            pos = POS_TAGS[(sentence_index + word_index) % len(POS_TAGS)]
+            text.append('<wf id="w{0}" length="{1}" offset="{2}" sent="{3}">{4}</wf>'.format(
+                index, len(form), char, sentence_index, form))
+            terms.append(
+                '<term id="t{0}" lemma="{1}" morphofeat="{2}" pos="N">'
+                '<span><target id="w{0}"/></span></term>'.format(index, form.lower(), pos))
+            speakers.append("speaker{0}".format(sentence_index % 2))
+            char += len(form) + 1
+            pre_terminal, terminal = new_id("n"), new_id("ter")
+            non_terminals.append('<nt id="{0}" label="{1}"/>'.format(pre_terminal, pos))
+            terminals.append('<t id="{0}"><span><target id="t{1}"/></span></t>'.format(
+                terminal, index))
+            edges.append('<edge from="{0}" head="true" id="{1}" to="{2}"/>'.format(
+                terminal, new_id("tre"), pre_terminal))
+            leaves.append(pre_terminal)
+            penn_leaves.append("({0} {1})".format(pos, form))
+
+        def new_naf_node(group):
+            node = new_id("n")
+            non_terminals.append('<nt id="{0}" label="NP"/>'.format(node))
+            for child in group:
+                edges.append('<edge from="{0}"{1} id="{2}" to="{3}"/>'.format(
+                    child, ' head="true"' if child is group[-1] else "", new_id("tre"), node))
+            return node
+
+        top = _group(leaves, new_naf_node)
+        root = new_id("n")
+        non_terminals.append('<nt id="{0}" label="ROOT"/>'.format(root))
+        edges.append('<edge from="{0}" head="true" id="{1}" to="{2}"/>'.format(
+            top, new_id("tre"), root))
+        trees.append("<tree>{0}{1}{2}</tree>".format(
+            "".join(non_terminals), "".join(terminals), "".join(edges)))
+        penn_trees.append("(ROOT {0})".format(
+            _group(penn_leaves, _penn_node).replace(" ", "=H ", 1)))
+    naf = ('<?xml version="1.0" encoding="UTF-8"?>\n<NAF version="v3" xml:lang="en">'
+           '<nafHeader/><raw/><text>{0}</text><terms>{1}</terms>'
+           '<constituency>{2}</constituency></NAF>').format(
+        "".join(text), "".join(terms), "".join(trees))
+    return naf, "\n".join(penn_trees), "\n".join(speakers)
@@ -0,0 +1,73 @@
+# coding=utf-8
+""" Cost of the tracing of the extractor and sieve decisions.
+
+Resolves synthetic NAF documents with one pipeline in three modes and
+compares the time per document:
+ - off: The production setting, INFO logging and no tracing.
+ - trace: The decisions recorded in the ring buffer.
+ - debug: The DEBUG logging of the sieves and the extractor, sent to a null
+   handler, so only the cost of building the messages is measured.
+
+The output of the three modes is checked to be the same.
+
+Usage: python benchmarks/tracing.py [documents] [sentences] [words per sentence] [repetitions]
+"""
+
+import io
+import logging
+import sys
+import timeit
+
+from synthetic import build_naf
+from corefgraph.multisieve import trace
+from corefgraph.process.file import generate_parser, Pipeline
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+def resolve(pipeline, documents):
+    """ Resolve every document with the pipeline."""
+    outputs = []
+    for index, (naf, penn, speakers) in enumerate(documents):
+        output = io.BytesIO()
+        pipeline.process((naf, None, speakers), output, document_id="doc{0}".format(index))
+        outputs.append(output.getvalue())
+    return outputs
+
+
+def set_level(level):
+    """ Set the level of the multisieve loggers, that write into a null
+    handler.
+    """
+    for name in ("corefgraph.multisieve", "corefgraph.multisieve.sieves"):
+        multisieve_logger = logging.getLogger(name)
+        for handler in list(multisieve_logger.handlers):
+            multisieve_logger.removeHandler(handler)
+        multisieve_logger.addHandler(logging.NullHandler())
+        multisieve_logger.setLevel(level)
+
+
+def main(documents=20, sentences=10, words_per_sentence=15, repetitions=3):
+    corpus = [build_naf(sentences, words_per_sentence) for _ in range(documents)]
+    pipeline = Pipeline(generate_parser().parse_args(["--writer", "CONLL"]))
+    print("{0} documents of {1} sentences of {2} words".format(documents, sentences, words_per_sentence))
+    print("{0:<10}{1:>12}{2:>12}{3:>12}".format("mode", "ms/doc", "ratio", "decisions"))
+    results = []
+    base_time = None
+    for mode in ("off", "trace", "debug"):
+        set_level(logging.DEBUG if mode == "debug" else logging.INFO)
+        if mode == "trace":
+            trace.enable(size=1000000)
+        else:
+            trace.disable()
+        results.append(resolve(pipeline, corpus))
+        elapsed = min(timeit.repeat(lambda: resolve(pipeline, corpus), number=1, repeat=repetitions))
+        base_time = base_time or elapsed
+        print("{0:<10}{1:>12.2f}{2:>11.2f}x{3:>12}".format(
+            mode, elapsed / documents * 1000, elapsed / base_time, len(trace.decisions())))
+    trace.disable()
+    assert results[0] == results[1] == results[2]
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:5]])
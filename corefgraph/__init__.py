@@ -12,9 +12,11 @@ Computational Linguistics 39(4), 2013.
 
 """
 import logging
-from collections import defaultdict, Counter
+from collections import Counter
 
 from corefgraph.constants import ID, POS, NER, TAG, GOLD_ENTITY, DEEP, CONSTITUENT, FORM
+from corefgraph.report import Report
+from corefgraph.timing import Timings
 
 __author__ = 'Josu Bermudez <josu.bermudez@deusto.es>, Rodrigo Agerri <rodrigo.agerri@ehu.es>'
 __version__ = '1.1.0'
@@ -48,13 +50,30 @@ class Corefgraph:
         self.graph_builder = None
         self.coreference_processor = None
         self.feature_extractor = None
-        self.meta = {}
+        # The time spent in each stage of the current document
+        self.timings = Timings()
         self.mention_features = mention_features
         self.reader = reader
         self.secure_tree = secure_tree
 
     def reset_graph(self):
-        """Reset the graph and the elements that used a graph reference."""
+        """Reset the graph and the elements that used a graph reference.
+
+        The builder, the processors, their sieves, catchers, filters, purges
+        and annotators are created in the first call. The next calls only clear
+        their state of the previous document, so the instance is reused for
+        every document processed with the same configuration.
+        """
+        if self.graph_builder is None:
+            self.load_processors()
+        else:
+            self.graph_builder.reset()
+            self.coreference_processor.reset()
+            self.feature_extractor.reset()
+        self.timings.reset()
+
+    def load_processors(self):
+        """Create the graph builder and the elements that use it."""
         # Prepare graph Builder
         from corefgraph.multisieve.features import FeatureExtractor
         from graph.nafbuilder import NafAndTreeGraphBuilder
@@ -72,7 +91,8 @@ class Corefgraph:
             mention_filters=self.mention_filters,
             mention_purges=self.mention_purges,
             sieves_list=self.sieves,
-            meta_info=self.meta_info
+            meta_info=self.meta_info,
+            timings=self.timings
         )
         # Prepare Feature extractor
         self.feature_extractor = FeatureExtractor(
@@ -82,33 +102,54 @@ class Corefgraph:
         )
 
         self.feature_extractor.load_extractors()
-        self.meta = defaultdict(Counter)
 
     def build_graph(self, document):
         """Build a graph form external parser.
 
         :param document: The document to generate the graph.
         """
-        self.graph_builder.process_document(document=document)
-        sentences_parsed = self.graph_builder.get_sentences()
-
-        sentence_roots = [self.graph_builder.process_sentence(
-                sentence=sentence,
-                sentence_namespace="text@{0}".format(index),
-                root_index=index)
-                for index, sentence in enumerate(sentences_parsed)
-                ]
-        for sentence_root in sentence_roots:
-            self.coreference_processor.process_sentence(sentence=sentence_root)
+        with self.timings.measure("read"):
+            self.graph_builder.process_document(document=document)
+            sentences_parsed = self.graph_builder.get_sentences()
+
+        with self.timings.measure("graph") as stage:
+            sentence_roots = [self.graph_builder.process_sentence(
+                    sentence=sentence,
+                    sentence_namespace="text@{0}".format(index),
+                    root_index=index)
+                    for index, sentence in enumerate(sentences_parsed)
+                    ]
+            stage.counts["sentences"] += len(sentence_roots)
+        with self.timings.measure("extraction") as stage:
+            for sentence_root in sentence_roots:
+                self.coreference_processor.process_sentence(sentence=sentence_root)
+            stage.counts["sentences"] += len(sentence_roots)
+            stage.counts["mentions"] += sum(
+                len(sentence) for sentence in self.coreference_processor.mentions_textual_order)
 
     def process_graph(self):
-        from corefgraph.multisieve.features.constants import MENTION
-        """ Prepare the graph for output.
+        """ Annotate the features of the mentions and resolve the coreference.
+        """
+        with self.timings.measure("features") as stage:
+            self.feature_extractor.prepare(
+                mention for sentence in self.coreference_processor.mentions_textual_order
+                for mention in sentence)
+            for index, sentence in enumerate(self.coreference_processor.mentions_textual_order):
+                self.logger.debug("Featuring Sentence %d", index)
+                for mention in sentence:
+                    self.feature_extractor.characterize_mention(mention)
+                stage.counts["mentions"] += len(sentence)
+        # Resolve the coreference
+        self.logger.debug("Resolve Coreference...")
+        self.coreference_processor.resolve_text()
+
+    def _sentences_meta(self):
+        """ The histograms of the words, pronouns, named entities and gold
+        mentions of each sentence.
         """
-        self.meta[self.graph_builder.doc_type] = self.graph_builder.get_doc_type()
         from resources.tagset import pos_tags
         from resources.dictionaries import pronouns
-        self.meta["sentences"] = {
+        return {
             'words_histogram': [len(self.graph_builder.get_words(sentence))
                                 for sentence in self.graph_builder.get_all_sentences()],
             'pronouns_histogram': [len([word for word in self.graph_builder.get_words(sentence) if(pos_tags.pronoun(word[POS]) or pronouns.all(word[FORM]) or pronouns.relative(word[FORM]))])
@@ -119,22 +160,12 @@ class Corefgraph:
                                    for sentence in self.graph_builder.get_all_sentences()]
         }
 
-        self.meta["features"] = {
-            'counters': defaultdict(Counter),
-            'mentions': defaultdict(dict)}
-        for index, sentence in enumerate(self.coreference_processor.mentions_textual_order):
-            self.logger.debug("Featuring Sentence %d", index)
-            sentence_mentions = []
-            # self.meta["sentences"].append(sentence_mentions)
-            for mention in sentence:
-                # Store mentions id in the meta
-                sentence_mentions.append(mention[ID])
-                self.feature_extractor.characterize_mention(mention)
-        # Resolve the coreference
-        self.logger.debug("Resolve Coreference...")
-        self.coreference_processor.resolve_text()
-
-        self.meta["overall"] = {
+    def _overall_meta(self):
+        """ The counters of the words, named entities, constituents and gold
+        mentions of the document.
+        """
+        from corefgraph.multisieve.features.constants import MENTION
+        return {
             'words': Counter([word[POS] for word in self.graph_builder.get_all_words()]),
             'namedEntities': Counter([ne[NER] for ne in self.graph_builder.get_all_named_entities()]),
             'constituents': Counter([constituent[TAG] for constituent in self.graph_builder.get_all_constituents()]),
@@ -144,6 +175,16 @@ class Corefgraph:
             'mentions_per_entity': Counter([mention[GOLD_ENTITY] for mention in self.graph_builder.get_all_gold_mentions()]).values()
         }
 
+    def _features_meta(self):
+        """ The features of every mention, also the ones that were not
+        resolved.
+        """
+        # Fill the features of unprocessed mentions
+        for entity in self.coreference_processor.extractor._mentions:
+            if entity[ID] not in self.feature_extractor.meta['mentions']:
+                self.feature_extractor.characterize_mention(entity)
+        return self.feature_extractor.get_meta()
+
     def show_graph(self):
         """Show the graph in screen"""
         self.graph_builder.show_graph()
@@ -162,16 +203,17 @@ class Corefgraph:
             key, value = option.split()
             kwargs[key] = value
 
-        writer = writers[config.writer](stream=stream, document_id=config.document_id)
-        writer.store(
-            graph_builder=self.graph_builder,
-            encoding=config.encoding,
-            language=config.language,
-            coreference_processor=self.coreference_processor,
-            start_time=config.start_time,
-            end_time=config.end_time,
-            **kwargs
-        )
+        with self.timings.measure("write"):
+            writer = writers[config.writer](stream=stream, document_id=config.document_id)
+            writer.store(
+                graph_builder=self.graph_builder,
+                encoding=config.encoding,
+                language=config.language,
+                coreference_processor=self.coreference_processor,
+                start_time=config.start_time,
+                end_time=config.end_time,
+                **kwargs
+            )
 
     def process_text(self, document):
         """ Generate a graph with all linguistic info from de document, resolve
@@ -183,12 +225,26 @@ class Corefgraph:
         self.build_graph(document)
         self.process_graph()
 
-    def get_meta(self, ):
-        """ Get meta info"""
-        self.meta.update(self.coreference_processor.get_meta())
-        # Fill the features of unprocessed mentions
-        for entity in self.coreference_processor.extractor._mentions:
-            if entity[ID] not in self.feature_extractor.meta['mentions']:
-                self.feature_extractor.characterize_mention(entity)
-        self.meta["features"] = self.feature_extractor.get_meta()
-        return self.meta
+    def get_report(self):
+        """ Get the meta info report of the last document. Nothing is computed
+        until a section of the report is asked for.
+        """
+        report = Report()
+        report.add(self.graph_builder.doc_type, self.graph_builder.get_doc_type)
+        report.add("sentences", self._sentences_meta)
+        report.add("overall", self._overall_meta)
+        self.coreference_processor.fill_report(report)
+        report.add("features", self._features_meta)
+        report.add("timings", self.get_timings)
+        return report
+
+    def get_meta(self):
+        """ Get every section of the meta info report of the last document."""
+        return self.get_report().to_dict()
+
+    def get_timings(self):
+        """ Get the wall and CPU time and the counts of each stage of the
+        last document: reading, graph building, mention extraction, feature
+        annotation, each sieve, purging and writing.
+        """
+        return self.timings.get_meta()
@@ -2,6 +2,7 @@
 """ Base of graph creators to convert external linguistic knowledge into a graph
  usable by the system.
 """
+from bisect import bisect_left, bisect_right
 from logging import getLogger
 from corefgraph.resources.rules import rules
 from corefgraph.graph.wrapper import GraphWrapper
@@ -61,13 +62,33 @@ class BaseGraphBuilder(object):
 
     HEAD = "head"
     HEADWORD = "head_word"
+    ROOT = "sentence_root"
+    PARENT = "syntactic_parent"
+
+    # Store in each node direct references to its root, syntactic parent and
+    # head, so the navigation does not need to traverse the graph.
+    pointer_mode = True
+    # Link each constituent with all the words that it contains. If False the
+    # constituent words are resolved from its span and the sentence words.
+    constituent_word_edges = False
 
     def __init__(self):
-        self.graph = None
-        self.previous_sentence = None
         self.logger = getLogger(__name__)
+        # The state of each document is initialized in reset
+        self.reset()
+
+    def reset(self):
+        """ Discard the graph and the state of the current document, so the
+        builder can be reused with the next one.
+        """
+        self.previous_sentence = None
         self.graph = GraphWrapper.blank_graph()
         self.graph.graph['graph_builder'] = self
+        # Sorted words of each sentence, by sentence root ID
+        self.sentence_words = {}
+        # Gold mentions and their gold entities IDs, by span
+        self.gold_mentions_by_span = {}
+        self.gold_entities_by_span = {}
 
     def get_doc_type(self):
         """ Return the doctype of the document."""
@@ -140,11 +161,8 @@ class BaseGraphBuilder(object):
         :param sentence: The root of the base sentence.
         :return: The next sentence.
         """
-        for sentence_node, next_sentence, relation_type \
-                in self.graph.out_edges(sentence[ID], keys=True):
-            if relation_type == self.sentence_order_edge_type:
-                return self.graph.node[next_sentence]
-        return None
+        return GraphWrapper.get_out_neighbour_by_relation_type(
+            self.graph, sentence, self.sentence_order_edge_type)
 
     def get_prev_sentence(self, sentence):
         """ Get the textual order previous sentence.
@@ -152,11 +170,8 @@ class BaseGraphBuilder(object):
         :param sentence: The root of the base sentence.
         :return: The previous sentence.
         """
-        for prev_sentence, sentence_node, relation_type \
-                in self.graph.in_edges(sentence[ID], keys=True):
-            if relation_type == self.sentence_order_edge_type:
-                return self.graph.node[prev_sentence]
-        return None
+        return GraphWrapper.get_in_neighbour_by_relation_type(
+            self.graph, sentence, self.sentence_order_edge_type)
 
     def get_all_sentences(self):
         """ Get all the sentences of the graph.
@@ -199,9 +214,114 @@ class BaseGraphBuilder(object):
         :param sentence: the root node of the sentence.
         :return: The words of the sentence.
         """
-        return sorted(GraphWrapper.get_out_neighbours_by_relation_type(
+        return list(self._get_sentence_word_store(sentence)[2])
+
+    def _get_sentence_word_store(self, sentence):
+        """ Get the word store of a sentence, building it if needed.
+
+        The store is a tuple (offset, starts, words). Words are sorted by span
+        and starts contains the first token of each word span. If each word
+        covers exactly one token and the tokens are consecutive, offset is the
+        first token of the sentence, otherwise is None.
+
+        :param sentence: the root node of the sentence.
+        :return: The word store of the sentence.
+        """
+        try:
+            return self.sentence_words[sentence[ID]]
+        except KeyError:
+            pass
+        words = sorted(GraphWrapper.get_out_neighbours_by_relation_type(
             graph=self.graph, node=sentence, relation_type=self.word_edge_type),
             key=lambda y: y[SPAN])
+        starts = [word[SPAN][0] for word in words]
+        offset = starts[0] if starts else None
+        for index, word in enumerate(words):
+            if word[SPAN] != (offset + index, offset + index):
+                offset = None
+                break
+        store = self.sentence_words[sentence[ID]] = (offset, starts, words)
+        return store
+
+    def _slice_sentence_words(self, sentence, span):
+        """ Get the words of a sentence that are inside a span.
+
+        :param sentence: the root node of the sentence.
+        :param span: The first and last token of the wanted words.
+        :return: A new list with the words.
+        """
+        offset, starts, words = self._get_sentence_word_store(sentence)
+        if offset is not None:
+            return words[max(span[0] - offset, 0):span[1] - offset + 1]
+        return words[bisect_left(starts, span[0]):bisect_right(starts, span[1])]
+
+    def _get_span_words(self, element):
+        """ Get the words of a element as a slice of the words of its sentence.
+
+        :param element: Named entity or mention.
+        :return: The words of the element or None if the element can not be
+            resolved by its span.
+        """
+        span = element.get(SPAN)
+        if span is None:
+            return None
+        root = self.get_root(element)
+        if root is None:
+            return None
+        words = self._slice_sentence_words(root, span)
+        # Only trust the slice if it has exactly the words of the element
+        if len(words) != GraphWrapper.count_out_neighbours_by_relation_type(
+                self.graph, element, self.word_edge_type):
+            return None
+        return words
+
+    def _get_constituent_span(self, constituent):
+        """ Get the span of a constituent, computing it from its syntactic
+        children if it is not set yet.
+
+        :param constituent: The constituent
+        :return: The first and last token of the constituent or None if it has
+            no words.
+        """
+        try:
+            return constituent[SPAN]
+        except KeyError:
+            pass
+        spans = [
+            child[SPAN] if child[self.node_type] == self.word_node_type
+            else self._get_constituent_span(child)
+            for child in self.get_syntactic_children(constituent)]
+        spans = [span for span in spans if span is not None]
+        if not spans:
+            return None
+        span = constituent[SPAN] = (
+            min(span[0] for span in spans), max(span[-1] for span in spans))
+        return span
+
+    def _get_constituent_words(self, constituent):
+        """ Get the words of a constituent from its span.
+
+        :param constituent: The constituent
+        :return: The words of the constituent
+        """
+        span = self._get_constituent_span(constituent)
+        if span is None:
+            return []
+        root = self.get_root(constituent)
+        if root is None:
+            words = []
+            for child in self.get_syntactic_children_sorted(constituent):
+                words.extend(self.get_words(child))
+            return words
+        return self._slice_sentence_words(root, span)
+
+    def _clear_sentence_words(self, sentence):
+        """ Drop the word store of a sentence after a change in its words.
+
+        :param sentence: The node that may be a sentence root.
+        """
+        if sentence[self.node_type] == self.root_type:
+            self.sentence_words.pop(sentence[ID], None)
 
     # Coreference
     def add_coref_entity(self, node_id, mentions, label=None):
@@ -235,11 +355,13 @@ class BaseGraphBuilder(object):
         return GraphWrapper.get_all_node_by_type(
             graph=self.graph, node_type=self.entity_node_type)
 
-    def add_gold_mention(self, node_id, gold_entity, label):
+    def add_gold_mention(self, node_id, gold_entity, label, span=None):
         """Creates a gold mention into the graph.
-        :param entity_id:  The ID of the entity.
+        :param gold_entity:  The ID of the entity.
         :param node_id: The ID of the gold mention in the graph
         :param label: A label for representation uses.
+        :param span: Index of the first and last token of the mention in the
+            text. Needed to find the mention by its span.
         """
 
         new_entity = GraphWrapper.new_node(
@@ -247,13 +369,30 @@ class BaseGraphBuilder(object):
             node_type=self.gold_mention_node_type,
             node_id=node_id,
             label=label,
-            gold_entity=gold_entity
+            gold_entity=gold_entity,
+            span=span
         )
+        if span is not None:
+            self.gold_mentions_by_span.setdefault(span, []).append(new_entity)
+            self.gold_entities_by_span.setdefault(span, set()).add(gold_entity)
         return new_entity
 
     def get_gold_mention_by_span(self, span):
-        return [gm for gm in GraphWrapper.get_all_node_by_type(
-            graph=self.graph, node_type=self.gold_mention_node_type) if gm[SPAN] == span]
+        """ Get the gold mentions that have exactly a span.
+
+        :param span: The span of the mentions
+        :return: A list of gold mentions
+        """
+        return list(self.gold_mentions_by_span.get(span, ()))
+
+    def get_gold_entities_by_span(self, span):
+        """ Get the IDs of the gold entities that have a mention with exactly
+        a span. The returned set must not be modified.
+
+        :param span: The span of the mentions
+        :return: A set of gold entities IDs
+        """
+        return self.gold_entities_by_span.get(span, frozenset())
 
     def get_all_gold_mentions(self):
         """ Get all named entities of the graph
@@ -429,6 +568,7 @@ class BaseGraphBuilder(object):
         """
         GraphWrapper.link(graph=self.graph, origin=sentence, target=word,
                           link_type=self.word_edge_type)
+        self._clear_sentence_words(sentence)
 
     def get_words(self, element):
         """ Get the words(sorted in textual order) of the constituent.
@@ -439,16 +579,38 @@ class BaseGraphBuilder(object):
 
         :return the words of the element in a list
         """
-        if element[self.node_type] == self.word_node_type:
+        element_type = element[self.node_type]
+        if element_type == self.word_node_type:
             return [element]
-        words = GraphWrapper.get_out_neighbours_by_relation_type(
-            self.graph, element, relation_type=self.word_edge_type)
-        return sorted(words, key=lambda y: y[SPAN])
+        if element_type == self.root_type:
+            return self.get_sentence_words(element)
+        if element_type == self.syntactic_node_type and \
+                not self.constituent_word_edges:
+            return self._get_constituent_words(element)
+        words = self._get_span_words(element)
+        if words is None:
+            words = sorted(GraphWrapper.get_out_neighbours_by_relation_type(
+                self.graph, element, relation_type=self.word_edge_type),
+                key=lambda y: y[SPAN])
+        return words
 
     def remove(self, element):
         """ Remove the element from the graph
         :param element: The element to remove
         """
+        for child in GraphWrapper.get_out_neighbours_by_relation_type(
+                self.graph, element, self.root_edge_type):
+            self._clear_pointer(child, self.ROOT, element)
+        for child in GraphWrapper.get_out_neighbours_by_relation_type(
+                self.graph, element, self.syntactic_edge_type):
+            self._clear_pointer(child, self.PARENT, element)
+        for parent in GraphWrapper.get_in_neighbours_by_relation_type(
+                self.graph, element, self.head_edge_type):
+            self._clear_pointer(parent, self.HEAD, element)
+        for sentence in GraphWrapper.get_in_neighbours_by_relation_type(
+                self.graph, element, self.word_edge_type):
+            self._clear_sentence_words(sentence)
+        self._clear_sentence_words(element)
         GraphWrapper.remove(graph=self.graph, element=element)
 
     def unlink(self, origin, target):
@@ -456,8 +618,23 @@ class BaseGraphBuilder(object):
         :param origin: The origin node of the links
         :param target: The target node of the links
         """
+        self._clear_pointer(target, self.ROOT, origin)
+        self._clear_pointer(target, self.PARENT, origin)
+        self._clear_pointer(origin, self.HEAD, target)
+        self._clear_sentence_words(origin)
         GraphWrapper.unlink(graph=self.graph, origin=origin, target=target)
 
+    @staticmethod
+    def _clear_pointer(element, pointer, target):
+        """ Drop a direct reference of the element if it points to the target.
+
+        :param element: The node that may hold the reference
+        :param pointer: The name of the reference
+        :param target: The node that is no longer linked
+        """
+        if element.get(pointer) is target:
+            del element[pointer]
+
     # Dependency
     def link_dependency(self, dependency_from, dependency_to, dependency_type):
         """ Add a dependency relation to the graph. Remember that dependency
@@ -501,6 +678,8 @@ class BaseGraphBuilder(object):
         GraphWrapper.link(
             graph=self.graph, origin=sentence, target=element,
             link_type=self.root_edge_type)
+        if self.pointer_mode:
+            element.setdefault(self.ROOT, sentence)
 
     def get_root(self, element):
         """Get the sentence of the element
@@ -508,8 +687,11 @@ class BaseGraphBuilder(object):
         :param element: The constituent or word whose parent is wanted.
         """
         element = element.get(CONSTITUENT, element)
-        return GraphWrapper.get_in_neighbour_by_relation_type(
-            self.graph, element, self.root_edge_type)
+        root = element.get(self.ROOT)
+        if root is None:
+            return GraphWrapper.get_in_neighbour_by_relation_type(
+                self.graph, element, self.root_edge_type)
+        return root
 
     def get_all_elements_from_root(self, sentence):
         children = GraphWrapper.get_out_neighbours_by_relation_type(
@@ -519,14 +701,16 @@ class BaseGraphBuilder(object):
         return children
 
     def link_syntax_non_terminal(self, parent, child):
-        """ Link a non-terminal(constituent) to the constituent. Also link the
-        constituent child word with the parent.
+        """ Link a non-terminal(constituent) to the constituent. If
+        constituent_word_edges is set, also link the constituent child word
+        with the parent.
 
         :param parent: The parent constituent
         :param child: The child constituent
         """
-        for word in self.get_words(child):
-            self.link_word(parent, word)
+        if self.constituent_word_edges:
+            for word in self.get_words(child):
+                self.link_word(parent, word)
 
         label = self.syntactic_edge_label\
             + "_" \
@@ -537,14 +721,18 @@ class BaseGraphBuilder(object):
             link_type=self.syntactic_edge_type,
             value=self.syntactic_edge_value_branch,
             label=label)
+        if self.pointer_mode:
+            child.setdefault(self.PARENT, parent)
 
     def link_syntax_terminal(self, parent, terminal):
-        """  Link a word to a constituent. Also add the word to
+        """  Link a word to a constituent. If constituent_word_edges is set, also
+        add the word to the constituent words.
         :param parent:
         :param terminal:
         :return:
         """
-        self.link_word(parent, terminal)
+        if self.constituent_word_edges:
+            self.link_word(parent, terminal)
         label = self.syntactic_edge_type \
             + "_" \
             + self.syntactic_edge_value_terminal
@@ -554,6 +742,8 @@ class BaseGraphBuilder(object):
             value=self.syntactic_edge_value_terminal,
             weight=1,
             label=label)
+        if self.pointer_mode:
+            terminal.setdefault(self.PARENT, parent)
 
     def set_head_word(self, element, head_word):
         """Set the head word of the element.
@@ -602,8 +792,10 @@ class BaseGraphBuilder(object):
         """
         if element[self.node_type] == self.word_node_type:
             return element
-        head = GraphWrapper.get_out_neighbour_by_relation_type(
-            graph=self.graph, node=element, relation_type=self.head_edge_type)
+        head = element.get(self.HEAD)
+        if head is None:
+            head = GraphWrapper.get_out_neighbour_by_relation_type(
+                graph=self.graph, node=element, relation_type=self.head_edge_type)
         if head is None:
             return self.get_syntactic_children_sorted(element=element)[-1]
         return head
@@ -660,8 +852,11 @@ class BaseGraphBuilder(object):
         :return: The parent of the element.
         """
         element = element.get(CONSTITUENT, element)
-        return GraphWrapper.get_in_neighbour_by_relation_type(
-            self.graph, element, self.syntactic_edge_type)
+        parent = element.get(self.PARENT)
+        if parent is None:
+            return GraphWrapper.get_in_neighbour_by_relation_type(
+                self.graph, element, self.syntactic_edge_type)
+        return parent
 
     def get_syntactic_sibling(self, element):
         """ Get the ordered sibling of a syntactic node.
@@ -747,6 +942,43 @@ class BaseGraphBuilder(object):
                 child[DEEP] = deep + 1
                 continue
             self.fill_constituent(child, deep + 1)
+        self._fill_head_word(constituent)
+
+    def fill_constituent_from_children(self, constituent, deep=0):
+        """ Fill the constituent attributes composing the values of its
+        children, that must be already filled. Unlike fill_constituent the
+        descendants are not visited, so filling a tree bottom-up costs linear
+        time on the size of the tree.
+
+        :param constituent: The constituent to fill
+        :param deep: The deep of the constituent, default 0
+
+        :return: Nothing
+        """
+        children = self.get_syntactic_children_sorted(constituent)
+        content_text = " ".join(child[FORM] for child in children).strip()
+        constituent[LABEL] = self.label_pattern.format(
+            content_text, constituent[TAG])
+        constituent[LEMMA] = " ".join(
+            child[LEMMA] for child in children).strip()
+        constituent[FORM] = content_text
+        constituent[BEGIN] = children[0][BEGIN]
+        constituent[END] = children[-1][END]
+        constituent[SPAN] = (
+            children[0][SPAN][0],
+            children[-1][SPAN][-1]
+        )
+        constituent[DEEP] = deep
+        for child in children:
+            if child[self.node_type] == self.word_node_type:
+                child[DEEP] = deep + 1
+        self._fill_head_word(constituent)
+
+    def _fill_head_word(self, constituent):
+        """ Set the head word of a constituent and inherit its values.
+
+        :param constituent: The constituent to fill
+        """
         head_word = self.get_head_word(constituent)
         self.set_head_word(constituent, head_word)
         constituent[self.doc_type] = head_word.get(self.doc_type, None)
@@ -4,12 +4,13 @@
 """
 
 import logging
-from collections import defaultdict, deque
-from operator import itemgetter
+from collections import defaultdict, deque, namedtuple
+from operator import itemgetter, attrgetter
 from pynaf import NAFDocument, KAFDocument
 
 
 from corefgraph.graph.builder import BaseGraphBuilder
+from corefgraph.graph.nafreader import NafStreamReader
 from corefgraph.graph.wrapper import GraphWrapper
 from corefgraph.resources import tree
 from corefgraph.resources.dictionaries import stopwords
@@ -19,6 +20,9 @@ from corefgraph.constants import POS, NER, TAG, SPAN, FORM, ID, SENTENCE, QUOTED
 
 __author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
 
+# The attributes of a kaf word used to build the terms
+KafWord = namedtuple("KafWord", ("id", "offset", "length", "text"))
+
 
 class NafAndTreeGraphBuilder(BaseGraphBuilder):
     """Extract the info from KAF documents and TreeBank."""
@@ -57,19 +61,30 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
             raise Exception("Unknown Reader")
         self.secure_tree = secure_tree
         self.logger = logger
+        self.graph_utils = GraphWrapper
+
+    def reset(self):
+        """ Discard the graph and the state of the current document, so the
+        builder can be reused with the next one.
+        """
+        super(NafAndTreeGraphBuilder, self).reset()
         self.syntax_count = 0
         self.leaf_count = 0
         self.naf = None
+        self.naf_string = None
+        self.naf_reader = None
+        self._naf_layers = None
+        self.kaf_words = dict()
         self.sentence_order = 0
         self.utterance = -1
-        self.speakers = []
+        self.speakers = deque()
         self.max_utterance = 1
-        self.terms_pool = []
+        self.terms_pool = deque()
         self.term_by_id = dict()
         self.term_by_word_id = dict()
         self.entities_by_word = dict()
+        self.mentions_by_word = dict()
         self._sentences = None
-        self.graph_utils = GraphWrapper
 
     def process_document(self, document):
         """ Get a document and prepare the graph and the graph builder to
@@ -82,10 +97,12 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
         self.sentence_order = 1
         if document[1]:
             self._sentences = document[1].strip().split("\n")
+        else:
+            self._sentences = None
         # If speaker is None store None otherwise store split speaker file
         if document[2]:
             # Remove the blank lines and split
-            self.speakers = []
+            self.speakers = deque()
             current_speaker = None
             self.max_utterance = 0
             for line in document[2].split("\n"):
@@ -100,7 +117,7 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
 
             # A doc is a conversation if exist two o more speakers in it
         else:
-            self.speakers = []
+            self.speakers = deque()
 
             self.max_utterance = 1
         self.set_speakers(self.speakers)
@@ -108,31 +125,85 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
         self._parse_naf(naf_string=document[0].strip())
 
     def get_original(self):
-        """ Return the original NAF document """
+        """ Return the original NAF document. The document is built the first
+        time it is asked, the graph is built from a streamed read.
+        """
+        if self.naf is None and self.naf_string is not None:
+            self.naf = self.document_reader(input_stream=self.naf_string)
         return self.naf
 
     def get_sentences(self):
         """ Get the sentences of the document.
 
-        :return: A list of trees(kaf nodes or Penn Treebank strings)
+        :return: A list of trees(Penn Treebank strings) or a generator of kaf
+            trees that are released once the next one is asked.
         """
         if self._sentences:
             return self._sentences
         else:
-            return self.naf.get_constituency_trees()
+            return self._stream_naf_sentences()
+
+    def _stream_naf_sentences(self):
+        """ Read the trees of the constituency layer one by one and, after
+        the last one, the rest of the layers of the document.
+        """
+        for naf_tree in self.naf_reader.get_constituency_trees():
+            yield naf_tree
+        self._read_naf_layers(stop_at_trees=False)
 
     def _parse_naf(self, naf_string):
         """ Parse all the kaf info tho the graph except of sentence parsing.
 
+        The document is streamed layer by layer. If the sentences are the kaf
+        trees the reading stops at the constituency layer and the rest of the
+        document is read while the sentences are fetched.
+
         :param naf_string: The string that contains the string of the NAF file content.
         """
-        self.terms_pool = []
+        self.terms_pool = deque()
         # Store original kaf for further recreation
-        self.naf = self.document_reader(input_stream=naf_string)
-        self._set_terms(self.naf)
-        self._set_entities(self.naf)
-        self._set_mentions(self.naf)
-        self._set_dependencies(self.naf)
+        self.naf = None
+        self.naf_string = naf_string
+        self.naf_reader = NafStreamReader(self.document_reader, naf_string)
+        self._naf_layers = self.naf_reader.layers()
+        self.kaf_words = dict()
+        self.term_by_id = dict()
+        self.term_by_word_id = dict()
+        self.entities_by_word = defaultdict(list)
+        self.mentions_by_word = defaultdict(list)
+        self._read_naf_layers(stop_at_trees=not self._sentences)
+
+    def _read_naf_layers(self, stop_at_trees):
+        """ Read the layers of the document into the graph.
+
+        :param stop_at_trees: Stop when the constituency layer is reached,
+            otherwise the trees are skipped.
+        """
+        for layer in self._naf_layers:
+            if layer == self.document_reader.TEXT_LAYER_TAG:
+                self._set_words(self.naf_reader)
+            elif layer == self.document_reader.TERMS_LAYER_TAG:
+                self._set_terms(self.naf_reader)
+            elif layer == self.document_reader.NAMED_ENTITIES_LAYER_TAG:
+                self._set_entities(self.naf_reader)
+            elif layer == self.document_reader.COREFERENCE_LAYER_TAG:
+                self._set_mentions(self.naf_reader)
+            elif layer == self.document_reader.DEPENDENCY_LAYER_TAG:
+                self._set_dependencies(self.naf_reader)
+            elif layer == self.document_reader.CONSTITUENCY_LAYER and stop_at_trees:
+                return
+
+    def _set_words(self, naf):
+        """ Extract the words of the kaf. Only the attributes used to build
+        the terms are kept.
+
+        :param naf: The kaf file manager
+        """
+        for kaf_word in naf.get_words():
+            word_id = kaf_word.attrib[self.document_reader.WORD_ID_ATTRIBUTE]
+            self.kaf_words[word_id] = KafWord(
+                word_id, kaf_word.attrib[self.naf_offset_property],
+                kaf_word.attrib[self.naf_word_length], kaf_word.text)
 
     def _set_terms(self, naf):
         """ Extract the terms of the kaf and add to the graph
@@ -140,12 +211,8 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
         :param naf: The kaf file manager
         """
         # Words
-        kaf_words = dict([
-                             (kaf_word.attrib[self.document_reader.WORD_ID_ATTRIBUTE], kaf_word)
-                             for kaf_word in naf.get_words()])
+        kaf_words = self.kaf_words
         # Terms
-        self.term_by_id = dict()
-        self.term_by_word_id = dict()
         prev_speaker = None
         prev_form = None
         if self.max_utterance > 1:
@@ -163,23 +230,20 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
                 (
                     kaf_words[word.attrib[ID]]
                     for word in naf.get_terms_words(term)),
-                key=lambda x: x.attrib[self.naf_offset_property])
+                key=attrgetter("offset"))
             # Build term attributes
             form = self._expand_kaf_word(term_words)
             span = (
-                int(term_words[0].attrib[
-                    self.document_reader.WORD_ID_ATTRIBUTE][1:]),
-                int(term_words[-1].attrib[
-                    self.document_reader.WORD_ID_ATTRIBUTE][1:]))
-            begin = int(term_words[0].attrib[self.naf_offset_property])
-            end = int(term_words[-1].attrib[self.naf_offset_property]) \
-                + int(term_words[-1].attrib[self.naf_word_length]) - 1
+                int(term_words[0].id[1:]),
+                int(term_words[-1].id[1:]))
+            begin = int(term_words[0].offset)
+            end = int(term_words[-1].offset) \
+                + int(term_words[-1].length) - 1
             # We want pennTreeBank tagging no kaf tagging
             pos = term.attrib[self.document_reader.MORPHOFEAT_ATTRIBUTE]
             kaf_id = self.id_pattern.format(
                 term_id, "|".join(
-                    [word.attrib[self.document_reader.WORD_ID_ATTRIBUTE]
-                     for word in term_words]))
+                    [word.id for word in term_words]))
             # Clear unicode problems
             if isinstance(form, unicode):
                 form = form.encode(self.encoding)
@@ -199,7 +263,7 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
             word_node[self.naf_id_property] = kaf_id
             word_node[PREV_SPEAKER] = prev_speaker
             if self.speakers:
-                speaker = self.speakers.pop(0)
+                speaker = self.speakers.popleft()
                 if not speaker or speaker == "-":
                     form_speaker = self.speaker_pattern.format(self.utterance)
                 else:
@@ -240,9 +304,7 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
             # Store term
             # ONLY FOR STANFORD DEPENDENCIES IN KAF
             for word in term_words:
-                self.term_by_word_id[
-                    word.attrib[
-                        self.document_reader.WORD_ID_ATTRIBUTE]] = word_node
+                self.term_by_word_id[word.id] = word_node
             self.term_by_id[term_id] = word_node
             self.terms_pool.append(word_node)
         self.leaf_count = 0
@@ -254,7 +316,6 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
         """
         # A dict of entities that contains a list of references.
         # A reference is a list of terms.
-        self.entities_by_word = defaultdict(list)
         for kaf_entity in naf.get_entities():
             entity_type = kaf_entity.attrib[self.naf_entity_type]
             entity_id = kaf_entity.attrib[
@@ -282,9 +343,14 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
                 for term in entity_terms:
                     self.link_word(entity, term)
                     # term[HEAD_OF_NER] = entity_type
-                # Index the entity by its first word
-                first_word_id = entity_terms[0][ID]
-                self.entities_by_word[first_word_id].append(entity)
+                # Add the entity to its sentence or, if the sentence is not
+                # built yet, index the entity by its first word
+                sentence = self.get_root(entity_terms[0])
+                if sentence is None:
+                    self.entities_by_word[entity_terms[0][ID]].append(entity)
+                else:
+                    self.add_mention_of_named_entity(
+                        sentence=sentence, mention=entity)
 
     def _set_mentions(self, naf):
         """ Extract the entities of the kaf and add to the graph
@@ -293,7 +359,6 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
         """
         # A dict of entities that contains a list of references.
         # A reference is a list of terms.
-        self.mentions_by_word = defaultdict(list)
         for kaf_entity in naf.get_coreference():
             entity_id = kaf_entity.attrib[
                 self.document_reader.COREFERENCE_ID_ATTRIBUTE]
@@ -313,19 +378,23 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
                 mention = self.add_gold_mention(
                     node_id=self.id_pattern.format(entity_id, counter),
                     gold_entity=entity_id,
-                    label=label)
+                    label=label,
+                    span=(entity_terms[0][SPAN][0],
+                          entity_terms[-1][SPAN][-1]))
                 # Set the other attributes
                 mention[SINGLETON] = singleton
                 mention[FORM] = form
-                mention[SPAN] = (
-                    entity_terms[0][SPAN][0],
-                    entity_terms[-1][SPAN][-1])
                 # Link words_ids to mention as word
                 for term in entity_terms:
                     self.link_word(mention, term)
-                # Index the entity by its first word
-                first_word_id = entity_terms[0][ID]
-                self.mentions_by_word[first_word_id].append(mention)
+                # Add the mention to its sentence or, if the sentence is not
+                # built yet, index the mention by its first word
+                sentence = self.get_root(entity_terms[0])
+                if sentence is None:
+                    self.mentions_by_word[entity_terms[0][ID]].append(mention)
+                else:
+                    self.add_mention_of_gold_mention(
+                        sentence=sentence, mention=mention)
 
     def _set_dependencies(self, naf):
         """ Extract the dependencies of the kaf and add to the graph
@@ -379,13 +448,14 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
         # Return the generated context graph
         return sentence_root_node
 
-    def _iterate_syntax(self, syntactic_tree, parent, syntactic_root):
+    def _iterate_syntax(self, syntactic_tree, parent, syntactic_root, deep=1):
         """ Walk recursively over the syntax tree and add their info to the
-        graph.
+        graph. Each constituent is filled once, bottom-up, from its children.
 
         :param syntactic_tree: The subtree to process
         :param parent: The parent node of the subtree
         :param syntactic_root: The syntactic root node of all the tree
+        :param deep: The deep of the top of the subtree
 
         :return: The element created from the top of the subtree
         """
@@ -406,7 +476,7 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
             is_head = "=H" in text_leaf or "-H" in text_leaf
             leaf_pos = text_leaf.split()[0].replace("=H", "").replace("-H", "")
             try:
-                word_node = self.terms_pool.pop(0)
+                word_node = self.terms_pool.popleft()
                 self.last_word = word_node
             except IndexError:
                 self.logger.warning("Unaligned Tree LEAF")
@@ -465,12 +535,10 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
             self.set_ner(new_constituent, ner)
             self.syntax_count += 1
             # Process the children
-            children = [
+            for child in branch:
                 self._iterate_syntax(
                     syntactic_tree=child, parent=new_constituent,
-                    syntactic_root=syntactic_root)
-                for child in branch]
-            children.sort(key=itemgetter(SPAN))
+                    syntactic_root=syntactic_root, deep=deep + 1)
 
             # Link the child with their parent (The actual processed node)
             self.link_syntax_non_terminal(
@@ -478,7 +546,7 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
             if head:
                 self.set_head(parent_node, new_constituent)
 
-            self.fill_constituent(new_constituent)
+            self.fill_constituent_from_children(new_constituent, deep)
             new_constituent[TREE] = branch
             return new_constituent
 
@@ -521,16 +589,18 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
                 self.logger.warning("No ROOT found: lowest id constituent used %s", lowest_id)
 
         # Process bottom-up the syntax tree. Edge by edge.
-        node_process_list = terminals_words.keys()
-        while len(node_process_list):
-            edge = edges_by_departure_node[node_process_list.pop(0)]
+        node_process_list = deque(terminals_words.keys())
+        queued = set(node_process_list)
+        while node_process_list:
+            edge = edges_by_departure_node[node_process_list.popleft()]
             # The edges have a down-top direction
             target_id = edge.attrib[self.naf_tree_to]
             source_id = edge.attrib[self.naf_tree_from]
-            # Add the target to processing queue.
+            # Add the target to processing queue once.
             # Root doesn't have to be processed.
             target = constituents_by_id[target_id]
-            if target != syntactic_root:
+            if target is not syntactic_root and target_id not in queued:
+                queued.add(target_id)
                 node_process_list.append(target_id)
             # select link type in base of the source node type
             # Relations from No terminal edge (Constituent)
@@ -581,7 +651,7 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
         #         self.fill_constituent(constituent)
 
     def _naf_process_terminals(self, sentence):
-        terminals = self.naf.get_constituent_tree_terminals(sentence)
+        terminals = self.naf_reader.get_constituent_tree_terminals(sentence)
         terminals_words = dict()
         # Build Terminals constituents
         for terminal in terminals:
@@ -589,12 +659,12 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
             terminals_words[terminal_id] = [
                 self.term_by_id[target_term.attrib[ID]]
                 for target_term
-                in self.naf.get_constituent_terminal_words(terminal)]
+                in self.naf_reader.get_constituent_terminal_words(terminal)]
         return terminals_words
 
     def process_edges(self, sentence):
         edges_by_departure_node = {}
-        edges_list = self.naf.get_constituent_tree_edges(sentence)
+        edges_list = self.naf_reader.get_constituent_tree_edges(sentence)
         for edge in edges_list:
             edges_by_departure_node[edge.attrib[self.naf_tree_from]] = edge
         return edges_by_departure_node
@@ -612,7 +682,7 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
         root = None
         # Build no terminal constituents
         for non_terminal \
-                in self.naf.get_constituent_tree_non_terminals(sentence):
+                in self.naf_reader.get_constituent_tree_non_terminals(sentence):
             constituent_id = non_terminal.attrib[ID]
             tag = non_terminal.attrib[self.naf_label]
             if constituent_tags.root(tag):
@@ -637,7 +707,7 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
         :return: The upper node of the syntax tree.
         """
         # Convert the syntactic tree
-        if type(sentence) is str:
+        if isinstance(sentence, basestring):
             logging.warning("Using TreeBank syntax processor This is  not recomended this code is discontinued."
                             "you have ven warned")
             # Is a plain Penn-tree
@@ -650,11 +720,12 @@ class NafAndTreeGraphBuilder(BaseGraphBuilder):
             self._iterate_syntax(
                 syntactic_tree=syntactic_tree, parent=syntactic_root,
                 syntactic_root=syntactic_root)
+            self.fill_constituent_from_children(syntactic_root)
         else:
             # Is a Naf tree
             self._parse_syntax_naf(
                 sentence=sentence, syntactic_root=syntactic_root)
-        self.fill_constituent(syntactic_root)
+            self.fill_constituent(syntactic_root)
 
     # AUX FUNCTIONS
     @staticmethod
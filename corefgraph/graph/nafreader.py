@@ -0,0 +1,191 @@
+# coding=utf-8
+""" Incremental reader of NAF/KAF documents.
+
+The document is parsed with iterparse and each layer is read in document order.
+The elements of a layer are handed to the consumer one by one and removed from
+the document as soon as the consumer asks for the next one, so the whole DOM is
+never kept in memory.
+"""
+
+from io import BytesIO
+from lxml import etree
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+class NafStreamReader(object):
+    """ Read a NAF or KAF document layer by layer.
+
+    The layers are walked with layers(). While a layer is the current one, its
+    elements are fetched with the getter of the layer (get_words, get_terms,
+    get_entities, get_coreference, get_dependencies or
+    get_constituency_trees); the rest of the getters mirror the pynaf ones, so
+    the fetched elements are used in the same way.
+    """
+
+    def __init__(self, document_reader, input_stream, encoding="utf-8"):
+        """ Prepare the reader.
+
+        :param document_reader: The pynaf class of the document (NAFDocument
+            or KAFDocument). Tag and attribute names are taken from it.
+        :param input_stream: The string with the content of the document.
+        :param encoding: The encoding used with unicode input streams.
+        """
+        if isinstance(input_stream, unicode):
+            input_stream = input_stream.encode(encoding)
+        self.document_reader = document_reader
+        self._events = etree.iterparse(
+            BytesIO(input_stream), events=("start", "end"), remove_comments=True)
+        self._root = None
+        self._layer = None
+
+    def layers(self):
+        """ Walk the layers of the document.
+
+        :return: A generator of the tags of the layers. The part of a layer
+            not read by the consumer is skipped when the next layer is asked.
+        """
+        for event, element in self._events:
+            if event != "start":
+                continue
+            if self._root is None:
+                self._root = element
+            elif element.getparent() is self._root:
+                self._layer = element
+                yield element.tag
+                self.skip_layer()
+
+    def skip_layer(self):
+        """ Discard the rest of the current layer."""
+        for _ in self._layer_elements(None):
+            pass
+
+    def _layer_elements(self, tag):
+        """ Read the elements of the current layer. Each element is yielded
+        once it is complete and removed from the document when the next one
+        is asked.
+
+        :param tag: The tag of the wanted elements, None for all.
+        """
+        layer = self._layer
+        if layer is None:
+            return
+        for event, element in self._events:
+            if event != "end":
+                continue
+            if element is layer:
+                self._layer = None
+                layer.clear()
+                self._root.remove(layer)
+                return
+            if element.getparent() is layer:
+                if tag is None or element.tag == tag:
+                    yield element
+                element.clear()
+                layer.remove(element)
+
+    def _current_layer_elements(self, layer_tag, tag):
+        """ Read the elements of a layer if it is the current one.
+
+        :param layer_tag: The tag of the layer.
+        :param tag: The tag of the wanted elements.
+        """
+        if self._layer is None or self._layer.tag != layer_tag:
+            return iter(())
+        return self._layer_elements(tag)
+
+    def get_words(self):
+        """ Read the words of the current text layer."""
+        return self._current_layer_elements(
+            self.document_reader.TEXT_LAYER_TAG,
+            self.document_reader.WORD_OCCURRENCE_TAG)
+
+    def get_terms(self):
+        """ Read the terms of the current terms layer."""
+        return self._current_layer_elements(
+            self.document_reader.TERMS_LAYER_TAG,
+            self.document_reader.TERM_OCCURRENCE_TAG)
+
+    def get_entities(self):
+        """ Read the named entities of the current entities layer."""
+        return self._current_layer_elements(
+            self.document_reader.NAMED_ENTITIES_LAYER_TAG,
+            self.document_reader.NAMED_ENTITY_OCCURRENCE_TAG)
+
+    def get_coreference(self):
+        """ Read the coreference entities of the current coreference layer."""
+        return self._current_layer_elements(
+            self.document_reader.COREFERENCE_LAYER_TAG,
+            self.document_reader.COREFERENCE_OCCURRENCE_TAG)
+
+    def get_dependencies(self):
+        """ Read the dependencies of the current dependency layer."""
+        return self._current_layer_elements(
+            self.document_reader.DEPENDENCY_LAYER_TAG,
+            self.document_reader.DEPENDENCY_OCCURRENCE_TAG)
+
+    def get_constituency_trees(self):
+        """ Read the trees of the current constituency layer."""
+        return self._current_layer_elements(
+            self.document_reader.CONSTITUENCY_LAYER,
+            self.document_reader.CONSTITUENCY_TREE_TAG)
+
+    def get_terms_words(self, term):
+        """ Get the words that forms the term.
+
+        :param term: Term node whose words are wanted.
+        """
+        return term.findall("{0}/{1}".format(
+            self.document_reader.SPAN_TAG, self.document_reader.TARGET_TAG))
+
+    def get_entity_references(self, named_entity):
+        """ Get the references of a named entity.
+
+        :param named_entity: The entity whose references are wanted.
+        """
+        return named_entity.findall("{0}/{1}".format(
+            self.document_reader.NAMED_ENTITY_REFERENCES_GROUP_TAG,
+            self.document_reader.SPAN_TAG))
+
+    def get_coreference_mentions(self, coreference):
+        """ Get the mentions of a coreference entity.
+
+        :param coreference: The entity whose mentions are wanted.
+        """
+        return coreference.findall(self.document_reader.SPAN_TAG)
+
+    def get_reference_span(self, reference):
+        """ Get the targets of a reference.
+
+        :param reference: The reference whose targets are wanted.
+        """
+        return reference.findall(self.document_reader.TARGET_TAG)
+
+    def get_constituent_tree_non_terminals(self, tree):
+        """ Get the non-terminal constituents of a tree.
+
+        :param tree: The tree whose elements are wanted.
+        """
+        return tree.findall(self.document_reader.CONSTITUENCY_NON_TERMINALS)
+
+    def get_constituent_tree_terminals(self, tree):
+        """ Get the terminal constituents of a tree.
+
+        :param tree: The tree whose elements are wanted.
+        """
+        return tree.findall(self.document_reader.CONSTITUENCY_TERMINALS)
+
+    def get_constituent_tree_edges(self, tree):
+        """ Get the edges of a tree.
+
+        :param tree: The tree whose elements are wanted.
+        """
+        return tree.findall(self.document_reader.CONSTITUENCY_EDGES)
+
+    def get_constituent_terminal_words(self, constituent):
+        """ Get the terms of a terminal constituent.
+
+        :param constituent: The constituent whose terms are wanted.
+        """
+        return constituent.findall("{0}/{1}".format(
+            self.document_reader.SPAN_TAG, self.document_reader.TARGET_TAG))
@@ -22,8 +22,37 @@ class GraphWrapper:
         graph = nx.MultiDiGraph()
         # List of nodes by type
         graph.graph["index"] = defaultdict(list)
+        # Neighbours of each node by relation type: {node: {relation: [node]}}
+        graph.graph["out_relations"] = {}
+        graph.graph["in_relations"] = {}
         return graph
 
+    @classmethod
+    def _index_relation(cls, graph, origin, target, relation_type):
+        """ Store a new edge in the typed adjacency index of the graph.
+
+        :param graph: The graph
+        :param origin: ID of the node where the edge is originated
+        :param target: ID of the node where the edge ended
+        :param relation_type: The type of the edge
+        """
+        graph.graph["out_relations"].setdefault(origin, {}).setdefault(
+            relation_type, []).append(target)
+        graph.graph["in_relations"].setdefault(target, {}).setdefault(
+            relation_type, []).append(origin)
+
+    @classmethod
+    def _unindex_relation(cls, graph, origin, target, relation_type):
+        """ Drop an edge from the typed adjacency index of the graph.
+
+        :param graph: The graph
+        :param origin: ID of the node where the edge is originated
+        :param target: ID of the node where the edge ended
+        :param relation_type: The type of the edge
+        """
+        graph.graph["out_relations"][origin][relation_type].remove(target)
+        graph.graph["in_relations"][target][relation_type].remove(origin)
+
     @classmethod
     def link(cls, graph, origin, target, link_type=None, weight=None, label=None, value=None):
         """Link two nodes of the graph. The origin and target parameters  may be nodes ID or nodes if their ids if they
@@ -52,7 +81,10 @@ class GraphWrapper:
             origin = origin[ID]
         if isinstance(target, dict):
             target = target[ID]
+        new_relation = not graph.has_edge(origin, target, key)
         relation = graph.add_edge(origin, target, key=key, attr_dict=properties)
+        if new_relation:
+            cls._index_relation(graph, origin, target, key)
         return relation
 
     @classmethod
@@ -93,6 +125,28 @@ class GraphWrapper:
         """
         graph.graph[property_name] = value
 
+    @classmethod
+    def _get_relations(cls, graph, index, node, relation_type):
+        """ Get the IDs of the nodes linked to a node with a type of relation.
+        :param graph: The graph of the search
+        :param index: The name of the adjacency index ("out_relations" or
+            "in_relations")
+        :param node: The node of the search
+        :param relation_type: The type of the relation
+        :return: A list of node IDs, in link order
+        """
+        return graph.graph[index].get(node[ID], {}).get(relation_type, ())
+
+    @classmethod
+    def count_out_neighbours_by_relation_type(cls, graph, node, relation_type):
+        """ Return the number of out neighbours of node linked with a relation of type.
+        :param graph: The graph of the search
+        :param node: The origin node of the edge
+        :param relation_type: The type of the relation
+        :return: The number of target nodes
+        """
+        return len(cls._get_relations(graph, "out_relations", node, relation_type))
+
     @classmethod
     def get_out_neighbour_by_relation_type(cls, graph, node, relation_type, keys=False):
         """ Return the first out neighbour linked with the type type of relation.
@@ -102,15 +156,11 @@ class GraphWrapper:
         :param keys: Return the relation keys
         :return: The target node or nothing
         """
-        if keys:
-            for source, target, key in graph.out_edges(node[ID], keys=True):
-                if key == relation_type:
-                    return graph.node[target], graph[node[ID]][target][relation_type].get(
-                        "attr_dict", graph.node[target], graph[node[ID]][target][relation_type])
-        else:
-            for source, target, key in graph.out_edges(node[ID], keys=True):
-                if key == relation_type:
-                    return graph.node[target]
+        for target in cls._get_relations(graph, "out_relations", node, relation_type):
+            if keys:
+                return graph.node[target], graph[node[ID]][target][relation_type].get(
+                    "attr_dict", graph[node[ID]][target][relation_type])
+            return graph.node[target]
         return None
 
     @classmethod
@@ -122,14 +172,13 @@ class GraphWrapper:
         :param keys: Return the relation keys
         :return: A list of the target nodes or empty list.
         """
+        targets = cls._get_relations(graph, "out_relations", node, relation_type)
         if keys:
             return [(graph.node[target], graph[node[ID]][target][relation_type].get(
                 "attr_dict", graph[node[ID]][target][relation_type]))
-                    for source, target, key in graph.out_edges(node[ID], keys=True)
-                    if key == relation_type]
+                    for target in targets]
 
-        return [graph.node[target] for source, target, key in graph.out_edges(node[ID], keys=True)
-                if key == relation_type]
+        return [graph.node[target] for target in targets]
 
     @classmethod
     def get_in_neighbour_by_relation_type(cls, graph, node, relation_type, keys=False):
@@ -140,16 +189,11 @@ class GraphWrapper:
         :param keys: Return the relation keys
         :return: The origin node or nothing
         """
-        if keys:
-            for source, target, key in graph.in_edges(node[ID], keys=True):
-                    if key == relation_type:
-                        return graph.node[source], graph[source][node[ID]][relation_type].get(
-                            "attr_dict", graph[source][node[ID]][relation_type])
-
-        else:
-            for source, target, key in graph.in_edges(node[ID], keys=True):
-                if key == relation_type:
-                    return graph.node[source]
+        for source in cls._get_relations(graph, "in_relations", node, relation_type):
+            if keys:
+                return graph.node[source], graph[source][node[ID]][relation_type].get(
+                    "attr_dict", graph[source][node[ID]][relation_type])
+            return graph.node[source]
         return None
 
     @classmethod
@@ -161,14 +205,13 @@ class GraphWrapper:
         :param keys: Return the relation keys
         :return: The origin node or nothing
         """
+        sources = cls._get_relations(graph, "in_relations", node, relation_type)
         if keys:
             return [(graph.node[source], graph[source][node[ID]][relation_type].get(
                 "attr_dict", graph[source][node[ID]][relation_type]))
-                    for source, target, key in graph.in_edges(node[ID], keys=True)
-                    if key == relation_type]
+                    for source in sources]
 
-        return [graph.node[source] for source, target, relation in graph.in_edges(node[ID], keys=True)
-                if relation == relation_type]
+        return [graph.node[source] for source in sources]
 
     @classmethod
     def get_node_by_id(cls, graph, node_id):
@@ -274,8 +317,15 @@ class GraphWrapper:
     def unlink(cls, graph, origin, target):
         """  Remove all the edges between :param origin: and :param target in a :param graph.
         """
-        for edge in graph.edge(origin, target, all_edges=True):
-            graph.remove_edge(edge)
+        if isinstance(origin, dict):
+            origin = origin[ID]
+        if isinstance(target, dict):
+            target = target[ID]
+        if not graph.has_edge(origin, target):
+            return
+        for key in list(graph[origin][target]):
+            graph.remove_edge(origin, target, key)
+            cls._unindex_relation(graph, origin, target, key)
 
     @classmethod
     def remove(cls, graph, element):
@@ -284,7 +334,19 @@ class GraphWrapper:
         :param element:
         :return:
         """
-        graph.remove_node(element[ID])
+        node_id = element[ID]
+        out_relations = graph.graph["out_relations"].pop(node_id, {})
+        in_relations = graph.graph["in_relations"].pop(node_id, {})
+        # The self loops are already dropped with the node indexes
+        for relation_type, targets in out_relations.items():
+            for target in targets:
+                if target != node_id:
+                    graph.graph["in_relations"][target][relation_type].remove(node_id)
+        for relation_type, sources in in_relations.items():
+            for source in sources:
+                if source != node_id:
+                    graph.graph["out_relations"][source][relation_type].remove(node_id)
+        graph.remove_node(node_id)
 
     # @classmethod
     # def get_gephi(cls, graph):
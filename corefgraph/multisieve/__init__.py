@@ -5,6 +5,8 @@ from collections import defaultdict
 from logging import getLogger
 
 from corefgraph.constants import SPAN, FORM, ID
+from corefgraph.report import Report
+from corefgraph.timing import Timings
 
 __author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
 __date__ = '14-11-2012'
@@ -30,7 +32,8 @@ class CoreferenceProcessor:
                  mention_catchers,
                  mention_filters,
                  mention_purges,
-                 meta_info
+                 meta_info,
+                 timings=None
                  ):
 
         from corefgraph.multisieve.extractors import SentenceCandidateExtractor
@@ -38,6 +41,7 @@ class CoreferenceProcessor:
 
         self.graph_builder = graph_builder
         self.meta_info = meta_info
+        self.timings = timings or Timings()
         self.purges_names = mention_purges
         self.purges = self.load_purges(mention_purges)
 
@@ -65,14 +69,23 @@ class CoreferenceProcessor:
         )
         self.multi_sieve = MultiSieveProcessor(
             sieves_list=sieves_list,
-            meta_info=self.meta_info
+            meta_info=self.meta_info,
+            timings=self.timings
         )
+        self.reset()
+
+    def reset(self):
+        """ Discard the mentions, the entities and the meta info of the current
+        document, so the processor can be reused with the next one.
+        """
         self.mentions_textual_order = []
         self.mentions_candidate_order = []
 
         self.coreference_proposal = []
         self.coreference_gold = []
 
+        self.extractor.reset()
+        self.multi_sieve.reset()
         self.prepare_meta()
 
     def load_purges(self, mention_purges):
@@ -115,7 +128,9 @@ class CoreferenceProcessor:
         # Get the gold mentions spans to store wrong purges in metadata
         gold_mentions = [m[SPAN] for m in self.graph_builder.get_all_gold_mentions()]
         # Purge the system output to match annotation guidelines  and clean useful but bo valid mentions
-        indexed_clusters = self.post_process(coreference_proposal, gold_mentions, indexed_clusters)
+        with self.timings.measure("purge") as stage:
+            indexed_clusters = self.post_process(coreference_proposal, gold_mentions, indexed_clusters)
+            stage.counts["entities"] += indexed_clusters
 
         self.logger.info("Indexed clusters: %d", indexed_clusters)
 
@@ -203,23 +218,36 @@ class CoreferenceProcessor:
         self.lost_purged = {}
         self.not_purged = {}
 
+    def _purges_meta(self):
+        """ The mentions removed, or not, by each purge."""
+        return {
+            "OK": {
+                name: {span: mention[ID] for (span, mention) in purge.items()} for name, purge in self.ok_purged.items()},
+            "WRONG": {
+                name: {span: mention[ID] for (span, mention) in purge.items()} for name, purge in self.wrong_purged.items()},
+            "LOST": {
+                "all": {span: mention[ID] for (span, mention) in self.lost_purged.items()}},
+            "NO": {
+                span: mention[ID] for (span, mention) in self.not_purged.items()}
+        }
+
+    def fill_report(self, report):
+        """ Add the sections of the sieves, the purges and the extractor to a
+        meta info report.
+
+        :param report: The Report of the document.
+        """
+        report.add("sieves", self.multi_sieve.get_meta)
+        report.add("forms", self.multi_sieve.get_forms_meta)
+        report.add("pairs", self.multi_sieve.get_pairs_meta)
+        report.add("purges", self._purges_meta)
+        self.extractor.fill_report(report)
+
     def get_meta(self):
         """  Recover the statistics obtained while processing the graph.
 
         :return: A struck of dictionaries.
         """
-        meta = {
-            "sieves": self.multi_sieve.get_meta(),
-            "purges":  {
-                "OK": {
-                    name: {span: mention[ID] for (span, mention) in purge.items()} for name, purge in self.ok_purged.items()},
-                "WRONG": {
-                    name: {span: mention[ID] for (span, mention) in purge.items()} for name, purge in self.wrong_purged.items()},
-                "LOST": {
-                    "all": {span: mention[ID] for (span, mention) in self.lost_purged.items()}},
-                "NO": {
-                    span: mention[ID] for (span, mention) in self.not_purged.items()}
-            }
-        }
-        meta.update(self.extractor.get_meta())
-        return meta
+        report = Report()
+        self.fill_report(report)
+        return report.to_dict()
@@ -0,0 +1,86 @@
+# coding=utf-8
+""" The blocking index of the candidates of a sieve.
+
+A sieve that only links mentions with an equal key (the cleaned form, the
+head form...) does not need to check every previous mention. The index keeps
+the mentions of the document by their keys, and returns the candidates of a
+mention found by key in the same order that Sieve.get_candidates would have
+returned them, so the first candidate linked is the same.
+"""
+
+from operator import itemgetter
+
+from corefgraph.constants import ID
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+class CandidateIndex(object):
+    """ The mentions of a document by their blocking keys."""
+
+    def __init__(self, keys, candidates_position, mentions_order=()):
+        """
+        :param keys: A function that receives a mention and returns its keys.
+        :param candidates_position: The position of each mention in its
+            sentence in the candidate order, by mention ID.
+        :param mentions_order: The sentences of mentions in textual order.
+        """
+        self.keys = keys
+        self.candidates_position = candidates_position
+        self._buckets = {}
+        self._positions = {}
+        for index_sentence, sentence in enumerate(mentions_order):
+            self.add_sentence(index_sentence, sentence)
+
+    def add_sentence(self, index_sentence, sentence):
+        """ Add the mentions of a sentence.
+
+        :param index_sentence: The index of the sentence.
+        :param sentence: The mentions of the sentence in textual order.
+        """
+        buckets = self._buckets
+        for position, mention in enumerate(sentence):
+            self._positions[mention[ID]] = (index_sentence, position)
+            for key in self.keys(mention):
+                try:
+                    buckets[key].append(mention)
+                except KeyError:
+                    buckets[key] = [mention]
+
+    def find(self, keys):
+        """ Get the mentions of any of the keys.
+
+        :param keys: The keys.
+        :return: A dict of the mentions by ID.
+        """
+        found = {}
+        for key in keys:
+            for mention in self._buckets.get(key, ()):
+                found[mention[ID]] = mention
+        return found
+
+    def order(self, candidates, mention, index_sentence):
+        """ Sort the candidates of a mention as Sieve.get_candidates: the
+        previous mentions of its sentence in candidate order, then the mentions
+        of the previous sentences, from the nearest one, in textual order. The
+        mentions that get_candidates would not return are dropped.
+
+        :param candidates: The mentions to sort.
+        :param mention: The mention whose candidates are sorted.
+        :param index_sentence: The index of the sentence of the mention.
+        :return: A list of the candidates.
+        """
+        positions = self._positions
+        candidates_position = self.candidates_position
+        mention_position = candidates_position[mention[ID]]
+        ordered = []
+        for candidate in candidates:
+            candidate_sentence, text_position = positions[candidate[ID]]
+            if candidate_sentence == index_sentence:
+                position = candidates_position[candidate[ID]]
+                if position < mention_position:
+                    ordered.append(((0, position), candidate))
+            elif candidate_sentence < index_sentence:
+                ordered.append(((1, index_sentence - candidate_sentence, text_position), candidate))
+        ordered.sort(key=itemgetter(0))
+        return [candidate for key, candidate in ordered]
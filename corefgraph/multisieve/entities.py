@@ -0,0 +1,220 @@
+# coding=utf-8
+""" The store of the coreference entities built by the sieves.
+
+"""
+
+from corefgraph.constants import SPAN, ID
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+class EntityStore(object):
+    """ The coreference entities of a document as a disjoint-set forest.
+
+    Each entity is identified by the ID of its root mention. The root keeps the
+    mentions of the entity sorted in textual order, the IDs of the mentions
+    that are incompatible with the entity, the aggregated attribute values of
+    its mentions and a cache of entity-level properties.
+    """
+
+    def __init__(self, mentions=()):
+        self._parent = {}
+        self._rank = {}
+        self._members = {}
+        self._incompatibles = {}
+        self._aggregates = {}
+        self._properties = {}
+        for mention in mentions:
+            self.add(mention)
+
+    def add(self, mention):
+        """ Add a mention to the store as a single mention entity.
+
+        :param mention: The mention to add.
+        """
+        mention_id = mention[ID]
+        self._parent[mention_id] = mention_id
+        self._rank[mention_id] = 0
+        self._members[mention_id] = [mention]
+        self._incompatibles[mention_id] = set()
+        self._aggregates[mention_id] = {}
+        self._properties[mention_id] = {}
+
+    def find(self, mention):
+        """ Get the root of the entity of a mention.
+
+        :param mention: The mention whose entity is wanted.
+        :return: The ID of the root mention of the entity.
+        """
+        parent = self._parent
+        root = mention[ID]
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression
+        node = mention[ID]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    def get_entity(self, mention):
+        """ Get the entity of a mention.
+
+        :param mention: The mention whose entity is wanted.
+        :return: A tuple of the entity index (the span of its first mention) and
+            the list of the mentions of the entity in textual order.
+        """
+        members = self._members[self.find(mention)]
+        return members[0][SPAN], members
+
+    def same_entity(self, mention_a, mention_b):
+        """ Check if two mentions are in the same entity.
+
+        :param mention_a: One of the mentions.
+        :param mention_b: The other mention.
+        :return: True or False.
+        """
+        return self.find(mention_a) == self.find(mention_b)
+
+    def get_incompatibles(self, mention):
+        """ Get the IDs of the mentions that can not be linked to the entity of
+        a mention. The returned set must not be modified.
+
+        :param mention: A mention of the entity.
+        :return: A set of mention IDs.
+        """
+        return self._incompatibles[self.find(mention)]
+
+    def add_incompatible(self, mention, incompatible_mention):
+        """ Mark a mention as incompatible with the entity of other mention.
+
+        :param mention: A mention of the entity.
+        :param incompatible_mention: The mention that is incompatible.
+        """
+        self._incompatibles[self.find(mention)].add(incompatible_mention[ID])
+
+    def get_aggregate(self, mention, attribute, extract):
+        """ Get the set of the values of an attribute in all the mentions of
+        the entity. The set is built once and updated on each merge with the
+        values of the other entity.
+
+        :param mention: A mention of the entity.
+        :param attribute: The name of the aggregated attribute.
+        :param extract: A function that receives a mention and returns its
+            value for the attribute. All the calls for the same attribute
+            must use an equivalent function.
+        :return: A frozenset with the values.
+        """
+        root = self.find(mention)
+        aggregates = self._aggregates[root]
+        try:
+            return aggregates[attribute][1]
+        except KeyError:
+            values = frozenset(extract(member) for member in self._members[root])
+            aggregates[attribute] = (extract, values)
+            return values
+
+    def get_property(self, mention, property_name, compute):
+        """ Get a cached entity-level property. The cache of an entity is
+        dropped when the entity is merged.
+
+        :param mention: A mention of the entity.
+        :param property_name: The name of the property.
+        :param compute: A function that receives the entity mentions and
+            returns the value of the property. It may use get_aggregate with
+            any of them.
+        :return: The value of the property.
+        """
+        root = self.find(mention)
+        properties = self._properties[root]
+        try:
+            return properties[property_name]
+        except KeyError:
+            value = properties[property_name] = compute(self._members[root])
+            return value
+
+    def merge(self, mention_a, mention_b):
+        """ Merge the entities of two mentions.
+
+        The mentions of both entities are merged in textual order; on equal
+        spans the mentions of the first entity go first.
+
+        :param mention_a: A mention of one entity.
+        :param mention_b: A mention of the other entity.
+        :return: The merged entity, as returned by get_entity.
+        """
+        root_a = self.find(mention_a)
+        root_b = self.find(mention_b)
+        if root_a == root_b:
+            return self.get_entity(mention_a)
+        members_a = self._members.pop(root_a)
+        members_b = self._members.pop(root_b)
+        aggregates = self._merge_aggregates(
+            self._aggregates.pop(root_a), members_a,
+            self._aggregates.pop(root_b), members_b)
+        members = self._merge_members(members_a, members_b)
+        incompatibles_a = self._incompatibles.pop(root_a)
+        incompatibles_b = self._incompatibles.pop(root_b)
+        if len(incompatibles_a) < len(incompatibles_b):
+            incompatibles_a, incompatibles_b = incompatibles_b, incompatibles_a
+        incompatibles_a.update(incompatibles_b)
+        del self._properties[root_a]
+        del self._properties[root_b]
+        # Union by rank
+        if self._rank[root_a] < self._rank[root_b]:
+            root_a, root_b = root_b, root_a
+        elif self._rank[root_a] == self._rank[root_b]:
+            self._rank[root_a] += 1
+        self._parent[root_b] = root_a
+        self._members[root_a] = members
+        self._incompatibles[root_a] = incompatibles_a
+        self._aggregates[root_a] = aggregates
+        self._properties[root_a] = {}
+        return members[0][SPAN], members
+
+    @staticmethod
+    def _merge_aggregates(aggregates_a, members_a, aggregates_b, members_b):
+        """ Join the aggregated attributes of two entities. An attribute
+        aggregated only in one of the entities is extracted from the mentions
+        of the other.
+
+        :param aggregates_a: The aggregates of one entity.
+        :param members_a: The mentions of the entity.
+        :param aggregates_b: The aggregates of the other entity.
+        :param members_b: The mentions of the other entity.
+        :return: The aggregates of the merged entity.
+        """
+        merged = {}
+        for attribute, (extract, values) in aggregates_a.items():
+            try:
+                other_values = aggregates_b[attribute][1]
+            except KeyError:
+                other_values = frozenset(extract(member) for member in members_b)
+            merged[attribute] = (extract, values | other_values)
+        for attribute, (extract, values) in aggregates_b.items():
+            if attribute not in merged:
+                merged[attribute] = (extract, values.union(
+                    extract(member) for member in members_a))
+        return merged
+
+    @staticmethod
+    def _merge_members(members_a, members_b):
+        """ Merge two lists of mentions sorted by span.
+
+        :param members_a: A sorted list of mentions.
+        :param members_b: A sorted list of mentions.
+        :return: A new sorted list with the mentions of both lists.
+        """
+        merged = []
+        index_a = index_b = 0
+        len_a = len(members_a)
+        len_b = len(members_b)
+        while index_a < len_a and index_b < len_b:
+            if members_b[index_b][SPAN] < members_a[index_a][SPAN]:
+                merged.append(members_b[index_b])
+                index_b += 1
+            else:
+                merged.append(members_a[index_a])
+                index_a += 1
+        merged.extend(members_a[index_a:])
+        merged.extend(members_b[index_b:])
+        return merged
@@ -9,7 +9,7 @@ The extractors classes are published in a dictionary ordered by short name. The
 dictionary is called extractors_by_name.
 """
 from collections import defaultdict
-from logging import getLogger
+from logging import getLogger, DEBUG
 
 from pkgutil import iter_modules
 
@@ -18,6 +18,8 @@ from corefgraph.constants import ID, SPAN, FORM, POS, TAG, CONSTITUENT_ALIGN, CO
     NER, INVALID, DEEP, SINGLETON, GOLD_ENTITY
 from corefgraph.multisieve.catchers import catchers_by_name
 from corefgraph.multisieve.filters import filters_by_name
+from corefgraph.multisieve import trace
+from corefgraph.report import Report
 from corefgraph.resources.rules import rules
 from corefgraph.resources.tagset import constituent_tags, ner_tags
 
@@ -57,8 +59,6 @@ class SentenceCandidateExtractor:
             soft_filter,
             gold_boundaries, meta_info):
 
-        self.candidates = []
-
         self.meta_info = meta_info
 
         # Graph management
@@ -79,6 +79,13 @@ class SentenceCandidateExtractor:
             graph_builder, mention_filters)
         self.soft_filter = soft_filter
         self.gold_boundaries = gold_boundaries
+        self.reset()
+
+    def reset(self):
+        """ Discard the mentions and the meta info of the current document, so
+        the extractor can be reused with the next one.
+        """
+        self.candidates = []
 
         # List used to keep mention during the tree traversal
         self._sentence_mentions_bft_order = []
@@ -114,6 +121,10 @@ class SentenceCandidateExtractor:
         self._lost_caught = dict()
         self._no_caught = list()
 
+        # Logging and tracing, checked once for each sentence
+        self.debug = False
+        self._decisions = None
+
     # Dynamic load
     def _load_extractor(self, graph_builder, extractor_name):
         """ Load the extractor used during mention retrieving.
@@ -162,7 +173,6 @@ class SentenceCandidateExtractor:
         return mention_candidate[ID] in self._sentence_candidates_ids
 
     def _catch(self, mention_candidate):
-        span_str = str(mention_candidate[SPAN])
         for catcher in self.catchers:
             # If the span is already in the accepted candidates Skip catching the span.
             if catcher.unique and (mention_candidate[SPAN] in self._sentence_candidates_span):
@@ -170,6 +180,7 @@ class SentenceCandidateExtractor:
             if catcher.catch(mention_candidate):
                 # Candidate is accepted
                 if self.meta_info:
+                    span_str = str(mention_candidate[SPAN])
                     # Remove the candidate form the lost candidate list (a upper representation of the span
                     if span_str in self._lost_caught:
                         del self._lost_caught[span_str]
@@ -183,10 +194,14 @@ class SentenceCandidateExtractor:
                         # Candidate is not a gold one. Bad catching(False positive)
                         self._wrong_caught[catcher.short_name][span_str] = mention_candidate
                 # The node is a valid candidate
-                self.logger.debug(
-                    "Mention accepted: -%s- -%s- %s",
-                    mention_candidate[FORM], mention_candidate[ID],
-                    mention_candidate.get(POS, None) or mention_candidate.get(TAG))
+                if self.debug:
+                    self.logger.debug(
+                        "Mention accepted: -%s- -%s- %s",
+                        mention_candidate[FORM], mention_candidate[ID],
+                        mention_candidate.get(POS, None) or mention_candidate.get(TAG))
+                if self._decisions is not None:
+                    self._decisions.append(trace.Decision(
+                        "extractor", trace.CAUGHT, mention_candidate[ID], None, (catcher.short_name,)))
                 # Check if filter the candidate
                 return True
         if self.meta_info:
@@ -194,7 +209,7 @@ class SentenceCandidateExtractor:
             if mention_candidate[SPAN] in self.gold_entities_spans:
                 # It is a gold one Bad catching (a bottom representation of the span may be checked later, but
                 # the lost is annotated)
-                self._lost_caught[span_str] = mention_candidate
+                self._lost_caught[str(mention_candidate[SPAN])] = mention_candidate
                 self._mentions.append(mention_candidate)
             # Correct false cases aren't annotated because it will be overwhelming
         return False
@@ -226,13 +241,16 @@ class SentenceCandidateExtractor:
 
         :return True if it have to be filtered, false otherwise.
         """
-        span_str = str(mention_candidate[SPAN])
         # Pass candidate for each filter
         for mention_filter in self.filters:
             # Check candidate
             if mention_filter.filter(mention_candidate, prev_mentions):
                 # The candidate is going to be filtered
+                if self._decisions is not None:
+                    self._decisions.append(trace.Decision(
+                        "extractor", trace.FILTERED, mention_candidate[ID], None, (mention_filter.short_name,)))
                 if self.meta_info:
+                    span_str = str(mention_candidate[SPAN])
                     # Check if is a gold one.
                     if mention_candidate[SPAN] in self.gold_entities_spans:
                         # candidate is filters and it is in gold response (Bad filtering: False positive)
@@ -249,6 +267,7 @@ class SentenceCandidateExtractor:
                 return True
         # Candidate is not going to be filtered
         if self.meta_info:
+            span_str = str(mention_candidate[SPAN])
             # Check if is gold one
             if mention_candidate[SPAN] not in self.gold_entities_spans:
                 # Candidate is not filtered and is not in Gold response (Bad filtering: False Negative)
@@ -482,7 +501,8 @@ class SentenceCandidateExtractor:
         :param sentence: The sentence whose mentions are wanted.
         """
         # Initialize sentence structures
-
+        self.debug = self.logger.isEnabledFor(DEBUG)
+        self._decisions = trace.buffer()
         self.sentence_named_entities_by_constituent = defaultdict(list)
         self.sentence_gold_mentions_by_constituent = defaultdict(list)
         # The spans are used to avoid duplicate mentions and mention inside NE
@@ -574,35 +594,55 @@ class SentenceCandidateExtractor:
             "headword": self.graph_builder.get_head_word(mention)[FORM],
             }
 
+    def _mentions_meta(self):
+        """ The meta info of each extracted mention."""
+        return {mention[ID]: self._mention_meta(mention) for mention in self._mentions}
+
+    def _catchers_meta(self):
+        """ The mentions caught by each catcher."""
+        return {
+            "OK": {
+                name: {span: mention[ID] for (span, mention) in catcher.items()}
+                for name, catcher in self._ok_caught.items()},
+            "WRONG": {
+                name: {span: mention[ID] for (span, mention) in catcher.items()}
+                for name, catcher in self._wrong_caught.items()},
+            "LOST": {
+                "all": {span: mention[ID] for (span, mention) in self._lost_caught.items()}},
+            # "NO": self._no_caught,
+        }
+
+    def _filters_meta(self):
+        """ The mentions removed, or not, by each filter."""
+        return {
+            "OK": {
+                name: {span: mention[ID] for (span, mention) in _filter.items()}
+                for name, _filter in self._ok_filtered.items()},
+            "WRONG": {
+                name: {span: mention[ID] for (span, mention) in _filter.items()}
+                for name, _filter in self._wrong_filtered.items()},
+            "LOST": {
+                 "all": {span: mention[ID] for (span, mention) in self._lost_filtered.items()}},
+            "NO": {
+                 "all": {span: mention[ID] for (span, mention) in self._no_filtered.items()}},
+            "SOFT_FILTER": self.soft_filter,
+        }
+
+    def fill_report(self, report):
+        """ Add the sections of the mentions, the catchers and the filters to a
+        meta info report.
+
+        :param report: The Report of the document.
+        """
+        report.add("mentions", self._mentions_meta)
+        report.add("catchers", self._catchers_meta)
+        report.add("filters", self._filters_meta)
+
     def get_meta(self):
         """ Recollect the meta info and store it  in json compatible values.
 
         :return A json compatible structure of info.
         """
-        return {
-            "mentions": {mention[ID]: self._mention_meta(mention) for mention in self._mentions},
-            "catchers": {
-                "OK": {
-                    name: {span: mention[ID] for (span, mention) in catcher.items()}
-                    for name, catcher in self._ok_caught.items()},
-                "WRONG": {
-                    name: {span: mention[ID] for (span, mention) in catcher.items()}
-                    for name, catcher in self._wrong_caught.items()},
-                "LOST": {
-                    "all": {span: mention[ID] for (span, mention) in self._lost_caught.items()}},
-                # "NO": self._no_caught,
-                },
-            "filters": {
-                "OK": {
-                    name: {span: mention[ID] for (span, mention) in _filter.items()}
-                    for name, _filter in self._ok_filtered.items()},
-                "WRONG": {
-                    name: {span: mention[ID] for (span, mention) in _filter.items()}
-                    for name, _filter in self._wrong_filtered.items()},
-                "LOST": {
-                     "all": {span: mention[ID] for (span, mention) in self._lost_filtered.items()}},
-                "NO": {
-                     "all": {span: mention[ID] for (span, mention) in self._no_filtered.items()}},
-                "SOFT_FILTER": self.soft_filter,
-            },
-        }
+        report = Report()
+        self.fill_report(report)
+        return report.to_dict()
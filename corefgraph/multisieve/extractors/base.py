@@ -1,3 +1,5 @@
+from collections import deque
+
 from corefgraph.constants import ID, SPAN, TAG
 from corefgraph.resources.tagset import constituent_tags
 
@@ -114,12 +116,11 @@ class Breadth:
         :param named_entities_by_constituent: The named entities ordered by constituent.
         :param gold_mentions_by_constituent: The gold mentions ordered by constituent.
         """
-        # Process all the nodes
-        visited = []
+        # Process all the nodes as a FIFO queue
+        nodes = deque(nodes)
         while nodes:
             # Extract the first candidate
-            node = nodes.pop(0)
-            visited.append(node)
+            node = nodes.popleft()
             # Constituents Gold mentions
             for gold in gold_mentions_by_constituent.get(node[ID], []):
                 # check if is an accepted mention
@@ -166,10 +167,11 @@ class Deep:
         """
         # The ordered nodes of the constituent tha can be candidates
 
-        # Process all the nodes
+        # Process all the nodes as a stack, the first candidate on its top
+        nodes = nodes[::-1]
         while nodes:
             # Extract the first candidate
-            node = nodes.pop(0)
+            node = nodes.pop()
             # Constituents Gold mentions
             for gold in gold_mentions_by_constituent.get(node[ID], []):
                 # check if is an accepted mention
@@ -195,8 +197,8 @@ class Deep:
             else:
                 # Order the children of the nodes
                 ordered_children = self.graph_builder.get_syntactic_children_sorted(node)
-                # Add the children to the search
-                nodes = ordered_children + nodes
+                # Add the children to the top of the search
+                nodes.extend(reversed(ordered_children))
 
 
 class BreathFistSimple(Plain, Breadth):
@@ -42,8 +42,12 @@ class FeatureExtractor:
         self.mention_features = mention_features
         self.feature_extractors = []
         self.meta_info = meta_info
+        self.reset()
+
+    def reset(self):
+        """ Discard the meta info of the current document."""
         self.meta = {}
-        if meta_info:
+        if self.meta_info:
             self.prepare_meta()
 
     def load_extractors(self):
@@ -51,6 +55,15 @@ class FeatureExtractor:
             self.annotators_by_name[annotator](self.graph_builder)
             for annotator in self.mention_features]
 
+    def prepare(self, mentions):
+        """ Let the annotators prepare the mentions of the document at once.
+
+        :param mentions: The mentions of the document.
+        """
+        mentions = list(mentions)
+        for feature_extractor in self.feature_extractors:
+            feature_extractor.prepare(mentions)
+
     def characterize_mention(self, mention):
         for feature_extractor in self.feature_extractors:
             # Feature Mention
@@ -20,6 +20,16 @@ class FeatureAnnotator(object):
         self.logger = getLogger("{0}.{1}".format(__name__, self.name))
         self.graph_builder = graph_builder
 
+    def prepare(self, mentions):
+        """ Override to annotate at once the mentions of the document, before
+        each one is annotated.
+
+        :param mentions: The mentions of the document.
+
+        :return: Nothing.
+        """
+        pass
+
     def extract_and_mark(self, mention):
         """ Override with the annotation of the mention.
 
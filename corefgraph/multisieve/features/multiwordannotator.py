@@ -2,18 +2,23 @@
 """ Annotation of the mention multiwords.
 """
 
+from time import time
 
 from corefgraph.constants import FORM, SPAN, BEGIN, END
 import corefgraph.properties
 
 from corefgraph.multisieve.features.baseannotator import FeatureAnnotator
 from corefgraph.constants import MULTIWORD
-from pynaf import NAFDocument
-from socket import socket, error
+from corefgraph.posclient import get_client
 
 __author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
 
 
+def is_multiword(form):
+    """ Check if a form is a multiword, parts joined with _."""
+    return "_" in form and len(form) > 1
+
+
 class MultiWordAnnotator(FeatureAnnotator):
     """Annotate the type of a mention(nominal, pronominal, pronoun) also search
     some relevant features of the mention(Mention subtype)"""
@@ -23,17 +28,38 @@ class MultiWordAnnotator(FeatureAnnotator):
     server_port = 1337
     features = [MULTIWORD]
     retry = 3
+    # Idle connections kept open to the server
+    pool_size = 2
+    # Expansions kept for the next documents
+    cache_size = 10000
+    # Seconds that the server may spend in the multiwords of a document
+    budget = 5.0
 
     def __init__(self, graph_builder):
         FeatureAnnotator.__init__(self, graph_builder)
-
-
-        # try:
-        #     self.server.connect((self.server_ip, self.server_port))
-        #     self.error = False
-        # except error as ex:
-        #     self.logger.error("Error in IXA POS server: %s", ex.strerror)
-        #     self.error = True
+        self.client = get_client(
+            self.server_ip, self.server_port, language=corefgraph.properties.lang,
+            encoding=corefgraph.properties.encoding, pool_size=self.pool_size,
+            cache_size=self.cache_size, retry=self.retry)
+        self.expansions = {}
+        self.deadline = None
+
+    def prepare(self, mentions):
+        """ Expand in one request the multiwords of every mention of the
+        document. The budget of the document starts.
+
+        :param mentions: The mentions of the document.
+        """
+        self.deadline = time() + self.budget
+        forms = [
+            word[FORM]
+            for mention in mentions if is_multiword(mention[FORM])
+            for word in self.graph_builder.get_words(mention)
+            if is_multiword(word[FORM]) and MULTIWORD not in word]
+        # The multiwords not expanded are not asked again in the document
+        self.expansions = dict.fromkeys(forms)
+        if forms:
+            self.expansions.update(self.client.expand(forms, self.deadline))
 
     def extract_and_mark(self, mention):
         """ Determine the type of the mention. Also check some mention related
@@ -41,60 +67,35 @@ class MultiWordAnnotator(FeatureAnnotator):
 
         :param mention: The mention to be classified.
         """
-        # if self.error:
-        #     return
-
-        form = mention[FORM]
-        if "_" in form and len(form) > 1:
+        if is_multiword(mention[FORM]):
             for word in self.graph_builder.get_words(mention):
-                word_form = word[FORM]
-                if "_" in word_form and len(word_form) > 1 and MULTIWORD not in word:
-                    word[MULTIWORD] = self.expand_words(word)
+                if is_multiword(word[FORM]) and MULTIWORD not in word:
+                    words = self.expand_words(word)
+                    if words is not None:
+                        word[MULTIWORD] = words
 
     def expand_words(self, word):
+        """ Add to the graph the words of a multiword.
+
+        :param word: The multiword.
+        :return: The words, or None if the server did not expand it.
+        """
         form = word[FORM]
-        form = form.replace("_", " ")
-
-
-        # # TODO form += " es así."
-        doc = NAFDocument(language=corefgraph.properties.lang)
-        offset = 0
-        for index, token in enumerate(form.split(" ")):
-            if token:
-                doc.add_word(token.decode(corefgraph.properties.encoding), "w{0}".format(index),
-                             offset=str(offset), length=str(len(token)), sent="1")
-                offset += len(token) + 1
-        retry = self.retry
-        while retry:
-            try:
-                self.server = socket()
-                self.server.connect((self.server_ip, self.server_port))
-                self.server.sendall(str(doc))
-                retry = 0
-            except error as ex:
-                from time import sleep
-                sleep(0.5)
-                retry -= 1
-                if not retry:
-                    self.logger.error("Error in IXA POS server (retry exhausted): %s", ex.strerror)
-        full_response = ""
-        while True:
-            response = self.server.recv(1024)
-            full_response += response
-            if not response:
-                self.server.close()
-                break
-        naf = NAFDocument(input_stream=full_response)
-        naf_pos = naf.get_words()
-        naf_terms = naf.get_terms()
+        if form not in self.expansions:
+            # Not asked in the document request
+            deadline = self.deadline or time() + self.budget
+            self.expansions[form] = self.client.expand([form], deadline).get(form)
+        tokens = self.expansions[form]
+        if tokens is None:
+            return None
         words = []
-        for index in range(len(naf_pos)):
+        for index, (token_form, lemma, pos) in enumerate(tokens):
             word_node = self.graph_builder.add_word(
-                form=naf_pos[index].text.encode(naf.encoding),
-                node_id="{0}_{1}".format(word["id"],index),
-                label="{0}_{1}".format(word["label"],index),
-                lemma=naf_terms[index].attrib['lemma'].encode(naf.encoding),
-                pos=naf_terms[index].attrib['morphofeat'],
+                form=token_form,
+                node_id="{0}_{1}".format(word["id"], index),
+                label="{0}_{1}".format(word["label"], index),
+                lemma=lemma,
+                pos=pos,
                 span=word[SPAN],
                 begin=word[BEGIN],
                 end=word[END])
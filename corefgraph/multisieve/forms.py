@@ -0,0 +1,71 @@
+# coding=utf-8
+""" The store of the normalized forms of the mentions shared by the sieves.
+
+"""
+
+from collections import Counter
+
+from corefgraph.constants import ID
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+# The names of the forms
+CLEAN_FORM = "clean_form"
+RELAXED_WORDS = "relaxed_words"
+RELAXED_FORM = "relaxed_form"
+CLEAN_RELAXED_FORM = "clean_relaxed_form"
+HEAD_FORM = "head_form"
+CLEAN_HEAD_FORM = "clean_head_form"
+WORD_FORMS = "word_forms"
+MODIFIERS = "modifiers"
+LOCATION_MODIFIERS = "location_modifiers"
+
+
+class MentionForms(object):
+    """ The normalized forms of the mentions of a document (cleaned form,
+    relaxed form, head form, word forms, modifiers...).
+
+    Each form of a mention is computed the first time a sieve asks for it and
+    kept for the rest of the sieves, as the mentions do not change while the
+    document is resolved. The hits and misses of each form are counted.
+    """
+
+    def __init__(self):
+        self._forms = {}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def get(self, mention, name, compute):
+        """ Get a form of a mention.
+
+        :param mention: The mention.
+        :param name: The name of the form.
+        :param compute: A function that receives the mention and returns the
+            form. All the calls for the same name must use an equivalent
+            function.
+        :return: The form. Sets and lists must not be modified.
+        """
+        try:
+            forms = self._forms[name]
+        except KeyError:
+            forms = self._forms[name] = {}
+        mention_id = mention[ID]
+        if mention_id in forms:
+            self.hits[name] += 1
+            return forms[mention_id]
+        self.misses[name] += 1
+        value = forms[mention_id] = compute(mention)
+        return value
+
+    def get_meta(self):
+        """ The hits, misses and hit rate of each form.
+
+        :return: A dict of json compatible values by form name.
+        """
+        meta = {}
+        for name in set(self.hits) | set(self.misses):
+            hits, misses = self.hits[name], self.misses[name]
+            meta[name] = {
+                "hits": hits, "misses": misses,
+                "hit_rate": float(hits) / (hits + misses)}
+        return meta
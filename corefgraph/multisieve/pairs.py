@@ -0,0 +1,84 @@
+# coding=utf-8
+""" The store of the static predicates of the pairs of mentions shared by the
+sieves.
+
+"""
+
+from collections import Counter
+
+from corefgraph.constants import ID
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+# The names of the predicates
+SENTENCE_DISTANCE = "sentence_distance"
+I_WITHIN_I = "i_within_i"
+
+
+class PairCache(object):
+    """ The predicates of the pairs of mentions of a document that do not
+    change while it is resolved (sentence distance, i-within-i...).
+
+    Each predicate of a pair is computed the first time a sieve asks for it and
+    kept for the rest of the sieves. The pairs of a document grow with the
+    square of its mentions, so at most max_pairs values are kept: once the
+    cache is full the new pairs are computed each time and the ones already
+    kept are still used, instead of dropping them (every sieve walks the
+    pairs in the same order, so an evicting cache would miss them all). The
+    hits, misses and pairs not kept of each predicate are counted.
+    """
+    MAX_PAIRS = 200000
+
+    def __init__(self, max_pairs=None):
+        """
+        :param max_pairs: The maximum number of values kept, MAX_PAIRS if not
+            provided.
+        """
+        self.max_pairs = self.MAX_PAIRS if max_pairs is None else max_pairs
+        self._pairs = {}
+        self._size = 0
+        self.hits = Counter()
+        self.misses = Counter()
+        self.skipped = Counter()
+
+    def get(self, mention_a, mention_b, name, compute):
+        """ Get a predicate of a pair of mentions.
+
+        :param mention_a: The first mention of the pair, usually the mention.
+        :param mention_b: The second mention of the pair, usually the
+            candidate.
+        :param name: The name of the predicate.
+        :param compute: A function that receives both mentions and returns the
+            predicate. All the calls for the same name must use an equivalent
+            function.
+        :return: The predicate.
+        """
+        try:
+            pairs = self._pairs[name]
+        except KeyError:
+            pairs = self._pairs[name] = {}
+        key = (mention_a[ID], mention_b[ID])
+        if key in pairs:
+            self.hits[name] += 1
+            return pairs[key]
+        self.misses[name] += 1
+        value = compute(mention_a, mention_b)
+        if self._size < self.max_pairs:
+            pairs[key] = value
+            self._size += 1
+        else:
+            self.skipped[name] += 1
+        return value
+
+    def get_meta(self):
+        """ The hits, misses, pairs not kept and hit rate of each predicate.
+
+        :return: A dict of json compatible values by predicate name.
+        """
+        meta = {}
+        for name in set(self.hits) | set(self.misses):
+            hits, misses = self.hits[name], self.misses[name]
+            meta[name] = {
+                "hits": hits, "misses": misses, "skipped": self.skipped[name],
+                "hit_rate": float(hits) / (hits + misses)}
+        return meta
@@ -9,6 +9,11 @@ from pkgutil import iter_modules
 from logging import getLogger
 
 from corefgraph.constants import SPAN
+from corefgraph.multisieve.entities import EntityStore
+from corefgraph.multisieve.forms import MentionForms
+from corefgraph.multisieve.pairs import PairCache
+from corefgraph.multisieve.sieves.base import Sieve
+from corefgraph.timing import Timings
 
 __author__ = 'Josu Bermúdez <josu.bermudez@deusto.es>'
 
@@ -41,14 +46,25 @@ class MultiSieveProcessor:
     """
     logger = getLogger(__name__)
 
-    def __init__(self, sieves_list, meta_info):
+    def __init__(self, sieves_list, meta_info, timings=None):
         self.links = []
+        self.forms = None
+        self.pairs = None
         self.meta_info = meta_info
+        self.timings = timings or Timings()
         self.logger.info("Sieves: %s", sieves_list)
         self.sieves_names = sieves_list
         # dynamically load the sieves
         self.sieves = self.load_sieves(sieves_list)
 
+    def reset(self):
+        """ Discard the state of the last document in every sieve."""
+        self.links = []
+        self.forms = None
+        self.pairs = None
+        for sieve in self.sieves:
+            sieve.reset()
+
     def get_meta(self):
         # Create the meta structure
         meta = {
@@ -57,25 +73,42 @@ class MultiSieveProcessor:
         }
         return meta
 
+    def get_forms_meta(self):
+        """ The hit rates of the mention forms shared by the sieves."""
+        return self.forms.get_meta() if self.forms is not None else {}
+
+    def get_pairs_meta(self):
+        """ The hit rates of the pair predicates shared by the sieves."""
+        return self.pairs.get_meta() if self.pairs is not None else {}
+
     def process(self, graph_builder, mentions_text_order, mentions_candidate_order):
         """ Process a candidate cluster list thought the sieves using the output
          of the each sieve as input of the next.
         """
         sieve_output = {}
-        # create the base entity inside each mention in each sentence
+        entities = EntityStore()
+        # create the base entity of each mention in each sentence
         for sentence in mentions_text_order:
             for mention in sentence:
                 # mention is identified for first mention in its span
-                entity = (mention[SPAN], [mention, ])
-                # Store the entity reference in the mention
-                mention["entity"] = entity
+                entities.add(mention)
                 # backup output in case of run with no sieves
                 sieve_output[mention[SPAN]] = [mention, ]
+        # Index once the position of each mention for all sieves
+        candidates_position = Sieve.index_candidates(mentions_candidate_order)
+        # The forms of each mention are computed once for all sieves
+        forms = self.forms = MentionForms()
+        # And the static predicates of each pair
+        pairs = self.pairs = PairCache()
         # Pass each sieve through all mentions
         for sieve in self.sieves:
-            # Store sieve output for output, only last one is used
-            sieve_output = sieve.resolve(graph_builder=graph_builder, mentions_order=mentions_text_order,
-                                         candidates_order=mentions_candidate_order)
+            with self.timings.measure("sieve " + sieve.short_name) as stage:
+                # Store sieve output for output, only last one is used
+                sieve_output = sieve.resolve(graph_builder=graph_builder, mentions_order=mentions_text_order,
+                                             candidates_order=mentions_candidate_order,
+                                             candidates_position=candidates_position,
+                                             entities=entities, forms=forms, pairs=pairs)
+                stage.counts.update(sieve.counts)
         # plain the output
         return [sieve_output[key] for key in sorted(sieve_output.keys())]
 
@@ -4,9 +4,17 @@
 """
 
 from collections import Counter
-from logging import getLogger
+from functools import partial
+from itertools import chain, islice
+from logging import getLogger, DEBUG, INFO
 
 from corefgraph.constants import SPAN, ID, FORM, UTTERANCE, POS, NER, SPEAKER, CONSTITUENT, TAG, INVALID, GOLD_ENTITY
+from corefgraph.multisieve import trace
+from corefgraph.multisieve.blocking import CandidateIndex
+from corefgraph.multisieve.entities import EntityStore
+from corefgraph.multisieve.forms import MentionForms, CLEAN_FORM, RELAXED_WORDS, RELAXED_FORM, CLEAN_RELAXED_FORM, \
+    HEAD_FORM, CLEAN_HEAD_FORM
+from corefgraph.multisieve.pairs import PairCache, SENTENCE_DISTANCE, I_WITHIN_I
 from corefgraph.resources.dictionaries import pronouns, stopwords
 from corefgraph.resources.rules import rules
 from corefgraph.resources.tagset import ner_tags, constituent_tags
@@ -46,14 +54,25 @@ class Sieve(object):
     gold_check = True
 
     UNKNOWN_VALUES = {UNKNOWN, None, }
+    _property_extractors = {}
     INCOMPATIBLES = "incompatible"
 
     UNRELIABLE = 3
+    # Check only the candidates found in a CandidateIndex, see candidate_keys
+    BLOCKING = False
+    # Meta info counted for every pair, not a reason of a decision
+    TRACE_IGNORED = {"asked", "First pass"}
 
     def __init__(self, meta_info):
-        self.meta = Counter()
         self.logger = getLogger(__name__ + "." + self.short_name)
         self.meta_info = meta_info
+        self.reset()
+
+    def reset(self):
+        """ Discard the meta info and the references to the last resolved
+        document, so the sieve can be reused with the next one.
+        """
+        self.meta = Counter()
 
         self.correct_link = []
         self.wrong_link = []
@@ -61,6 +80,13 @@ class Sieve(object):
         self.no_link = []
 
         self.graph_builder = None
+        self.candidates_position = None
+        self.entities = None
+        self.forms = None
+        self.pairs = None
+        self.debug = False
+        # The mentions validated, the pairs checked and the links made in the last resolve
+        self.counts = {"mentions": 0, "pairs": 0, "links": 0}
 
     def get_meta(self):
         return {
@@ -70,53 +96,123 @@ class Sieve(object):
             "NO": self.no_link,
         }
 
-    def resolve(self, graph_builder, mentions_order, candidates_order):
+    @staticmethod
+    def index_candidates(candidates_order):
+        """ Build the position index of the mentions in the candidate order.
+
+        :param candidates_order: A list sentences that are a list of mentions in BFS.
+        :return: A dict of the position of each mention in its sentence, by
+            mention ID.
+        """
+        return {
+            mention[ID]: position
+            for sentence in candidates_order
+            for position, mention in enumerate(sentence)}
+
+    def resolve(self, graph_builder, mentions_order, candidates_order, candidates_position=None, entities=None,
+                forms=None, pairs=None):
         """Runs each sentence compare each mention and its candidates.
 
         :param graph_builder: The manager to ask or manipulate the graph.
         :param candidates_order: A list sentences that are a list of mentions in BFS.
         :param mentions_order: A list sentences that are a list of mentions in textual order.
+        :param candidates_position: The index built by index_candidates for
+            candidates_order. Built if not provided.
+        :param entities: The EntityStore with the entities of the mentions.
+            If not provided each mention starts in its own entity.
+        :param forms: The MentionForms of the document, shared by the sieves.
+            A new one is used if not provided.
+        :param pairs: The PairCache of the document, shared by the sieves.
+            A new one is used if not provided.
         """
         self.graph_builder = graph_builder
+        if candidates_position is None:
+            candidates_position = self.index_candidates(candidates_order)
+        self.candidates_position = candidates_position
+        if entities is None:
+            entities = EntityStore(
+                mention for sentence in mentions_order for mention in sentence)
+        self.entities = entities
+        self.forms = forms if forms is not None else MentionForms()
+        self.pairs = pairs if pairs is not None else PairCache()
         output_clusters = dict()
         self.logger.info(
             "SIEVE: =========== %s Start ===========", self.short_name)
+        # Checked once: the per pair logging is skipped if it is not shown
+        debug = self.debug = self.logger.isEnabledFor(DEBUG)
+        info = self.logger.isEnabledFor(INFO)
+        decisions = trace.buffer()
+        # The per pair logging, meta info and trace record every candidate
+        if self.BLOCKING and not (debug or self.meta_info or decisions is not None):
+            candidate_index = CandidateIndex(self.candidate_keys, self.candidates_position, mentions_order)
+        else:
+            candidate_index = None
+        mentions = pairs = links = 0
         # for each sentence for each mention in tree traversal order
         for index_sentence, sentence in enumerate(mentions_order):
             for index_mention, mention in enumerate(sentence):
-                self.logger.debug("RESOLVE: ---------- New mention ----------")
-                self.log_mention(mention)
+                if debug:
+                    self.logger.debug("RESOLVE: ---------- New mention ----------")
+                    self.log_mention(mention)
                 # Skip the mention?
-                mention_entity_idx, mention_entity = mention.get("entity")
-                if not self.validate(mention=mention, entity=mention_entity):
-                    self.logger.debug("RESOLVE: Invalid mention")
+                mention_entity_idx, mention_entity = self.entities.get_entity(mention)
+                if decisions is None:
+                    valid = self.validate(mention=mention, entity=mention_entity)
+                else:
+                    valid, reasons = self._traced(self.validate, mention=mention, entity=mention_entity)
+                    if not valid:
+                        decisions.append(trace.Decision(
+                            self.short_name, trace.INVALID, mention[ID], None, reasons))
+                if not valid:
+                    if debug:
+                        self.logger.debug("RESOLVE: Invalid mention")
                 else:
-                    candidates = self.get_candidates(
-                        mentions_order, candidates_order, mention, index_sentence)
+                    mentions += 1
+                    if candidate_index is None:
+                        candidates = self.get_candidates(
+                            mentions_order, candidates_order, mention, index_sentence)
+                    else:
+                        candidates = self.blocked_candidates(
+                            candidate_index, mentions_order, candidates_order,
+                            mention_entity, mention, index_sentence)
                     for candidate in candidates:
-                        self.logger.debug("RESOLVE: +++++ New Candidate +++++")
-                        self.log_candidate(candidate)
+                        if debug:
+                            self.logger.debug("RESOLVE: +++++ New Candidate +++++")
+                            self.log_candidate(candidate)
                         candidate_entity_idx, candidate_entity = \
-                            candidate.get("entity")
+                            self.entities.get_entity(candidate)
+                        pairs += 1
 
-                        if self.are_coreferent(
+                        if decisions is None:
+                            linked = self.are_coreferent(
                                 entity=mention_entity, mention=mention,
-                                candidate_entity=candidate_entity, candidate=candidate):
+                                candidate_entity=candidate_entity, candidate=candidate)
+                        else:
+                            linked, reasons = self._traced(
+                                self.are_coreferent, entity=mention_entity, mention=mention,
+                                candidate_entity=candidate_entity, candidate=candidate)
+                            decisions.append(trace.Decision(
+                                self.short_name, trace.LINKED if linked else trace.NOT_LINKED,
+                                mention[ID], candidate[ID], reasons))
+                        if linked:
+                            links += 1
                             if self.meta_info:
                                 if self.check_gold(mention, candidate):
-                                    self.logger.info(
-                                        "CORRECT LINK (%s):%s ", self.short_name,
-                                        self.context(
-                                            mention_entity, mention,
-                                            candidate_entity, candidate))
+                                    if info:
+                                        self.logger.info(
+                                            "CORRECT LINK (%s):%s ", self.short_name,
+                                            self.context(
+                                                mention_entity, mention,
+                                                candidate_entity, candidate))
                                     self.correct_link.append(
                                         (mention[ID], candidate[ID]))
                                 else:
-                                    self.logger.debug(
-                                        "WRONG LINK (%s):%s ", self.short_name,
-                                        self.context(
-                                            mention_entity, mention,
-                                            candidate_entity, candidate))
+                                    if debug:
+                                        self.logger.debug(
+                                            "WRONG LINK (%s):%s ", self.short_name,
+                                            self.context(
+                                                mention_entity, mention,
+                                                candidate_entity, candidate))
                                     self.wrong_link.append(
                                         (mention[ID], candidate[ID]))
                             try:
@@ -129,7 +225,8 @@ class Sieve(object):
                                 del output_clusters[candidate_entity_idx]
                             except KeyError:
                                 pass
-                            self.logger.debug("RESOLVE: End candidate (LINKED).")
+                            if debug:
+                                self.logger.debug("RESOLVE: End candidate (LINKED).")
                             mention_entity_idx, mention_entity = self._merge(
                                 mention_entity, candidate_entity)
                             break
@@ -137,20 +234,42 @@ class Sieve(object):
                             if self.meta_info:
                                 if self.check_gold(mention, candidate):
                                     if not self.check_in_entity(candidate, mention_entity):
-                                        self.logger.debug(
-                                            "LOST LINK(%s):%s ", self.short_name,
-                                            self.context(
-                                                mention_entity, mention,
-                                                candidate_entity, candidate))
+                                        if debug:
+                                            self.logger.debug(
+                                                "LOST LINK(%s):%s ", self.short_name,
+                                                self.context(
+                                                    mention_entity, mention,
+                                                    candidate_entity, candidate))
                                         self.lost_link.append(
                                             (mention[ID], candidate[ID]))
                                 else:
                                     self.no_link.append((mention[ID], candidate[ID],))
-                        self.logger.debug("RESOLVE: End candidate(Not linked).")
-                self.logger.debug("RESOLVE: End mention.")
+                        if debug:
+                            self.logger.debug("RESOLVE: End candidate(Not linked).")
+                if debug:
+                    self.logger.debug("RESOLVE: End mention.")
                 output_clusters[mention_entity_idx] = mention_entity
+        self.counts = {"mentions": mentions, "pairs": pairs, "links": links}
         return output_clusters
 
+    def _traced(self, check, **kwargs):
+        """ Run a check of the sieve counting its meta info apart, to know the
+        reasons of its result.
+
+        :param check: The method to run.
+        :param kwargs: The arguments of the method.
+        :return: The result and the meta info keys counted by the check.
+        """
+        meta, self.meta = self.meta, Counter()
+        try:
+            result = check(**kwargs)
+        finally:
+            reasons = tuple(sorted(
+                reason for reason in self.meta if reason not in self.TRACE_IGNORED))
+            meta.update(self.meta)
+            self.meta = meta
+        return result, reasons
+
     def are_coreferent(self, entity, mention, candidate_entity, candidate):
         """ Determine if the candidate is a valid entity coreferent.
 
@@ -163,54 +282,61 @@ class Sieve(object):
         if mention.get(INVALID) or candidate.get(INVALID):
             return False
         if self.USE_INCOMPATIBLES:
+            incompatibles = self.entities.get_incompatibles(mention)
             for c_mention in candidate_entity:
-                if c_mention[ID] in mention.get(self.INCOMPATIBLES, ()):
+                if c_mention[ID] in incompatibles:
                     self.meta["filter_incompatible"] += 1
-                    self.logger.debug(
-                        "LINK FILTERED incompatible mentions inside entities.")
+                    if self.debug:
+                        self.logger.debug(
+                            "LINK FILTERED incompatible mentions inside entities.")
                     return False
 
         if self.SENTENCE_DISTANCE_LIMIT:
-            sentence_distance = self.graph_builder.sentence_distance(
-                mention, candidate)
+            sentence_distance = self.sentence_distance(mention, candidate)
             if sentence_distance > self.SENTENCE_DISTANCE_LIMIT \
                     and not (mention.get(PERSON) in (FIRST_PERSON, SECOND_PERSON)):
                 self.meta["filter_to_far"] += 1
-                self.logger.debug(
-                    "LINK FILTERED Candidate to far and not I or You.")
+                if self.debug:
+                    self.logger.debug(
+                        "LINK FILTERED Candidate to far and not I or You.")
                 return False
         if self.UNRELIABLE and (stopwords.unreliable(mention[FORM].lower())) and \
-                (self.graph_builder.sentence_distance(
-                    element_a=mention, element_b=candidate) > self.UNRELIABLE):
+                (self.sentence_distance(mention, candidate) > self.UNRELIABLE):
             self.meta["filter_to_far_this"] += 1
-            self.logger.debug("LINK FILTERED too far this. Candidate")
+            if self.debug:
+                self.logger.debug("LINK FILTERED too far this. Candidate")
             return False
 
         if self.check_in_entity(mention=candidate, entity=entity):
             self.meta["filter_already_linked"] += 1
-            self.logger.debug("LINK FILTERED already linked. Candidate")
+            if self.debug:
+                self.logger.debug("LINK FILTERED already linked. Candidate")
             return False
         if candidate.get(GENERIC, False) and candidate.get(PERSON) == SECOND_PERSON:
             self.meta["filter_generic_candidate"] += 1
-            self.logger.debug("LINK FILTERED Generic Candidate")
+            if self.debug:
+                self.logger.debug("LINK FILTERED Generic Candidate")
             return False
 
         if self.IS_INSIDE and (self.graph_builder.is_inside(mention[SPAN],  candidate[SPAN]) or
                                self.graph_builder.is_inside(candidate[SPAN], mention[SPAN])):
             self.meta["filtered_inside"] += 1
-            self.logger.debug("LINK FILTERED Inside. Candidate")
+            if self.debug:
+                self.logger.debug("LINK FILTERED Inside. Candidate")
             return False
         if self.INCOMPATIBLE_DISCOURSE and \
                 self.incompatible_discourse(
                     entity_a=candidate_entity, entity_b=entity):
             self.meta["filtered_discourse"] += 1
-            self.logger.debug("LINK FILTERED incompatible discourse")
+            if self.debug:
+                self.logger.debug("LINK FILTERED incompatible discourse")
             return False
         representative_mention = self.entity_representative_mention(entity)
         if self.NO_SUBJECT_OBJECT and \
                 self.subject_object(candidate_entity, entity):
             self.meta["filtered_subject_object"] += 1
-            self.logger.debug("LINK FILTERED Subject-object")
+            if self.debug:
+                self.logger.debug("LINK FILTERED Subject-object")
             self.invalid(
                 entity_a=entity, mention_a=mention,
                 entity_b=candidate_entity, mention_b=candidate)
@@ -219,25 +345,29 @@ class Sieve(object):
                 self.i_within_i(
                     mention_a=representative_mention, mention_b=candidate):
             self.meta["filtered_i_within_i"] += 1
-            self.logger.debug(
-                "LINK FILTERED I within I construction: %s", candidate[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "LINK FILTERED I within I construction: %s", candidate[FORM])
             self.invalid(
                 entity_a=entity, mention_a=mention,
                 entity_b=candidate_entity, mention_b=candidate)
             return False
 
         if self.NO_PRONOUN_CANDIDATE and self.is_pronoun(candidate):
-            self.logger.debug("FILTERED LINK mention pronoun")
+            if self.debug:
+                self.logger.debug("FILTERED LINK mention pronoun")
             self.meta["Filtered_mention_pronoun"] += 1
             return False
         self.meta["First pass"] += 1
 
         if self.NO_ENUMERATION_CANDIDATE and candidate[MENTION] == ENUMERATION_MENTION:
-            self.logger.debug("FILTERED LINK candidate enumeration")
+            if self.debug:
+                self.logger.debug("FILTERED LINK candidate enumeration")
             self.meta["Filtered_enumeration"] += 1
             return False
         if self.NO_APPOSITIVE_CANDIDATE and candidate.get(APPOSITIVE, False):
-            self.logger.debug("FILTERED LINK candidate appositive")
+            if self.debug:
+                self.logger.debug("FILTERED LINK candidate appositive")
             self.meta["mention_filtered_enumeration"] += 1
             return False
         return True
@@ -255,39 +385,46 @@ class Sieve(object):
         if self.ONLY_FIRST_MENTION and \
                 not self.first_mention(mention=mention, entity=entity):
             self.meta["mention_filtered_no_first"] += 1
-            self.logger.debug(
-                "MENTION FILTERED: Not first one: %s", mention[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "MENTION FILTERED: Not first one: %s", mention[FORM])
             return False
         # Filter Narrative you
         if self.narrative_you(mention=mention):
             self.meta["mention_filtered_narrative_you"] += 1
-            self.logger.debug(
-                "MENTION FILTERED: is a narrative you: %s", mention[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "MENTION FILTERED: is a narrative you: %s", mention[FORM])
             return False
         # filter generics
         if mention.get(GENERIC, False):
             self.meta["mention_filtered_generic"] += 1
-            self.logger.debug(
-                "MENTION FILTERED: is generic: %s", mention[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "MENTION FILTERED: is generic: %s", mention[FORM])
             return False
         # Filter stopWords
         if self.NO_STOP_WORDS and stopwords.stop_words(mention[FORM].lower()):
             self.meta["mention_filtered_stop_word"] += 1
-            self.logger.debug(
-                "MENTION FILTERED: is a stop word: %s", mention[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "MENTION FILTERED: is a stop word: %s", mention[FORM])
             return False
         # Filter all pronouns
         if self.NO_PRONOUN_MENTION and self.is_pronoun(mention):
             self.meta["mention_filtered_pronoun"] += 1
-            self.logger.debug(
-                "MENTION FILTERED: Is a pronoun: %s", mention[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "MENTION FILTERED: Is a pronoun: %s", mention[FORM])
             return False
         if self.NO_ENUMERATION_MENTION and mention[MENTION] == ENUMERATION_MENTION:
-            self.logger.debug("MENTION FILTERED enumeration form")
+            if self.debug:
+                self.logger.debug("MENTION FILTERED enumeration form")
             self.meta["mention_filtered_enumeration"] += 1
             return False
         if self.NO_APPOSITIVE_MENTION and mention.get(APPOSITIVE, False):
-            self.logger.debug("MENTION FILTERED APPOSITIVE form")
+            if self.debug:
+                self.logger.debug("MENTION FILTERED APPOSITIVE form")
             self.meta["mention_filtered_enumeration"] += 1
             return False
         return True
@@ -301,8 +438,9 @@ class Sieve(object):
 
         # If starts with, or is, a undefined pronouns, Filter it.
         if mention[STARTED_BY_INDEFINITE_PRONOUN]:
-            self.logger.debug(
-                "MENTION FILTERED: is undefined: %s", mention[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "MENTION FILTERED: is undefined: %s", mention[FORM])
             self.meta["mention_filtered_is_undefined"] += 1
             return False
         # If start with indefinite article and isn't part of an appositive or
@@ -310,8 +448,9 @@ class Sieve(object):
         if not mention.get(APPOSITIVE, False) and not mention.get(PREDICATIVE_NOMINATIVE, False) and \
                 self.is_undefined(mention=mention):
             self.meta["mention_filtered_starts_undefined"] += 1
-            self.logger.debug(
-                "MENTION FILTERED: starts with undefined: %s", mention[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "MENTION FILTERED: starts with undefined: %s", mention[FORM])
             return False
         return True
 
@@ -343,11 +482,95 @@ class Sieve(object):
         :param mention: The mention whose candidates whe need.
         :param index_sent: The index of the current sentence.
 
-        @rtype : list
-        :return: A list of ordered candidates.
+        @rtype : generator
+        :return: The ordered candidates.
         """
-        index_mention = [c[ID] for c in candidate_order[index_sent]].index(mention["id"])
-        return candidate_order[index_sent][:index_mention] + [m for s in reversed(text_order[:index_sent]) for m in s]
+        index_mention = self.candidates_position[mention[ID]]
+        return chain(
+            islice(candidate_order[index_sent], index_mention),
+            self.previous_sentences_candidates(text_order, index_sent))
+
+    def candidate_keys(self, candidate):
+        """ Override with the blocking keys of a mention as a candidate. A
+        candidate is only checked if it shares a key with the mention
+        (mention_keys). Used if BLOCKING is set.
+
+        :param candidate: The candidate.
+        :return: An iterable of keys.
+        """
+        return ()
+
+    def mention_keys(self, entity, mention):
+        """ Override with the blocking keys of the mention whose candidates are
+        searched.
+
+        :param entity: The entity of the mention.
+        :param mention: The mention.
+        :return: An iterable of keys.
+        """
+        return ()
+
+    def find_candidates(self, candidate_index, entity, mention):
+        """ Get from the index the mentions that may be linked to the
+        mention, in any order.
+
+        :param candidate_index: The CandidateIndex of the document.
+        :param entity: The entity of the mention.
+        :param mention: The mention.
+        :return: An iterable of mentions.
+        """
+        return candidate_index.find(self.mention_keys(entity, mention)).values()
+
+    def blocked_candidates(self, candidate_index, text_order, candidate_order, entity, mention, index_sent):
+        """ Gets the candidates of get_candidates that share a blocking key
+        with the mention, in the same order.
+
+        When the sieve marks the subject-object pairs as invalid the other
+        candidates are still visited, only to mark them.
+
+        :param candidate_index: The CandidateIndex of the document.
+        :param text_order: The list of sentences that contain the list of mentions that form the text.
+        :param candidate_order: The list of sentences that contain the list of mentions that form the text in bts order.
+        :param entity: The entity of the mention.
+        :param mention: The mention whose candidates whe need.
+        :param index_sent: The index of the current sentence.
+        """
+        found = self.find_candidates(candidate_index, entity, mention)
+        if not self.NO_SUBJECT_OBJECT:
+            return candidate_index.order(found, mention, index_sent)
+        return self._mark_subject_object(
+            self.get_candidates(text_order, candidate_order, mention, index_sent),
+            set(candidate[ID] for candidate in found), entity, mention)
+
+    def _mark_subject_object(self, candidates, found, entity, mention):
+        """ Yield the found candidates. The base checks of the rest are run if
+        they are in a subject-object relation, as they would have been marked
+        invalid without the blocking.
+
+        :param candidates: The candidates of get_candidates.
+        :param found: The IDs of the candidates to yield.
+        :param entity: The entity of the mention.
+        :param mention: The mention.
+        """
+        for candidate in candidates:
+            if candidate[ID] in found:
+                yield candidate
+            else:
+                candidate_entity = self.entities.get_entity(candidate)[1]
+                if self.subject_object(candidate_entity, entity):
+                    Sieve.are_coreferent(self, entity, mention, candidate_entity, candidate)
+
+    @staticmethod
+    def previous_sentences_candidates(text_order, index_sent):
+        """ Iterate lazily the mentions of the sentences previous to a sentence,
+        from the nearest sentence to the first one.
+
+        :param text_order: The list of sentences that contain the list of mentions that form the text.
+        :param index_sent: The index of the current sentence.
+        """
+        for index in range(index_sent - 1, -1, -1):
+            for mention in text_order[index]:
+                yield mention
 
     def invalid(self, entity_a, mention_a, entity_b, mention_b):
         """ Set the two mentions invalid for each other.
@@ -358,25 +581,23 @@ class Sieve(object):
         :param mention_b: The other mention.
         :return:
         """
-        if self.gold_check:
-            if self.check_gold(mention_a, mention_b):
-                self.logger.debug(
-                    "WRONG BLACKLISTED: %s",
-                    self.context(entity_a, mention_a, entity_b, mention_b))
+        if self.debug:
+            if self.gold_check:
+                if self.check_gold(mention_a, mention_b):
+                    if self.debug:
+                        self.logger.debug(
+                            "WRONG BLACKLISTED: %s",
+                            self.context(entity_a, mention_a, entity_b, mention_b))
+                else:
+                    if self.debug:
+                        self.logger.debug(
+                            "CORRECT BLACKLISTED: %s",
+                            self.context(entity_a, mention_a, entity_b, mention_b))
             else:
-                self.logger.debug(
-                    "CORRECT BLACKLISTED: %s",
-                    self.context(entity_a, mention_a, entity_b, mention_b))
-        else:
-            self.logger.debug("BLACKLISTED")
-        try:
-            mention_a[self.INCOMPATIBLES].add(mention_b[ID])
-        except KeyError:
-            mention_a[self.INCOMPATIBLES] = {mention_b[ID]}
-        try:
-            mention_b[self.INCOMPATIBLES].add(mention_a[ID])
-        except KeyError:
-            mention_b[self.INCOMPATIBLES] = {mention_a[ID]}
+                if self.debug:
+                    self.logger.debug("BLACKLISTED")
+        self.entities.add_incompatible(mention_a, mention_b)
+        self.entities.add_incompatible(mention_b, mention_a)
 
     def _merge(self, entity_a, entity_b):
         """ Merge two entities into new one.
@@ -384,22 +605,21 @@ class Sieve(object):
         :param entity_a: a entity to merge
         :param entity_b: a entity to merge
         """
-        # Add the new mentions to first cluster
-        entity = list(sorted(
-            entity_a + entity_b, key=lambda x: x[SPAN],))
-        incompatibles = set()
-        for mention in entity:
-            incompatibles.update(mention.get(self.INCOMPATIBLES, set()))
-        idx = entity[0][SPAN]
-        for mention in entity:
-            mention["entity"] = (idx, entity)
-            mention[self.INCOMPATIBLES] = incompatibles
-        return idx, entity
+        return self.entities.merge(entity_a[0], entity_b[0])
 
-    @staticmethod
-    def entity_representative_mention(entity):
+    def entity_representative_mention(self, entity):
         """ Get the most representative mention of the entity.
 
+        :param entity: The entity of which representative mention is fetched.
+        """
+        return self.entities.get_property(
+            entity[0], "representative_mention", self._representative_mention)
+
+    @staticmethod
+    def _representative_mention(entity):
+        """ Find the most representative mention of the entity: the first
+        proper mention, else the first nominal mention, else the first pronoun.
+
         :param entity: The entity of which representative mention is fetched.
         """
         for mention in entity:
@@ -414,35 +634,71 @@ class Sieve(object):
         return entity[0]
 
     def entity_property(self, entity, property_name):
-        """ Get a combined property of the values of all mentions of the entity
+        """ Get a combined property of the values of all mentions of the entity.
+        The returned set must not be modified.
 
         :param property_name: The name of the property to fetch.
         :param entity: The entity of which property is fetched.
         """
-        combined_property = set(
-            (mention.get(property_name, UNKNOWN) for mention in entity))
+        return self.entities.get_property(
+            entity[0], property_name, partial(self._combined_property, property_name))
+
+    def _combined_property(self, property_name, entity):
+        """ Combine the values of a property in all the mentions of the
+        entity. Unknown values are dropped unless they are the only ones.
+
+        :param property_name: The name of the property to combine.
+        :param entity: The entity of which property is combined.
+        """
+        combined_property = self.entities.get_aggregate(
+            entity[0], property_name, self._property_extractor(property_name))
         if len(combined_property) > 1:
             combined_property = combined_property.difference(
                 self.UNKNOWN_VALUES)
         if len(combined_property) == 0:
-            combined_property.add(UNKNOWN)
+            combined_property = frozenset((UNKNOWN,))
         return combined_property
 
-    @staticmethod
-    def entity_ne(entity):
+    @classmethod
+    def _property_extractor(cls, property_name):
+        """ Get the function that reads a property of a mention. The function
+        is built once for each property.
+
+        :param property_name: The name of the property.
+        """
+        try:
+            return cls._property_extractors[property_name]
+        except KeyError:
+            extractor = cls._property_extractors[property_name] = \
+                lambda mention: mention.get(property_name, UNKNOWN)
+            return extractor
+
+    def entity_ne(self, entity):
         """ Get a combined NE of the values of all mentions of the entity.
-        Other and no NER tags are cleared. If no NE tag is found None is
-        returned.
+        Other and no NER tags are cleared. If no NE tag is found an empty set
+        is returned. The returned set must not be modified.
 
         :param entity: The entity of which NE is fetched.
         """
-        combined_property = set(
-            (mention.get(NER, None) for mention in entity))
-        combined_property = filter(
-            lambda x: ner_tags.mention_ner(x), combined_property)
-        if len(combined_property) == 0:
-            return set()
-        return set(combined_property)
+        return self.entities.get_property(
+            entity[0], "ne", self._combined_ne)
+
+    def _combined_ne(self, entity):
+        """ Combine the NE of all the mentions of the entity.
+
+        :param entity: The entity of which NE is combined.
+        """
+        return frozenset(
+            ner for ner in self.entities.get_aggregate(entity[0], NER, self._mention_ne)
+            if ner_tags.mention_ner(ner))
+
+    @staticmethod
+    def _mention_ne(mention):
+        """ Read the NE of a mention.
+
+        :param mention: The mention whose NE is read.
+        """
+        return mention.get(NER, None)
 
     def narrative_you(self, mention):
         """The mention is second person(YOU) or the narrator(PER0) in an article.
@@ -479,6 +735,25 @@ class Sieve(object):
         """
         return ner_tags.location(mention.get(NER))
 
+    def entity_attributes(self, entity):
+        """ Get the combined gender, number, animacy and NE of the entity.
+
+        :param entity: The entity of which attributes are fetched.
+        :return: A tuple of frozensets.
+        """
+        return self.entities.get_property(
+            entity[0], "attributes", self._combined_attributes)
+
+    def _combined_attributes(self, entity):
+        """ Combine the attributes checked by agree_attributes.
+
+        :param entity: The entity of which attributes are combined.
+        """
+        return (self.entity_property(entity, GENDER),
+                self.entity_property(entity, NUMBER),
+                self.entity_property(entity, ANIMACY),
+                self.entity_ne(entity))
+
     def agree_attributes(self, entity, candidate_entity):
         """ All attributes are compatible. Its mean the attributes of each are
         a subset one of the another.
@@ -487,48 +762,47 @@ class Sieve(object):
         :param candidate_entity: Entity of the candidate
         :return: True or False
         """
-        candidate_gender = self.entity_property(candidate_entity, GENDER)
-        entity_gender = self.entity_property(entity, GENDER)
-        if not (self.UNKNOWN_VALUES.intersection(entity_gender) or
-                self.UNKNOWN_VALUES.intersection(candidate_gender)):
+        entity_gender, entity_number, entity_animacy, entity_ner = \
+            self.entity_attributes(entity)
+        candidate_gender, candidate_number, candidate_animacy, candidate_ner = \
+            self.entity_attributes(candidate_entity)
+        if self.UNKNOWN_VALUES.isdisjoint(entity_gender) and \
+                self.UNKNOWN_VALUES.isdisjoint(candidate_gender):
             if candidate_gender.difference(entity_gender) \
                     and entity_gender.difference(candidate_gender):
-                self.logger.debug(
-                    "Gender disagree %s %s",
-                    entity_gender, candidate_gender)
+                if self.debug:
+                    self.logger.debug(
+                        "Gender disagree %s %s",
+                        entity_gender, candidate_gender)
                 return False
 
-        candidate_number = self.entity_property(candidate_entity, NUMBER)
-        entity_number = self.entity_property(entity, NUMBER)
-        if not(self.UNKNOWN_VALUES.intersection(entity_number) or
-                self.UNKNOWN_VALUES.intersection(candidate_number)):
+        if self.UNKNOWN_VALUES.isdisjoint(entity_number) and \
+                self.UNKNOWN_VALUES.isdisjoint(candidate_number):
             if candidate_number.difference(entity_number) \
                     and entity_number.difference(candidate_number):
-                self.logger.debug(
-                    "Number disagree %s %s",
-                    entity_number, candidate_number)
+                if self.debug:
+                    self.logger.debug(
+                        "Number disagree %s %s",
+                        entity_number, candidate_number)
                 return False
 
-        candidate_animacy = self.entity_property(candidate_entity, ANIMACY)
-        entity_animacy = self.entity_property(entity, ANIMACY)
-        if not(self.UNKNOWN_VALUES.intersection(entity_animacy) or
-                self.UNKNOWN_VALUES.intersection(candidate_animacy)):
+        if self.UNKNOWN_VALUES.isdisjoint(entity_animacy) and \
+                self.UNKNOWN_VALUES.isdisjoint(candidate_animacy):
             if candidate_animacy.difference(entity_animacy) \
                     and entity_animacy.difference(candidate_animacy):
-                self.logger.debug(
-                    "Animacy disagree %s %s",
-                    entity_animacy, candidate_animacy)
+                if self.debug:
+                    self.logger.debug(
+                        "Animacy disagree %s %s",
+                        entity_animacy, candidate_animacy)
                 return False
 
-        candidate_ner = self.entity_ne(candidate_entity)
-        entity_ner = self.entity_ne(entity)
-        if not(entity_ner is None or candidate_ner is None):
-            if candidate_ner.difference(entity_ner) and \
-                    entity_ner.difference(candidate_ner):
+        if candidate_ner.difference(entity_ner) and \
+                entity_ner.difference(candidate_ner):
+            if self.debug:
                 self.logger.debug(
                     "NER disagree %s %s",
                     entity_ner, candidate_ner)
-                return False
+            return False
         return True
 
     def subject_object(self, entity_a, entity_b):
@@ -542,8 +816,7 @@ class Sieve(object):
             return False
         for mention_a in entity_a:
             for mention_b in entity_b:
-                if self.graph_builder.sentence_distance(
-                        mention_a,  mention_b) > 0:
+                if self.sentence_distance(mention_a, mention_b) > 0:
                     continue
                 if mention_a.get("subject", False) and \
                         mention_b.get("object", False) and \
@@ -556,13 +829,25 @@ class Sieve(object):
                 pass
         return False
 
+    def sentence_distance(self, mention_a, mention_b):
+        """ Get the distance between the sentences of the mentions, kept in
+        the PairCache of the document.
+
+        :param mention_a: a mention
+        :param mention_b: another mention
+        """
+        return self.pairs.get(mention_a, mention_b, SENTENCE_DISTANCE, self.graph_builder.sentence_distance)
+
     def i_within_i(self, mention_a, mention_b):
         """ Check if the  mention and candidate are in a i-within-i
-        construction.
+        construction, kept in the PairCache of the document.
 
         :param mention_a: a mention
         :param mention_b: another mention
         """
+        return self.pairs.get(mention_a, mention_b, I_WITHIN_I, self._i_within_i)
+
+    def _i_within_i(self, mention_a, mention_b):
         if not self.graph_builder.same_sentence(mention_a, mention_b):
             return False
         # Aren't appositive
@@ -581,11 +866,19 @@ class Sieve(object):
 
     def relaxed_form_word(self, mention):
         """ Return the words of the mention without the words after the head
-         word.
+         word. The list must not be modified.
 
         :param mention: The mention where the words are extracted.
         :return: a list of words.
         """
+        return self.forms.get(mention, RELAXED_WORDS, self._relaxed_form_word)
+
+    def _relaxed_form_word(self, mention):
+        """ Find the words of the mention without the words after the head
+         word.
+
+        :param mention: The mention where the words are extracted.
+        """
         mention_words = self.graph_builder.get_words(mention)
         mention_head = self.graph_builder.get_head_word(mention)
         head = False
@@ -607,8 +900,58 @@ class Sieve(object):
         :param mention: The mention where the words are extracted.
         :return: a string of word forms separated by spaces.
         """
+        return self.forms.get(mention, RELAXED_FORM, self._relaxed_form)
+
+    def _relaxed_form(self, mention):
+        """ Build the relaxed form of the mention.
+
+        :param mention: The mention where the words are extracted.
+        """
         return " ".join(word[FORM] for word in self.relaxed_form_word(mention=mention)).lower()
 
+    def clean_relaxed_form(self, mention):
+        """ Return the relaxed form of the mention cleaned by the language
+        rules.
+
+        :param mention: The mention where the words are extracted.
+        """
+        return self.forms.get(mention, CLEAN_RELAXED_FORM, self._clean_relaxed_form)
+
+    def _clean_relaxed_form(self, mention):
+        return rules.clean_string(self.relaxed_form(mention))
+
+    def clean_form(self, mention):
+        """ Return the form of the mention cleaned by the language rules.
+
+        :param mention: The mention.
+        """
+        return self.forms.get(mention, CLEAN_FORM, self._clean_form)
+
+    @staticmethod
+    def _clean_form(mention):
+        return rules.clean_string(mention[FORM])
+
+    def head_word_form(self, mention):
+        """ Return the form of the head word of the mention.
+
+        :param mention: The mention.
+        """
+        return self.forms.get(mention, HEAD_FORM, self._head_word_form)
+
+    def _head_word_form(self, mention):
+        return rules.get_head_word_form(self.graph_builder, mention)
+
+    def clean_head_word_form(self, mention):
+        """ Return the form of the head word of the mention cleaned by the
+        language rules.
+
+        :param mention: The mention.
+        """
+        return self.forms.get(mention, CLEAN_HEAD_FORM, self._clean_head_word_form)
+
+    def _clean_head_word_form(self, mention):
+        return rules.clean_string(self.head_word_form(mention))
+
     def same_speaker(self, mention_a, mention_b):
         """ Check if mention refer to the same speaker.
 
@@ -669,8 +1012,7 @@ class Sieve(object):
                 for word in self.graph_builder.get_words(speaker)]
             return speech_speaker[ID] in speaker_words_ids
         else:
-            speaker_head_word = rules.get_head_word_form(self.graph_builder, speaker)\
-                .lower()
+            speaker_head_word = self.head_word_form(speaker).lower()
             for word in speech_speaker.split(" "):
                 if word.lower() == speaker_head_word:
                     return True
@@ -715,9 +1057,9 @@ class Sieve(object):
         :param candidate: The candidate of the link.
         :return: True or False depends of the veracity
         """
-        clusters_m = set(m['gold_entity'] for m in self.graph_builder.get_gold_mention_by_span(mention[SPAN]))
-        clusters_c = set(c['gold_entity'] for c in self.graph_builder.get_gold_mention_by_span(candidate[SPAN]))
-        return bool(clusters_c and clusters_m and clusters_c.intersection(clusters_m))
+        clusters_m = self.graph_builder.get_gold_entities_by_span(mention[SPAN])
+        clusters_c = self.graph_builder.get_gold_entities_by_span(candidate[SPAN])
+        return not clusters_m.isdisjoint(clusters_c)
 
     def log_mention(self, mention):
         """ The function that log the mention and all useful info for this sieve
@@ -749,15 +1091,14 @@ class Sieve(object):
             mention[FORM], self.graph_builder.get_root(mention)[FORM],
             candidate[FORM], self.graph_builder.get_root(candidate)[FORM])
 
-    @staticmethod
-    def check_in_entity(mention, entity):
+    def check_in_entity(self, mention, entity):
         """ Check if the mention is part of the entity.
 
         :param entity: entity where check.
         :param mention: The mention to find.
         :return True or False.
         """
-        return mention[ID] in [m[ID] for m in entity]
+        return self.entities.same_entity(mention, entity[0])
 
 
 class PronounSieve(Sieve):
@@ -793,19 +1134,21 @@ class PronounSieve(Sieve):
         :param mention: The mention whose candidates whe need.
         :param index_sent: The index of the current sentence.
 
-        @rtype : list
-        :return: A list of ordered candidates.
+        @rtype : generator
+        :return: The ordered candidates.
         """
 
-        mention_index = [c[ID] for c in candidate_order[index_sent]].index(mention["id"])
-        if len(candidate_order[index_sent][mention_index]["entity"][1]) == 1 and self.is_pronoun(mention):
-            self.logger.debug("ORDERING: pronoun order")
+        mention_index = self.candidates_position[mention[ID]]
+        if len(self.entities.get_entity(mention)[1]) == 1 and self.is_pronoun(mention):
+            if self.debug:
+                self.logger.debug("ORDERING: pronoun order")
             sentence_candidates = self.pronoun_order(candidate_order[index_sent][:mention_index], mention)
-            other_candidates = [m for s in reversed(text_order[:index_sent]) for m in s]
+            other_candidates = self.previous_sentences_candidates(text_order, index_sent)
             if pronouns.relative(mention[FORM].lower()):
-                self.logger.debug("ORDERING: Relative pronoun order")
+                if self.debug:
+                    self.logger.debug("ORDERING: Relative pronoun order")
                 sentence_candidates.reverse()
-            return sentence_candidates + other_candidates
+            return chain(sentence_candidates, other_candidates)
         else:
             return super(PronounSieve, self).get_candidates(text_order, candidate_order, mention, index_sent)
     pass
@@ -43,9 +43,11 @@ class GoldMatch(Sieve):
         mention_entity_id = mention.get("entity_id", None)
         candidate_entity_id = candidate.get("entity_id", None)
         if mention_entity_id == candidate_entity_id and mention_entity_id is not None:
-            self.logger.debug("EXACT MATCH:%s %s", mention[ID], candidate[ID])
+            if self.debug:
+                self.logger.debug("EXACT MATCH:%s %s", mention[ID], candidate[ID])
             return True
-        self.logger.debug("IGNORED LINK: %s  %s", mention[ID], candidate[ID])
+        if self.debug:
+            self.logger.debug("IGNORED LINK: %s  %s", mention[ID], candidate[ID])
         return False
 
 
@@ -69,10 +71,12 @@ class GoldMatchX(GoldMatch):
         if max(mention_index, candidate_index) < self.limit:
             return False
         if mention_entity_id == candidate_entity_id:
-            self.logger.debug("EXACT MATCH:%s %s", mention[ID], candidate[ID])
+            if self.debug:
+                self.logger.debug("EXACT MATCH:%s %s", mention[ID], candidate[ID])
 
             return True
-        self.logger.debug("IGNORED LINK: %s  %s", mention[ID], candidate[ID])
+        if self.debug:
+            self.logger.debug("IGNORED LINK: %s  %s", mention[ID], candidate[ID])
         return False
 
 
@@ -3,7 +3,8 @@
 
 """
 from corefgraph.multisieve.features import constants
-from corefgraph.constants import POS, NER, FORM, MULTIWORD
+from corefgraph.constants import POS, NER, FORM, MULTIWORD, ID
+from corefgraph.multisieve.forms import WORD_FORMS, MODIFIERS, LOCATION_MODIFIERS
 from corefgraph.multisieve.sieves.base import Sieve
 from corefgraph.resources.dictionaries import stopwords, pronouns
 from corefgraph.resources.rules import rules
@@ -30,6 +31,13 @@ class StrictHeadMatching(Sieve):
     ATTRIBUTES_AGREE = False
     SAME_START = False
     auto_load = False
+    # Only the entities with a mention with the same head are linked
+    BLOCKING = True
+
+    # The names of the forms built with get_words
+    WORD_FORMS = WORD_FORMS
+    MODIFIERS = MODIFIERS
+    LOCATION_MODIFIERS = LOCATION_MODIFIERS
 
     def are_coreferent(self, entity, mention, candidate_entity, candidate):
         """ Check if the candidate and the entity are related by checking heads.
@@ -55,8 +63,9 @@ class StrictHeadMatching(Sieve):
                 mention=mention, entity=entity,
                 candidate=candidate, candidate_entity=candidate_entity):
             self.meta["link_filtered_no_head_match"] += 1
-            self.logger.debug(
-                "LINK FILTERED No head match: %s", candidate[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "LINK FILTERED No head match: %s", candidate[FORM])
             return False
 
         if self.SAME_START:
@@ -66,8 +75,9 @@ class StrictHeadMatching(Sieve):
             if not self.same_proper_head_last_word(
                     entity=entity, candidate_entity=candidate_entity):
                 self.meta["link_filtered_no_same_proper_head"] += 1
-                self.logger.debug(
-                    "LINK FILTERED No same proper head last: %s", candidate[FORM])
+                if self.debug:
+                    self.logger.debug(
+                        "LINK FILTERED No same proper head last: %s", candidate[FORM])
                 return False
 
         if self.WORD_INCLUSION and \
@@ -75,46 +85,73 @@ class StrictHeadMatching(Sieve):
                     entity=entity, mention=mention,
                     candidate_entity=candidate_entity):
             self.meta["link_filtered_no_word_inclusion"] += 1
-            self.logger.debug(
-                "LINK FILTERED No word inclusion: %s", candidate[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "LINK FILTERED No word inclusion: %s", candidate[FORM])
             return False
 
         if self.COMPATIBLE_MODIFIERS and \
                 not self.compatible_modifiers_only(
                     entity=entity, candidate_entity=candidate_entity):
             self.meta["link_filtered_incompatible_modifiers"] += 1
-            self.logger.debug(
-                "LINK FILTERED Incompatible modifiers: %s", candidate[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "LINK FILTERED Incompatible modifiers: %s", candidate[FORM])
             return False
 
         if self.DIFFERENT_LOCATION and \
                 self.different_location_modifier(
                     mention_a=mention, mention_b=candidate):
             self.meta["link_filtered_different_location"] += 1
-            self.logger.debug(
-                "LINK FILTERED Different location modifier : %s",
-                candidate[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "LINK FILTERED Different location modifier : %s",
+                    candidate[FORM])
             return False
 
         if self.LATER_NUMBER and \
                 self.number_in_later_mention(
                     first_mention=candidate, second_mention=mention):
             self.meta["link_filtered_late_number"] += 1
-            self.logger.debug(
-                "LINK FILTERED later number modifier : %s", candidate[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "LINK FILTERED later number modifier : %s", candidate[FORM])
             return False
 
         if self.ATTRIBUTES_AGREE and \
                 not self.agree_attributes(
                     entity=entity, candidate_entity=candidate_entity):
             self.meta["link_filtered_incompatible_attributes"] += 1
-            self.logger.debug(
-                "LINK FILTERED Incompatible attributes: %s", candidate[FORM])
+            if self.debug:
+                self.logger.debug(
+                    "LINK FILTERED Incompatible attributes: %s", candidate[FORM])
             return False
 
-        self.logger.debug("LINK MATCH: %s",  candidate[FORM])
+        if self.debug:
+            self.logger.debug("LINK MATCH: %s",  candidate[FORM])
         return True
 
+    def candidate_keys(self, candidate):
+        """ The cleaned head form of the candidate."""
+        return self.clean_head_word_form(candidate),
+
+    def mention_keys(self, entity, mention):
+        """ The cleaned head form of the representative mention of the
+        entity.
+        """
+        return self.clean_head_word_form(self.entity_representative_mention(entity)),
+
+    def find_candidates(self, candidate_index, entity, mention):
+        """ The mentions of the entities that contain a mention with the same
+        head as the representative mention, as the head match checks every
+        mention of the candidate entity.
+        """
+        found = {}
+        for head_mention in candidate_index.find(self.mention_keys(entity, mention)).values():
+            for candidate in self.entities.get_entity(head_mention)[1]:
+                found[candidate[ID]] = candidate
+        return found.values()
+
     def get_words(self, element):
         return self.graph_builder.get_words(element)
 
@@ -122,33 +159,52 @@ class StrictHeadMatching(Sieve):
         """ Get the forms of every word of a syntactic element.
 
         :param element: A syntactic element
-        :return: List of strings, the forms of the words that appears in the
+        :return: Set of strings, the forms of the words that appears in the
         element.
         """
+        return self.forms.get(element, self.WORD_FORMS, self._all_words_forms)
+
+    def _all_words_forms(self, element):
         all_words = set(
             rules.clean_string(word[FORM])
             for word in self.get_words(element))
-        if "" in all_words:
-            all_words.remove("")
-        return all_words
+        all_words.discard("")
+        return frozenset(all_words)
 
     def get_modifiers(self, element):
         """ Get the forms of the modifiers of a syntactic element.
 
         :param element: A syntactic element
-        :return: List of strings, the forms of the words that appears in the
+        :return: Set of strings, the forms of the words that appears in the
         element and are mods.
         """
-        element_head = rules.clean_string(rules.get_head_word_form(self.graph_builder, element))
+        return self.forms.get(element, self.MODIFIERS, self._modifiers)
+
+    def _modifiers(self, element):
+        element_head = self.clean_head_word_form(element)
         all_mods = set([rules.clean_string(word[FORM])
                         for word in self.get_words(element)
                         if pos_tags.mod_forms(word[POS])])
-        all_mods.difference_update({element_head})
-        return all_mods
+        all_mods.discard(element_head)
+        return frozenset(all_mods)
+
+    def get_location_modifiers(self, element):
+        """ Get the forms of the location modifiers of a syntactic element.
+
+        :param element: A syntactic element
+        :return: Set of strings, the forms of the words that appears in the
+        element and are location modifiers.
+        """
+        return self.forms.get(element, self.LOCATION_MODIFIERS, self._location_modifiers)
+
+    def _location_modifiers(self, element):
+        # TODO Mojo to change estate abbreviation into full name
+        return frozenset(
+            word_form for word_form in self.get_all_words_forms(element)
+            if stopwords.location_modifiers(word_form))
 
     def compare_heads(self, head_a, head_b):
-        return rules.clean_string(rules.get_head_word_form(
-            self.graph_builder, head_a)) == rules.clean_string(rules.get_head_word_form(self.graph_builder, head_b))
+        return self.clean_head_word_form(head_a) == self.clean_head_word_form(head_b)
 
     def head_match(self, mention, entity, candidate, candidate_entity):
         """Checks if the head word form of the mention is equals to the head
@@ -190,7 +246,7 @@ class StrictHeadMatching(Sieve):
                                if not stopwords.extended_stop_words(word)
                                if not pronouns.all(word)]
                            )
-        head_word_form = rules.get_head_word_form(self.graph_builder, mention).lower()
+        head_word_form = self.head_word_form(mention).lower()
         if head_word_form in entity_words:
             entity_words.remove(head_word_form)
 
@@ -209,14 +265,13 @@ class StrictHeadMatching(Sieve):
         """
         for candidate_mention in candidate_entity:
             candidate_words = self.get_all_words_forms(candidate_mention)
+            candidate_locations = self.get_location_modifiers(candidate_mention)
             for entity_mention in entity:
                 if not self.compare_heads(candidate_mention, entity_mention):
                     continue
                 mention_modifiers = self.get_modifiers(entity_mention)
-                for candidate_word in candidate_words:
-                    if stopwords.location_modifiers(candidate_word) and \
-                            candidate_word not in mention_modifiers:
-                        return False
+                if not candidate_locations.issubset(mention_modifiers):
+                    return False
                 if len(mention_modifiers - candidate_words) > 0:
                     return False
         return True
@@ -239,8 +294,7 @@ class StrictHeadMatching(Sieve):
             if not pos_tags.proper_noun(candidate_head[POS]):
                 continue
             # The head word must be the last word of the relaxed form
-            candidate_head_string = rules.get_head_word_form(
-                self.graph_builder, candidate_mention).lower()
+            candidate_head_string = self.head_word_form(candidate_mention).lower()
             candidate_relaxed_form = self.relaxed_form(candidate_mention)
             if not candidate_relaxed_form.endswith(candidate_head_string):
                 continue
@@ -256,8 +310,7 @@ class StrictHeadMatching(Sieve):
                 mention_head = self.get_head_word(entity_mention)
                 if not pos_tags.proper_noun(mention_head[POS]):
                     continue
-                mention_head_string = rules.get_head_word_form(
-                    self.graph_builder, entity_mention).lower()
+                mention_head_string = self.head_word_form(entity_mention).lower()
                 if not (mention_head_string == candidate_head_string):
                     # heads must be the last word of the relaxed form of the mention
                     continue
@@ -280,19 +333,7 @@ class StrictHeadMatching(Sieve):
     def different_location_modifier(self, mention_a, mention_b):
 
         # TODO Mojo Not nation-division coreference
-
-        mention_a_locations = set()
-        for word_form in self.get_all_words_forms(mention_a):
-            if stopwords.location_modifiers(word_form):
-                # TODO Mojo to change estate abbreviation into full name
-                mention_a_locations.add(word_form)
-
-        mention_b_locations = set()
-        for word_form in self.get_all_words_forms(mention_b):
-            if stopwords.location_modifiers(word_form):
-                # TODO Mojo to change estate abbreviation into full name
-                mention_b_locations.add(word_form)
-        if mention_a_locations == mention_b_locations:
+        if self.get_location_modifiers(mention_a) == self.get_location_modifiers(mention_b):
             return False
         return True
 
@@ -334,8 +375,7 @@ class StrictHeadMatching(Sieve):
                                if n_mention[constants.MENTION] != constants.PRONOUN_MENTION
                                for word in self.get_all_words_forms(n_mention)
                                if not stopwords.extended_stop_words(word)])
-        rules.get_head_word_form(self.graph_builder, mention).lower()
-        head_word_form = rules.get_head_word_form(self.graph_builder, mention).lower()
+        head_word_form = self.head_word_form(mention).lower()
         if head_word_form in entity_words:
             entity_words.remove(head_word_form)
         return (
@@ -413,6 +453,24 @@ class RelaxHeadMatchingVariantA(StrictHeadMatching):
     WORD_INCLUSION = True
     ATTRIBUTES_AGREE = True
 
+    def candidate_keys(self, candidate):
+        """ The head form and the named entity type of the candidate."""
+        return ("head", self.head_word_form(candidate)), ("ner", candidate.get(NER))
+
+    def mention_keys(self, entity, mention):
+        """ The lowered head form of the representative mention of the entity,
+        and its named entity type if it is a mention one.
+        """
+        mention = self.entity_representative_mention(entity)
+        keys = [("head", self.head_word_form(mention).lower())]
+        if ner_tags.mention_ner(mention.get(NER)):
+            keys.append(("ner", mention.get(NER)))
+        return keys
+
+    def find_candidates(self, candidate_index, entity, mention):
+        """ The relaxed head match only checks the candidate."""
+        return Sieve.find_candidates(self, candidate_index, entity, mention)
+
     def head_match(self, mention, entity, candidate, candidate_entity):
         """Checks if the mention an candidate head are related in more relaxed algorithm.
 
@@ -425,10 +483,9 @@ class RelaxHeadMatchingVariantA(StrictHeadMatching):
         """
 
         mention_head = self.get_head_word(mention)
-        mention_head_form = rules.get_head_word_form(self.graph_builder, mention).lower()
+        mention_head_form = self.head_word_form(mention).lower()
         candidate_head = self.get_head_word(candidate)
-        candidate_head_form = \
-            rules.get_head_word_form(self.graph_builder, candidate).lower()
+        candidate_head_form = self.head_word_form(candidate).lower()
         if ner_tags.mention_ner(mention.get(NER)):
             if mention.get(NER) == candidate.get(NER):
                 if pos_tags.proper_noun(mention_head[POS]):
@@ -446,8 +503,7 @@ class RelaxHeadMatchingVariantA(StrictHeadMatching):
                                 word_form.startswith(candidate_head_form):
                             return True
 
-        if rules.get_head_word_form(self.graph_builder, mention).lower() == \
-                rules.get_head_word_form(self.graph_builder, candidate):
+        if mention_head_form == self.head_word_form(candidate):
             return True
         return False
 
@@ -459,6 +515,10 @@ class StrictHeadMatchingSemeval(StrictHeadMatching):
     short_name = "SEMEVAL_SHM"
     auto_load = False
 
+    WORD_FORMS = "multiword_" + WORD_FORMS
+    MODIFIERS = "multiword_" + MODIFIERS
+    LOCATION_MODIFIERS = "multiword_" + LOCATION_MODIFIERS
+
     def get_words(self, element):
         return [token
                 for word in self.graph_builder.get_words(element)
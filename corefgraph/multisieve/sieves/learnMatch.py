@@ -190,17 +190,20 @@ class LearnMatch(Sieve):
         mention_relaxed_form = self.relaxed_form(mention)
 
         if candidate_relaxed_form == "":
-            self.logger.debug("FILTERED LINK Empty relaxed form")
+            if self.debug:
+                self.logger.debug("FILTERED LINK Empty relaxed form")
             self.meta["Filtered_relaxed_form_empty"] += 1
             return False
         if mention_relaxed_form == "":
-            self.logger.debug("FILTERED LINK Empty relaxed form")
+            if self.debug:
+                self.logger.debug("FILTERED LINK Empty relaxed form")
             self.meta["Filtered_relaxed_form_empty"] += 1
             return False
         if (mention_relaxed_form == candidate_relaxed_form) or \
                 (mention_relaxed_form + " 's" == candidate_relaxed_form) or \
                 (mention_relaxed_form == candidate_relaxed_form + " 's"):
-            self.logger.debug("Linked")
+            if self.debug:
+                self.logger.debug("Linked")
             self.meta["linked"] += 1
             return True
         return False
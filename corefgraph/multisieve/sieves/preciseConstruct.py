@@ -57,20 +57,23 @@ class AppositiveConstruction(Sieve):
         # If candidate or mention are NE use their constituent as mentions
 
         if PROPER_MENTION == mention[MENTION] == candidate[MENTION]:
-            self.logger.debug("LINK IGNORED are proper nouns")
+            if self.debug:
+                self.logger.debug("LINK IGNORED are proper nouns")
             self.meta["filtered_two_proper_mentions"] += 1
             return False
 
         if not self.agree_attributes(
                 entity=entity, candidate_entity=candidate_entity):
-            self.logger.debug("LINK IGNORED attributes disagree")
+            if self.debug:
+                self.logger.debug("LINK IGNORED attributes disagree")
             self.meta["filtered_attribute_disagree"] += 1
             return False
 
         if self.is_location(mention):
             self.meta["filtered_location"] += 1
-            self.logger.debug("LINK IGNORED is a location: %s",
-                              mention.get(NER, "NO NER"))
+            if self.debug:
+                self.logger.debug("LINK IGNORED is a location: %s",
+                                  mention.get(NER, "NO NER"))
             return False
         # Check the apposition
         if mention[APPOSITIVE] and mention[APPOSITIVE][SPAN] == candidate[SPAN]:
@@ -108,7 +111,8 @@ class PredicativeNominativeConstruction(Sieve):
         if not super(self.__class__, self).validate(mention, entity):
             return False
         if not mention[PREDICATIVE_NOMINATIVE]:
-            self.logger.debug("MENTION FILTERED Not predicative nominative")
+            if self.debug:
+                self.logger.debug("MENTION FILTERED Not predicative nominative")
             return False
         return True
 
@@ -142,14 +146,16 @@ class PredicativeNominativeConstruction(Sieve):
             if constituent_tags.verb_phrase(mention_parent[TAG]):
                 enclosing_verb_phrase = mention_parent
             else:
-                self.logger.debug("LINK FILTERED No enclosing verb")
+                if self.debug:
+                    self.logger.debug("LINK FILTERED No enclosing verb")
                 self.meta["filtered_no_enclosing_verb"] += 1
                 return False
             if constituent_tags.verb_phrase(mention_grandparent[TAG]):
                 enclosing_verb_phrase = mention_grandparent
             if not verbs.copulative(self.graph_builder.get_syntactic_sibling(
                     mention)[0]["form"]):
-                self.logger.debug("LINK FILTERED verb is not copulative")
+                if self.debug:
+                    self.logger.debug("LINK FILTERED verb is not copulative")
                 self.meta["filtered_enclosing_verb_no_copulative"] += 1
                 return False
             siblings = []
@@ -190,7 +196,8 @@ class RoleAppositiveConstruction(Sieve):
             # constrain(a) The mention must be labeled as person
         ner = mention.get(NER, None)
         if not ner_tags.person(ner):
-            self.logger.debug("MENTION FILTERED Not a person -%s-", ner)
+            if self.debug:
+                self.logger.debug("MENTION FILTERED Not a person -%s-", ner)
             return False
         return True
 
@@ -215,11 +222,13 @@ class RoleAppositiveConstruction(Sieve):
             return False
 
         if candidate[GENDER] == NEUTRAL:
-            self.logger.debug("LINK FILTERED Candidate is neutral")
+            if self.debug:
+                self.logger.debug("LINK FILTERED Candidate is neutral")
 
             return False
         if candidate[ANIMACY] == INANIMATE:
-            self.logger.debug("LINK FILTERED Candidate is inanimate")
+            if self.debug:
+                self.logger.debug("LINK FILTERED Candidate is inanimate")
             self.meta["filtered_inanimate"] += 1
             return False
         if rules.is_role_appositive(self.graph_builder, candidate, mention):
@@ -257,16 +266,18 @@ class AcronymMatch(Sieve):
         for candidate in candidate_entity:
             candidate_form = candidate[FORM]
             if self.is_pronoun(candidate):
-                self.logger.debug(
-                    "LINK FILTERED Candidate is a pronoun: %s", candidate_form)
+                if self.debug:
+                    self.logger.debug(
+                        "LINK FILTERED Candidate is a pronoun: %s", candidate_form)
                 self.meta["loop_filtered_pronoun"] += 1
                 continue
             for mention in entity:
                 mention_form = mention[FORM]
                 if self.is_pronoun(mention):
-                    self.logger.debug(
-                        "Mention is a pronoun: %s next entity mention",
-                        mention["form"])
+                    if self.debug:
+                        self.logger.debug(
+                            "Mention is a pronoun: %s next entity mention",
+                            mention["form"])
                     continue
                 if len(candidate_form) > len(mention_form):
                     sort, large = mention_form, candidate_form
@@ -280,7 +291,8 @@ class AcronymMatch(Sieve):
                     continue
                 # generated_acronyms = (filter(str.isupper, large),)
                 if sort == filter(str.isupper, large):
-                    self.logger.debug("ACRONYM MATCH: %s ", sort)
+                    if self.debug:
+                        self.logger.debug("ACRONYM MATCH: %s ", sort)
                     self.meta["linked_" + self.short_name] += 1
                     return True
             self.meta["ignored"] += 1
@@ -308,7 +320,8 @@ class RelativePronoun(Sieve):
             return False
 
         if not mention[RELATIVE_PRONOUN]:
-            self.logger.debug("MENTION FILTERED Not a relative pronoun")
+            if self.debug:
+                self.logger.debug("MENTION FILTERED Not a relative pronoun")
             return False
         return True
 
@@ -332,7 +345,8 @@ class RelativePronoun(Sieve):
 
         # TODO ESTO
         if not constituent_tags.noun_phrase(candidate_tag):
-            self.logger.debug("LINK FILTERED Candidate is not a noun phrase")
+            if self.debug:
+                self.logger.debug("LINK FILTERED Candidate is not a noun phrase")
             self.meta["filtered_no_NP"] += 1
             return False
         if rules.is_relative_pronoun(self.graph_builder, candidate, mention):
@@ -382,7 +396,6 @@ class PreciseConstructSieve(Sieve):
     short_name = "PCM"
 
     def __init__(self, meta_info):
-        super(self.__class__, self).__init__(meta_info)
         self.sieves = (
             AppositiveConstruction(meta_info),
             PredicativeNominativeConstruction(meta_info),
@@ -391,7 +404,15 @@ class PreciseConstructSieve(Sieve):
             DemonymMatch(meta_info),
             RoleAppositiveConstruction(meta_info),
         )
+        super(self.__class__, self).__init__(meta_info)
+
+    def reset(self):
+        """ Reset the sieve and its sub-sieves, the meta of each sub-sieve is
+        kept inside the meta of this one.
+        """
+        super(PreciseConstructSieve, self).reset()
         for sieve in self.sieves:
+            sieve.reset()
             self.meta[sieve.short_name] = sieve.meta
 
     def validate(self, mention, entity):
@@ -415,10 +436,15 @@ class PreciseConstructSieve(Sieve):
         """
         for sieve in self.sieves:
             sieve.graph_builder = self.graph_builder
+            sieve.entities = self.entities
+            sieve.forms = self.forms
+            sieve.pairs = self.pairs
+            sieve.debug = self.debug
             if sieve.validate(mention=mention, entity=entity):
                 if sieve.are_coreferent(
                         entity, mention, candidate_entity, candidate):
-                    self.logger.debug("Match with -%s-", Sieve.short_name)
+                    if self.debug:
+                        self.logger.debug("Match with -%s-", Sieve.short_name)
                     self.meta["linked"] += 1
                     return True
             self.meta["ignored"] += 1
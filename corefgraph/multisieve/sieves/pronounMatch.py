@@ -3,6 +3,8 @@
 
 """
 
+from itertools import chain
+
 from corefgraph.constants import SPAN, FORM, UTTERANCE, PREV_SPEAKER, CONSTITUENT, ID, TAG
 from corefgraph.multisieve.features.constants import NUMBER, GENDER, PREDICATIVE_NOMINATIVE, MENTION, \
     PERSON, FIRST_PERSON, SECOND_PERSON, THIRD_PERSON, UNKNOWN, DEMONYM, PLEONASTIC
@@ -56,25 +58,30 @@ class PronounMatch(PronounSieve):
             mention = representative_mention
 
         if not self.is_pronoun(mention):
-            self.logger.debug("MENTION FILTERED: Not a pronoun.")
+            if self.debug:
+                self.logger.debug("MENTION FILTERED: Not a pronoun.")
             return False
 
         if candidate.get(DEMONYM, False) and \
                 not pronouns.no_organization(mention[FORM].lower()):
-            self.logger.debug(
-                "LINK FILTERED: Candidate is location and mention is not organization valid.")
+            if self.debug:
+                self.logger.debug(
+                    "LINK FILTERED: Candidate is location and mention is not organization valid.")
             return False
 
         if not self.agree_attributes(entity=entity, candidate_entity=candidate_entity):
-            self.logger.debug("LINK FILTERED: Attributes disagree.")
+            if self.debug:
+                self.logger.debug("LINK FILTERED: Attributes disagree.")
             return False
 
         if self.entity_person_disagree(mention_entity=entity, candidate_entity=candidate_entity):
-            self.logger.debug("LINK FILTERED: Person Disagree.")
+            if self.debug:
+                self.logger.debug("LINK FILTERED: Person Disagree.")
             self.invalid(entity_a=entity, mention_a=mention, entity_b=candidate_entity, mention_b=candidate)
             return False
 
-        self.logger.debug("LINK ACCEPTED")
+        if self.debug:
+            self.logger.debug("LINK ACCEPTED")
         self.meta[mention[FORM].lower()] += 1
         return True
 
@@ -333,19 +340,21 @@ class AltSpanishPronounMatch(SpanishPronounMatch):
         :param mention: The mention whose candidates whe need.
         :param index_sent: The index of the current sentence.
 
-        @rtype : list
-        :return: A list of ordered candidates.
+        @rtype : generator
+        :return: The ordered candidates.
         """
 
-        mention_index = [c[ID] for c in candidate_order[index_sent]].index(mention["id"])
-        if len(candidate_order[index_sent][mention_index]["entity"][1]) == 1 and self.is_pronoun(mention):
-            self.logger.debug("ORDERING: pronoun order")
+        mention_index = self.candidates_position[mention[ID]]
+        if len(self.entities.get_entity(mention)[1]) == 1 and self.is_pronoun(mention):
+            if self.debug:
+                self.logger.debug("ORDERING: pronoun order")
             sentence_candidates = self.pronoun_order(candidate_order[index_sent][:mention_index], mention)
-            other_candidates = [m for s in reversed(text_order[:index_sent]) for m in s]
+            other_candidates = self.previous_sentences_candidates(text_order, index_sent)
             if pronouns.relative(mention[FORM].lower()):
-                self.logger.debug("ORDERING: Relative pronoun order")
+                if self.debug:
+                    self.logger.debug("ORDERING: Relative pronoun order")
                 sentence_candidates.reverse()
-            return sentence_candidates + other_candidates
+            return chain(sentence_candidates, other_candidates)
         else:
             return super(PronounSieve, self).get_candidates(text_order, candidate_order, mention, index_sent)
 
@@ -8,7 +8,6 @@ from corefgraph.multisieve.features.constants import PERSON, FIRST_PERSON, SECON
     NUMBER, PLURAL, SINGULAR, SPEAKER, IS_SPEAKER
 from corefgraph.multisieve.sieves.base import PronounSieve
 from corefgraph.resources.dictionaries import pronouns
-from corefgraph.resources.rules import rules
 from corefgraph.resources.tagset import dependency_tags
 
 __author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
@@ -57,23 +56,27 @@ class SpeakerSieve(PronounSieve):
         distance = abs(mention[UTTERANCE] - candidate[UTTERANCE])
 
         if self.EQUAL_SPEAKERS and self.equal_speakers(mention, candidate):
-            self.logger.debug("LINK VALID SPEAKER_REFLEX Match")
+            if self.debug:
+                self.logger.debug("LINK VALID SPEAKER_REFLEX Match")
             return True
 
         if self.SPEAKER_REFLEX and self.reflexive(mention, candidate, entity, candidate_entity):
-            self.logger.debug("LINK VALID SPEAKER_REFLEX Match")
+            if self.debug:
+                self.logger.debug("LINK VALID SPEAKER_REFLEX Match")
             return True
         # "I" and the speaker
         if self.are_speaker_speech(speaker=mention, speech=candidate):
             if person_candidate == FIRST_PERSON and\
                     number_candidate == SINGULAR:
-                self.logger.debug("LINK VALID SPEAKER_I_MATCH")
+                if self.debug:
+                    self.logger.debug("LINK VALID SPEAKER_I_MATCH")
                 if self.SPEAKER_I_MATCH:
                     return True
 
         if self.are_speaker_speech(speaker=candidate, speech=mention):
             if person_mention == FIRST_PERSON and number_mention == SINGULAR:
-                self.logger.debug("LINK VALID SPEAKER_I_MATCH")
+                if self.debug:
+                    self.logger.debug("LINK VALID SPEAKER_I_MATCH")
                 if self.SPEAKER_I_MATCH:
                     return True
 
@@ -82,7 +85,8 @@ class SpeakerSieve(PronounSieve):
                 and (person_candidate == FIRST_PERSON) and\
                 (number_candidate == SINGULAR):
             if self.same_speaker(mention, candidate):
-                self.logger.debug("LINK VALID SPEAKER_I_I_MATCH")
+                if self.debug:
+                    self.logger.debug("LINK VALID SPEAKER_I_I_MATCH")
                 if self.I_MATCH:
                     return True
 
@@ -91,7 +95,8 @@ class SpeakerSieve(PronounSieve):
                 and (person_candidate == FIRST_PERSON) and\
                 (number_candidate == PLURAL):
             if self.same_speaker(mention, candidate):
-                self.logger.debug("LINK VALID SPEAKER_WE_WE_MATCH")
+                if self.debug:
+                    self.logger.debug("LINK VALID SPEAKER_WE_WE_MATCH")
                 if self.WE_MATCH:
                     return True
 
@@ -99,7 +104,8 @@ class SpeakerSieve(PronounSieve):
         # TODO CHECK number
         if person_mention == SECOND_PERSON and person_candidate == SECOND_PERSON:
             if self.same_speaker(mention, candidate):
-                self.logger.debug("LINK VALID SPEAKER_YOU_YOU_MATCH")
+                if self.debug:
+                    self.logger.debug("LINK VALID SPEAKER_YOU_YOU_MATCH")
                 if self.YOU_MATCH:
                     return True
         # previous I - you or previous you - I in
@@ -117,10 +123,12 @@ class SpeakerSieve(PronounSieve):
                     number_mention == SINGULAR
                 )):
             if not self.same_speaker(mention, candidate) and (distance == 1):
-                self.logger.debug("LINK VALID SPEAKER_YOU_I_MATCH")
+                if self.debug:
+                    self.logger.debug("LINK VALID SPEAKER_YOU_I_MATCH")
                 return True
             else:
-                self.logger.debug("LINK INVALID: YOU an I but not in sequence.")
+                if self.debug:
+                    self.logger.debug("LINK INVALID: YOU an I but not in sequence.")
                 # TODO check
                 # self.invalid(entity, mention,candidate_entity, candidate)
 
@@ -145,7 +153,8 @@ class SpeakerSieve(PronounSieve):
                                          mention_b=mention_b)
                             return False
 
-        self.logger.debug("LINK IGNORED")
+        if self.debug:
+            self.logger.debug("LINK IGNORED")
         return False
 
     def log_candidate(self, candidate):
@@ -228,6 +237,6 @@ class SpeakerSieve(PronounSieve):
 
     def equal_speakers(self, mention, candidate):
         if mention.get(IS_SPEAKER, False) and candidate.get(IS_SPEAKER, False):
-            return rules.get_head_word_form(self.graph_builder, mention).lower() == \
-                   rules.get_head_word_form(self.graph_builder, candidate).lower()
+            return self.head_word_form(mention).lower() == \
+                   self.head_word_form(candidate).lower()
         return False
@@ -5,7 +5,6 @@
 
 from corefgraph.constants import FORM
 from corefgraph.multisieve.sieves.base import Sieve
-from corefgraph.resources.rules import rules
 
 __author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
 
@@ -20,6 +19,8 @@ class ExactStringMatch(Sieve):
     NO_PRONOUN_CANDIDATE = True
     NO_STOP_WORDS = True
     DISCOURSE_SALIENCE = False
+    # Only the mentions with the same form are linked
+    BLOCKING = True
 
     def are_coreferent(self, entity, mention, candidate_entity, candidate):
         """ Candidate an primary mention have the same form
@@ -41,16 +42,19 @@ class ExactStringMatch(Sieve):
 
         # Check empty results
         if not candidate_form:
-            self.logger.debug("FILTERED LINK Empty candidate processed form")
+            if self.debug:
+                self.logger.debug("FILTERED LINK Empty candidate processed form")
             self.meta["Filtered_mention_form_empty"] += 1
             return False
         if not mention_form:
-            self.logger.debug("FILTERED LINK Empty processed form")
+            if self.debug:
+                self.logger.debug("FILTERED LINK Empty processed form")
             self.meta["Filtered_candidate_form_empty"] += 1
             return False
 
         if mention_form == candidate_form:
-            self.logger.debug("Linked")
+            if self.debug:
+                self.logger.debug("Linked")
             self.meta["linked"] += 1
             return True
 
@@ -58,7 +62,17 @@ class ExactStringMatch(Sieve):
         return False
 
     def get_form(self, mention):
-        return rules.clean_string(mention[FORM])
+        return self.clean_form(mention)
+
+    def candidate_keys(self, candidate):
+        """ The form of the candidate, if not empty."""
+        form = self.get_form(candidate)
+        return (form,) if form else ()
+
+    def mention_keys(self, entity, mention):
+        """ The form of the mention, if not empty."""
+        form = self.get_form(mention)
+        return (form,) if form else ()
 
     def context(self, mention_entity, mention, candidate_entity, candidate):
         """ Return a Human readable and sieve specific info string of the
@@ -89,4 +103,4 @@ class RelaxedStringMatch(ExactStringMatch):
     NO_APPOSITIVE_MENTION = True
 
     def get_form(self, mention):
-        return rules.clean_string(self.relaxed_form(mention))
+        return self.clean_relaxed_form(mention)
@@ -0,0 +1,116 @@
+# coding=utf-8
+""" Tracing of the decisions of the mention extractor and the sieves.
+
+The tracing is off by default and costs nothing: each sieve run and each
+sentence extraction check once if it is enabled. When it is enabled, every
+decision is recorded as a small tuple in a ring buffer that keeps only the
+last decisions, so it can be left enabled in a server. The buffer is dumped on
+demand with dump, or with the signal installed by dump_on_signal.
+
+Each decision is the stage (the extractor or the short name of the sieve), the
+decision, the ID of the mention, the ID of the candidate (None for mention
+decisions) and the reasons of the decision.
+"""
+
+import codecs
+import signal
+from collections import deque, namedtuple
+from logging import getLogger
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+logger = getLogger(__name__)
+
+Decision = namedtuple("Decision", ("stage", "decision", "mention", "candidate", "reasons"))
+
+# Decisions
+DOCUMENT = "document"
+CAUGHT = "caught"
+FILTERED = "filtered"
+INVALID = "invalid"
+LINKED = "linked"
+NOT_LINKED = "not_linked"
+
+# The ring buffer of the decisions, None when the tracing is disabled
+_buffer = None
+
+
+def enable(size=10000):
+    """ Start recording the decisions. The decisions already recorded are
+    kept if the tracing was enabled.
+
+    :param size: The number of decisions kept.
+    """
+    global _buffer
+    if _buffer is None or _buffer.maxlen != size:
+        _buffer = deque(_buffer or (), maxlen=size)
+
+
+def disable():
+    """ Stop recording the decisions and discard the recorded ones."""
+    global _buffer
+    _buffer = None
+
+
+def buffer():
+    """ The ring buffer of the decisions, None if the tracing is disabled.
+    Get it once before a loop and append Decisions to it.
+    """
+    return _buffer
+
+
+def start_document(document_id):
+    """ Record the start of a document.
+
+    :param document_id: The id of the document.
+    """
+    if _buffer is not None:
+        _buffer.append(Decision(DOCUMENT, DOCUMENT, document_id, None, ()))
+
+
+def decisions():
+    """ The recorded decisions, from the oldest one."""
+    return list(_buffer or ())
+
+
+def dump(stream):
+    """ Write the recorded decisions as tab separated lines.
+
+    :param stream: The stream where the decisions are written.
+    :return: The number of decisions written.
+    """
+    recorded = decisions()
+    for decision in recorded:
+        stream.write(u"{0}\t{1}\t{2}\t{3}\t{4}\n".format(
+            decision.stage, decision.decision, decision.mention,
+            "" if decision.candidate is None else decision.candidate,
+            ",".join(decision.reasons)))
+    return len(recorded)
+
+
+def dump_file(filename):
+    """ Write the recorded decisions into a file.
+
+    :param filename: The path of the file, overwritten.
+    """
+    with codecs.open(filename, "w", encoding="utf-8") as stream:
+        count = dump(stream)
+    logger.info("Trace: %s decisions written in %s", count, filename)
+
+
+def dump_on_signal(filename, signal_number=getattr(signal, "SIGUSR1", None)):
+    """ Write the recorded decisions into a file each time the process
+    receives a signal (SIGUSR1 by default). Does nothing where the signal
+    does not exist.
+
+    :param filename: The path of the file.
+    :param signal_number: The signal.
+    """
+    if signal_number is None:
+        logger.warning("Trace: No signal to dump the decisions")
+        return
+    try:
+        signal.signal(signal_number, lambda number, frame: dump_file(filename))
+    except ValueError:
+        # Only the main thread can set a signal handler
+        logger.warning("Trace: The signal to dump the decisions can not be set in this thread")
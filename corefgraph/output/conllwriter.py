@@ -34,9 +34,6 @@ class ConllDocument(BaseDocument):
                 document_id = self.document_id
         else:
             self.logger.warning("unknown Document ID: using document 000")
-        meta = coreference_processor.get_meta()
-        meta["document_id"] = document_id
-        meta["part_id"] = part_id
 
         self._annotate_ner(graph_builder,
                            graph_builder.get_all_named_entities())
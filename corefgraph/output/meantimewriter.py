@@ -26,10 +26,6 @@ class ConllDocument(BaseDocument):
         document_id = self.document_id
         part_id = "000"
 
-        meta = coreference_processor.get_meta()
-        meta["document_id"] = document_id
-        meta["part_id"] = part_id
-
         self._annotate_ner(graph_builder,
                            graph_builder.get_all_named_entities())
         for coref_index, entity \
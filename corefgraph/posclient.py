@@ -0,0 +1,297 @@
+# coding=utf-8
+""" Client of the IXA POS server, used to expand the multiword tokens.
+
+The multiwords of a document are sent in one request: a NAF document with a
+sentence for each multiword, whose words are the parts of the multiword. The
+server replies with the same document tagged, ended as any NAF document with
+the closing tag of the root.
+
+The connections are kept in a pool and reused while the server keeps them
+open, and the expansions are kept in a bounded LRU cache shared by every
+document. Each request has a deadline, the multiwords not expanded before it
+are left unexpanded.
+
+The clients are per process: the pool and the cache of a forked process are
+discarded the first time they are used. They are not thread safe.
+"""
+
+import os
+import socket
+from collections import OrderedDict
+from logging import getLogger
+from time import sleep, time
+
+from lxml.etree import XMLSyntaxError
+from pynaf import NAFDocument
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+logger = getLogger(__name__)
+
+# The end of the requests and the responses
+TERMINATOR = b"</NAF>"
+
+
+class LRUCache(object):
+    """ A dict that keeps only its last used items."""
+
+    def __init__(self, size):
+        self.size = size
+        self._items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """ Get an item and mark it as the last used.
+
+        :param key: The key of the item.
+        :param default: The value returned if the item is not cached.
+        """
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self._items[key] = value
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """ Add an item, and discard the least recently used item if the cache
+        is full.
+
+        :param key: The key of the item.
+        :param value: The value of the item.
+        """
+        if self.size <= 0:
+            return
+        self._items.pop(key, None)
+        self._items[key] = value
+        if len(self._items) > self.size:
+            self._items.popitem(last=False)
+
+    def clear(self):
+        """ Discard every item."""
+        self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+
+class POSClient(object):
+    """ A pooled, batched and cached client of the POS server."""
+
+    def __init__(self, host="127.0.0.1", port=1337, language=None, encoding="utf-8",
+                 pool_size=2, cache_size=10000, retry=3, retry_wait=0.5):
+        """
+        :param host: The address of the server.
+        :param port: The port of the server.
+        :param language: The language of the requests.
+        :param encoding: The encoding of the multiwords.
+        :param pool_size: The number of idle connections kept open.
+        :param cache_size: The number of expansions kept.
+        :param retry: The number of tries of each request.
+        :param retry_wait: The seconds waited after a connection error.
+        """
+        self.address = (host, port)
+        self.language = language
+        self.encoding = encoding
+        self.pool_size = pool_size
+        self.retry = retry
+        self.retry_wait = retry_wait
+        self.cache = LRUCache(cache_size)
+        self.requests = 0
+        self.connections = 0
+        self.failures = 0
+        self._idle = []
+        self._pid = os.getpid()
+
+    def _check_fork(self):
+        """ Discard the connections and the cache inherited from the parent
+        process.
+        """
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self.close()
+            self.cache.clear()
+
+    def close(self):
+        """ Close the idle connections."""
+        while self._idle:
+            self._idle.pop().close()
+
+    def _connect(self, deadline):
+        """ Get an idle connection or open a new one.
+
+        :param deadline: The time when the request is abandoned.
+        :return: The connection and if it was reused.
+        """
+        if self._idle:
+            return self._idle.pop(), True
+        self.connections += 1
+        return socket.create_connection(self.address, timeout=max(deadline - time(), 0.001)), False
+
+    def _release(self, connection):
+        """ Keep the connection for the next request, or close it if the pool
+        is full.
+        """
+        if len(self._idle) < self.pool_size:
+            self._idle.append(connection)
+        else:
+            connection.close()
+
+    def _request(self, forms):
+        """ Build the request of the multiwords.
+
+        :param forms: The multiwords.
+        """
+        document = NAFDocument(language=self.language)
+        offset = 0
+        word_index = 0
+        for sentence, form in enumerate(forms, 1):
+            for token in form.replace("_", " ").split(" "):
+                if token:
+                    document.add_word(
+                        token.decode(self.encoding), "w{0}".format(word_index),
+                        offset=str(offset), length=str(len(token)), sent=str(sentence))
+                    offset += len(token) + 1
+                    word_index += 1
+        return str(document)
+
+    def _parse(self, forms, response):
+        """ Get the tokens of each multiword from the response.
+
+        :param forms: The multiwords of the request.
+        :param response: The tagged NAF document.
+        :return: A dict with the (form, lemma, pos) tuples of each multiword.
+        """
+        naf = NAFDocument(input_stream=response)
+        expansions = {}
+        for word, term in zip(naf.get_words(), naf.get_terms()):
+            form = forms[int(word.attrib.get("sent", 1)) - 1]
+            expansions.setdefault(form, []).append((
+                word.text.encode(naf.encoding),
+                term.attrib['lemma'].encode(naf.encoding),
+                term.attrib['morphofeat']))
+        return expansions
+
+    def _send(self, request, deadline):
+        """ Send a request and receive the response, reusing a connection if
+        possible.
+
+        :param request: The NAF document of the request.
+        :param deadline: The time when the request is abandoned.
+        :return: The response, or None if the request failed.
+        """
+        retry = self.retry
+        while retry and time() < deadline:
+            connection = None
+            reused = False
+            try:
+                connection, reused = self._connect(deadline)
+                connection.settimeout(max(deadline - time(), 0.001))
+                connection.sendall(request)
+                response = []
+                closed = False
+                while True:
+                    data = connection.recv(65536)
+                    if not data:
+                        closed = True
+                        break
+                    response.append(data)
+                    if b"".join(response[-2:]).rstrip().endswith(TERMINATOR):
+                        break
+                response = b"".join(response)
+                if closed:
+                    connection.close()
+                else:
+                    self._release(connection)
+                if response.strip():
+                    return response
+                # A reused connection closed by the server is not a failure
+                if not reused:
+                    retry -= 1
+            except (socket.error, socket.timeout) as ex:
+                if connection is not None:
+                    connection.close()
+                if not reused:
+                    retry -= 1
+                    logger.warning("Error in IXA POS server: %s", ex)
+                    if retry:
+                        sleep(max(min(self.retry_wait, deadline - time()), 0))
+        return None
+
+    def expand(self, forms, deadline):
+        """ Expand the multiwords that are not cached in one request.
+
+        :param forms: The multiwords, with their parts joined by _
+        :param deadline: The time when the request is abandoned.
+        :return: A dict with the (form, lemma, pos) tuples of each expanded
+            multiword. The multiwords not expanded are missing.
+        """
+        self._check_fork()
+        expansions = {}
+        missing = []
+        for form in OrderedDict.fromkeys(forms):
+            tokens = self.cache.get(form)
+            if tokens is None:
+                missing.append(form)
+            else:
+                expansions[form] = tokens
+        if not missing:
+            return expansions
+        if time() >= deadline:
+            self.failures += 1
+            return expansions
+        self.requests += 1
+        response = self._send(self._request(missing), deadline)
+        if response is None:
+            self.failures += 1
+            logger.error("IXA POS server: %d multiwords not expanded", len(missing))
+            return expansions
+        try:
+            parsed = self._parse(missing, response)
+        except (XMLSyntaxError, KeyError, IndexError, ValueError) as ex:
+            self.failures += 1
+            logger.error("IXA POS server: Invalid response: %s", ex)
+            return expansions
+        for form, tokens in parsed.items():
+            self.cache.set(form, tokens)
+            expansions[form] = tokens
+        return expansions
+
+    def get_stats(self):
+        """ The counters of the client."""
+        return {
+            "requests": self.requests,
+            "connections": self.connections,
+            "failures": self.failures,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "cached": len(self.cache),
+        }
+
+
+_clients = {}
+
+
+def get_client(host, port, language, encoding, **kwargs):
+    """ Get the client of a server for a language, shared by every document
+    of the process in that language. The pipelines of other languages get
+    their own client, so their requests and cached expansions are not mixed.
+
+    :param host: The address of the server.
+    :param port: The port of the server.
+    :param language: The language of the requests.
+    :param encoding: The encoding of the requests.
+    :param kwargs: The other options of a new client.
+    """
+    key = (host, port, language, encoding)
+    try:
+        return _clients[key]
+    except KeyError:
+        client = _clients[key] = POSClient(host, port, language, encoding, **kwargs)
+        return client
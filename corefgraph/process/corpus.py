@@ -20,7 +20,10 @@ except ImportError as ie:
 import pycorpus
 import os.path
 import os
-from file import generate_parser as generate_parser_for_file, process as process_file
+from file import generate_parser as generate_parser_for_file, Pipeline
+from pool import WorkerPool, route_logs, DONE
+from corefgraph.multisieve import trace
+from corefgraph.timing import Timings
 
 __author__ = 'Josu Bermúdez <josu.bermudez@deusto.es>'
 __created__ = '27/06/13'
@@ -30,6 +33,53 @@ __created__ = '27/06/13'
 logger = logging.getLogger(__name__)
 SPACE_CHAR = "_"
 LINE_PATTERN = "{0:<20}\t{1}\t {2}\t {3}"
+# The trace file of each worker, joined in the trace file at the end
+WORKER_TRACE_PATTERN = "{0}.worker{1}"
+
+# The pipeline of the last processed file
+_pipeline = None
+
+
+def get_pipeline(config):
+    """ Get the pipeline for a configuration. The pipeline of the previous
+    file is reused while the configuration does not change.
+
+    :param config: The configuration for the coreference module.
+    :return: The pipeline
+    """
+    global _pipeline
+    if _pipeline is None or not _pipeline.accepts(config):
+        _pipeline = Pipeline(config)
+    return _pipeline
+
+
+def dump_worker_trace(config):
+    """ Write the decisions recorded by this worker in its own trace file.
+
+    :param config: The configuration of the experiment.
+    """
+    if getattr(config, "trace", 0) and config.trace_file:
+        trace.dump_file(WORKER_TRACE_PATTERN.format(config.trace_file, os.getpid()))
+
+
+def join_worker_traces(trace_file):
+    """ Join the trace files of the workers in the trace file, and remove
+    them.
+
+    :param trace_file: The trace file of the experiment.
+    """
+    path, name = os.path.split(trace_file)
+    prefix = WORKER_TRACE_PATTERN.format(name, "")
+    worker_files = sorted(
+        os.path.join(path, file_name) for file_name in os.listdir(path or ".")
+        if file_name.startswith(prefix))
+    with codecs.open(trace_file, "w", encoding="utf-8") as trace_stream:
+        for worker_file in worker_files:
+            with codecs.open(worker_file, "r", encoding="utf-8") as worker_stream:
+                for line in worker_stream:
+                    trace_stream.write(line)
+            os.remove(worker_file)
+    logger.info("Trace: %s worker traces joined in %s", len(worker_files), trace_file)
 
 
 def generate_parser():
@@ -92,9 +142,66 @@ def generate_parser():
     parser.add_argument('--evaluation_base', dest='evaluation_base',
                         action='store', default="./evaluation/",
                         help="The path of the evaluation result files")
+    parser.add_argument('--timeout', dest='timeout',
+                        action='store', type=float, default=0,
+                        help="The seconds that a file can take before its worker is killed, 0 for no limit.")
     return parser
 
 
+class CorpusProcessor(pycorpus.CorpusProcessor):
+    """ Process the files of the corpus in a pool of workers forked from a
+    process where the pipeline is already loaded.
+    """
+
+    def launch_parallel(self, function, parameters_lists, common_parameters, jobs=1, verbose=False):
+        """ Process the files with the configuration of an experiment. The
+        result of each file is logged in the order of the files and stored, as
+        a tab separated line, in the results file of the experiment. The
+        timings of the stages of every processed file are added up in the
+        timings file of the experiment.
+
+        :param function: The function that process each file.
+        :param parameters_lists: The files to process.
+        :param common_parameters: The configuration of the experiment.
+        :param jobs: The number of workers.
+        :param verbose: Log also the files processed without errors.
+        """
+        logger.info("Loading pipeline")
+        get_pipeline(common_parameters).preload()
+        friendly_name = os.path.join(
+            common_parameters.series_name, common_parameters.experiment_name).replace(" ", "_")
+        results_file = os.path.join(common_parameters.log_base, friendly_name + ".files")
+        timings_file = os.path.join(common_parameters.log_base, friendly_name + ".timings.csv")
+        try:
+            os.makedirs(os.path.dirname(results_file))
+        except OSError:
+            pass
+        tracing = getattr(common_parameters, "trace", 0) and common_parameters.trace_file
+        workers = WorkerPool(
+            function=function, config=common_parameters, workers=jobs, timeout=common_parameters.timeout,
+            finish=dump_worker_trace if tracing else None)
+        logger.info("Executing %s files in %s workers", len(parameters_lists), jobs)
+        failed = 0
+        corpus_timings = Timings()
+        with codecs.open(results_file, "w") as results:
+            for file_name, status, elapsed, message, timings in workers.run(parameters_lists):
+                results.write("{0}\t{1}\t{2:.3f}\t{3}\n".format(file_name, status, elapsed, message or ""))
+                if status != DONE:
+                    failed += 1
+                    logger.warning("File %s %s: %s", file_name, status, message)
+                else:
+                    corpus_timings.merge(timings)
+                    if verbose:
+                        logger.info("File %s processed in %.3f s", file_name, elapsed)
+        with codecs.open(timings_file, "w") as timings_stream:
+            corpus_timings.write_csv(timings_stream)
+        # The workers are stopped, and have written their decisions
+        if tracing:
+            join_worker_traces(common_parameters.trace_file)
+        logger.info("Corpus Processed: %s files, %s failed. Results in %s, timings in %s",
+                    len(parameters_lists), failed, results_file, timings_file)
+
+
 def file_processor(file_name, config):
     """ Extract from the base file the name of all the analysis needed for
     coreference analysis. Also if the result is in Conll format retrieve the
@@ -102,7 +209,7 @@ def file_processor(file_name, config):
 
     :param file_name: The file to bo resolved.
     :param config: The configuration for the coreference module.
-    :return NOTHING
+    :return: The timings of the stages of the resolution.
     """
     path, full_name = os.path.split(file_name)
     name, ext = os.path.splitext(full_name)
@@ -132,19 +239,7 @@ def file_processor(file_name, config):
         pass
 
     # Redirect logger to file
-    formatter = logger.handlers[0].formatter
-    file_handler = logging.FileHandler(filename=log_file, mode="w")
-    file_handler.setFormatter(formatter)
-    for logger_name in iter(logging.Logger.manager.loggerDict):
-        if logger_name.startswith("pycorpus"):
-            continue
-        try:
-            lg = logging.Logger.manager.loggerDict[logger_name]
-            for handler in lg.handlers:
-                lg.removeHandler(handler)
-            lg.addHandler(file_handler)
-        except AttributeError:
-            pass
+    route_logs(log_file)
     # Create the file names in base of original file name
     logger.info("Start processing %s", file_name)
     kaf_filename = base_name + ext
@@ -179,13 +274,12 @@ def file_processor(file_name, config):
 
     # Open the files and pass the data to the module
     logger.info("Result stored in %s", store_file)
+    pipeline = get_pipeline(config)
     with codecs.open(store_file, "w") as output_file:
-        statistic = process_file(
-            config=config,
-            text=codecs.open(kaf_filename, mode="r").read(),
-            parse_tree=trees,
-            speakers_list=speakers,
-            output=output_file
+        statistic = pipeline.process(
+            document=(codecs.open(kaf_filename, mode="r").read(), trees, speakers),
+            output=output_file,
+            document_id=config.document_id
         )
     if statistic:
 
@@ -201,6 +295,7 @@ def file_processor(file_name, config):
             pass
         with codecs.open(meta_file, "w") as output_file:
             json.dump(statistic, output_file)
+    return pipeline.processor.get_timings()
 
 
 def evaluate(general_config, experiment_config):
@@ -339,7 +434,7 @@ def main(config_files=False):
 
     :param config_files: The name of the parameter file
     """
-    experiment_instance = pycorpus.CorpusProcessor(
+    experiment_instance = CorpusProcessor(
         generate_parser_function=generate_parser,
         process_file_function=file_processor,
         evaluation_script=evaluate,
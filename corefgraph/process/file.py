@@ -11,8 +11,10 @@ import logging.config
 import sys
 import codecs
 import time
+from copy import copy, deepcopy
 import configargparse as argparse
 from corefgraph import properties
+from corefgraph.multisieve import trace
 
 __author__ = 'Josu Bermúdez <josu.bermudez@deusto.es>, ' \
              'Rodrigo Agerri <rodrigo.agerri@ehu.es>'
@@ -25,6 +27,111 @@ def flat_option(options):
     return [x for x in options if isinstance(x, str)] + [y for x in options if not isinstance(x, str) for y in x]
 
 
+class Pipeline(object):
+    """ Resolve documents with a configuration that is loaded once.
+
+    The language, the expanded options and the Corefgraph processor, with its
+    sieves, catchers, filters, purges, annotators and resources, are prepared
+    when the pipeline is created. Each processed document only clears the
+    state left by the previous one and activates the language context of the
+    pipeline, so pipelines of several languages can be used in one process.
+    """
+
+    # The config options that shape the pipeline
+    options = (
+        "verbose", "reader", "secure_tree", "language", "encoding", "sieves",
+        "extractor_options", "mention_extractor", "candidate_extractor",
+        "mention_catchers", "mention_filters", "mention_purges",
+        "mention_features", "meta", "writer", "writer_options", "trace",
+        "trace_file")
+
+    def __init__(self, config):
+        """ Load the system for a configuration.
+
+        :param config: The parameters used to tune the resolution and output
+            format. A copy is kept, the given one is not modified.
+        """
+        self.options_values = self._options_values(config)
+        self.config = copy(config)
+        # This is used to spread the language all over the module
+        logger.info("Setting language to %s", config.language)
+        self.language = properties.set_lang(config.language, config.encoding)
+        from corefgraph import Corefgraph
+
+        # End of voodoo
+
+        meta_parameters(self.config)
+        self.processor = Corefgraph(
+            verbose=self.config.verbose, reader=self.config.reader,
+            secure_tree=self.config.secure_tree, lang=self.config.language,
+            sieves=flat_option(self.config.sieves),
+            extractor_options=flat_option(self.config.extractor_options),
+            mention_extractor=self.config.mention_extractor,
+            candidate_extractor=self.config.candidate_extractor,
+            mention_catchers=flat_option(self.config.mention_catchers),
+            mention_filters=flat_option(self.config.mention_filters),
+            mention_purges=flat_option(self.config.mention_purges),
+            mention_features=flat_option(self.config.mention_features),
+            meta_info=self.config.meta
+        )
+        if getattr(self.config, "preload", False):
+            self.preload()
+        if getattr(self.config, "trace", 0) and self.config.trace_file:
+            trace.dump_on_signal(self.config.trace_file)
+
+    def preload(self):
+        """ Load the processors and every language resource now instead of
+        when they are used the first time, so the worker processes forked
+        after this share them already loaded.
+        """
+        from corefgraph.resources.lazy import preload
+        self.language.activate()
+        self.processor.reset_graph()
+        preload()
+
+    @classmethod
+    def _options_values(cls, config):
+        return [deepcopy(getattr(config, option, None)) for option in cls.options]
+
+    def accepts(self, config):
+        """ Check if a configuration produces this same pipeline.
+
+        :param config: The configuration to check.
+        """
+        return self.options_values == self._options_values(config)
+
+    def process(self, document, output, document_id=None):
+        """ Resolve a document and write the result.
+
+        :param document: A tuple of the KAF file of the document, the treebank
+            parse trees (or None) and the speakers of the tokens (or None).
+        :param output: The stream where the output is write.
+        :param document_id: The id of the document used by the writer.
+        :return: The meta info of the document if it is activated, None
+            otherwise.
+        """
+        self.config.document_id = document_id
+        self.config.start_time = time.gmtime()
+        # Other pipelines of the process may have changed the language
+        self.language.activate()
+        # And the tracing
+        if getattr(self.config, "trace", 0):
+            trace.enable(self.config.trace)
+        else:
+            trace.disable()
+        trace.start_document(document_id)
+        # Process the coreference of the document
+        self.processor.process_text(document)
+        # End of processing
+        self.config.end_time = time.gmtime()
+        # Write the result
+        self.processor.store(stream=output, config=self.config)
+        if self.config.meta:
+            return self.processor.get_meta()
+        else:
+            return None
+
+
 def process(config, text, parse_tree, speakers_list, output):
     """Process a document through the corefgraph system.info
 
@@ -34,43 +141,10 @@ def process(config, text, parse_tree, speakers_list, output):
     :param speakers_list: A list of the speaker per token.
     :param output: The stream where the output is write.
     """
-    # Start of processing
-
-    # Setting the system
-    # This is used to spread the language all over the module
-    logger.info("Setting language to %s", config.language)
-    properties.set_lang(config.language, config.encoding)
-    from corefgraph import Corefgraph
-
-    # End of voodoo
-
-    meta_parameters(config)
-    config.start_time = time.gmtime()
-    processor = Corefgraph(
-        verbose=config.verbose, reader=config.reader,
-        secure_tree=config.secure_tree, lang=config.language,
-        sieves=flat_option(config.sieves),
-        extractor_options=flat_option(config.extractor_options),
-        mention_extractor=config.mention_extractor,
-        candidate_extractor=config.candidate_extractor,
-        mention_catchers=flat_option(config.mention_catchers),
-        mention_filters=flat_option(config.mention_filters),
-        mention_purges=flat_option(config.mention_purges),
-        mention_features=flat_option(config.mention_features),
-        meta_info=config.meta
-    )
-
-    document = (text, parse_tree, speakers_list)
-    # Process the coreference of the document
-    processor.process_text(document)
-    # End of processing
-    config.end_time = time.gmtime()
-    # Write the result
-    processor.store(stream=output, config=config)
-    if config.meta:
-        return processor.get_meta()
-    else:
-        return None
+    pipeline = Pipeline(config)
+    return pipeline.process(
+        document=(text, parse_tree, speakers_list), output=output,
+        document_id=config.document_id)
 
 
 def meta_parameters(config):
@@ -242,6 +316,15 @@ def generate_parser():
     parser.add_argument(
         '--meta_json', dest='meta', action="store_true",
         help="Generate meta info during process.")
+    parser.add_argument(
+        '--preload', dest='preload', action="store_true",
+        help="Load every language resource at start instead of on first use.")
+    parser.add_argument(
+        '--trace', dest='trace', action="store", type=int, default=0,
+        help="Record the last TRACE decisions of the extractor and the sieves.")
+    parser.add_argument(
+        '--trace_file', dest='trace_file', action="store", default=None,
+        help="The file where the recorded decisions are written at the end, or on SIGUSR1.")
     return parser
 
 
@@ -279,6 +362,8 @@ def main(config_files=False):
 
     info = process(config=arguments, text=input_text, parse_tree=parse_tree,
                    speakers_list=speakers_list, output=sys.stdout)
+    if arguments.trace and arguments.trace_file:
+        trace.dump_file(arguments.trace_file)
     if info:
         with codecs.open("info.json", "w") as output_file:
             json.dump(info, output_file)
@@ -0,0 +1,235 @@
+# coding=utf-8
+""" Pre-forked pool of corpus workers.
+
+The pipeline is loaded in the parent process, with every resource, sieve and
+annotator, before the workers are forked; the workers share those pages
+copy-on-write instead of loading them again. Each worker receives the files
+one by one through its own pipe and answers with the result of each file, so
+the parent always knows the file of each worker:
+
++ The results are returned in the order of the files.
++ A worker that spends more than the timeout in a file is killed, and a
+  worker that dies (a crash of the parser, the memory killer...) is replaced
+  by a new fork of the parent. The file is reported as failed and the rest of
+  the corpus continues.
++ The logs of each worker go to the log file of the file in process.
+"""
+
+import logging
+import select
+import time
+from collections import deque
+
+try:
+    from multiprocessing import get_context
+    # The workers must be forked to share the loaded pipeline
+    _multiprocessing = get_context("fork")
+except ImportError:
+    import multiprocessing as _multiprocessing
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+logger = logging.getLogger(__name__)
+
+DONE = "done"
+ERROR = "error"
+TIMEOUT = "timeout"
+CRASH = "crash"
+
+# The handler of the logs of this process, set by route_logs
+_log_handler = None
+
+
+class DocumentLogHandler(logging.Handler):
+    """ Write the records into the log file of the document in process."""
+
+    def __init__(self, formatter=None):
+        logging.Handler.__init__(self)
+        self.setFormatter(formatter)
+        self.stream = None
+
+    def open(self, filename):
+        """ Write the next records into a new log file.
+
+        :param filename: The path of the log file.
+        """
+        self.acquire()
+        try:
+            self.close_document()
+            self.stream = open(filename, "w")
+        finally:
+            self.release()
+
+    def close_document(self):
+        """ Close the log file of the document."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def emit(self, record):
+        if self.stream is None:
+            return
+        try:
+            self.stream.write(self.format(record) + "\n")
+            self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+
+def route_logs(filename):
+    """ Send the logs of this process to a log file. The handlers of the
+    loggers are replaced only the first time; the next calls only change the
+    log file.
+
+    :param filename: The path of the log file.
+    """
+    global _log_handler
+    if _log_handler is None:
+        formatter = None
+        for handler in logging.getLogger("corefgraph").handlers:
+            formatter = handler.formatter
+        _log_handler = DocumentLogHandler(formatter)
+        loggers = [logging.getLogger()] + [
+            logging.getLogger(name) for name in list(logging.Logger.manager.loggerDict)
+            if not name.startswith("pycorpus")]
+        for handled_logger in loggers:
+            if handled_logger.handlers:
+                for handler in list(handled_logger.handlers):
+                    handled_logger.removeHandler(handler)
+                handled_logger.addHandler(_log_handler)
+    _log_handler.open(filename)
+
+
+class WorkerPool(object):
+    """ Process a list of files with a function in forked worker processes."""
+
+    def __init__(self, function, config, workers, timeout=None, finish=None):
+        """ Prepare the pool. Load everything that the workers must share
+        before creating it.
+
+        :param function: The function called with each file and the config.
+            Its returned value must be picklable.
+        :param config: The configuration passed to the function.
+        :param workers: The number of worker processes.
+        :param timeout: The seconds that a file can take, None for no limit.
+        :param finish: A function called with the config in each worker when
+            it is stopped after its last file. Not called in the killed
+            workers.
+        """
+        self.function = function
+        self.config = config
+        self.workers = max(1, workers)
+        self.timeout = timeout or None
+        self.finish = finish
+
+    def _work(self, connection):
+        """ The loop of a worker: process the files received until a None."""
+        while True:
+            try:
+                task = connection.recv()
+            except EOFError:
+                break
+            if task is None:
+                break
+            index, file_name = task
+            start = time.time()
+            value = None
+            try:
+                value = self.function(file_name, self.config)
+                status, message = DONE, None
+            except Exception as ex:
+                logger.exception("Error processing %s", file_name)
+                status, message = ERROR, "{0}: {1}".format(type(ex).__name__, ex)
+            connection.send((index, status, time.time() - start, message, value))
+        connection.close()
+        if self.finish is not None:
+            try:
+                self.finish(self.config)
+            except Exception:
+                logger.exception("Error finishing worker")
+
+    def _start_worker(self):
+        parent_connection, child_connection = _multiprocessing.Pipe()
+        process = _multiprocessing.Process(target=self._work, args=(child_connection,))
+        process.daemon = True
+        process.start()
+        child_connection.close()
+        return process, parent_connection
+
+    @staticmethod
+    def _stop_worker(process, connection, kill=False):
+        if kill:
+            process.terminate()
+        else:
+            try:
+                connection.send(None)
+            except (IOError, OSError):
+                process.terminate()
+        process.join()
+        connection.close()
+
+    def run(self, files):
+        """ Process the files.
+
+        :param files: The list of files.
+        :return: A generator of the result of each file in the order of the
+            files: The file name, the status (done, error, timeout or crash),
+            the seconds spent, the error message or None and the value
+            returned by the function (None if it fails).
+        """
+        files = list(files)
+        pending = deque(enumerate(files))
+        # The workers by connection and the file in process of the busy ones
+        workers = dict((connection, process) for process, connection in (
+            self._start_worker() for _ in range(min(self.workers, len(files)))))
+        busy = {}
+        results = {}
+        next_result = 0
+        try:
+            while next_result < len(files):
+                for connection in list(workers):
+                    if connection not in busy and pending:
+                        task = pending.popleft()
+                        try:
+                            connection.send(task)
+                        except (IOError, OSError):
+                            # The worker died while it was idle
+                            pending.appendleft(task)
+                            self._stop_worker(workers.pop(connection), connection, kill=True)
+                            process, connection = self._start_worker()
+                            workers[connection] = process
+                            continue
+                        busy[connection] = (task[0], time.time())
+                ready, _, _ = select.select(list(busy), [], [], 1)
+                for connection in ready:
+                    index, started = busy.pop(connection)
+                    try:
+                        result_index, status, elapsed, message, value = connection.recv()
+                    except (EOFError, IOError, OSError):
+                        process = workers.pop(connection)
+                        process.join()
+                        logger.warning("Worker crashed with %s processing %s", process.exitcode, files[index])
+                        results[index] = (CRASH, time.time() - started,
+                                          "Worker exit code {0}".format(process.exitcode), None)
+                        connection.close()
+                        process, connection = self._start_worker()
+                        workers[connection] = process
+                        continue
+                    results[result_index] = (status, elapsed, message, value)
+                if self.timeout:
+                    now = time.time()
+                    for connection, (index, started) in list(busy.items()):
+                        if now - started > self.timeout:
+                            del busy[connection]
+                            self._stop_worker(workers.pop(connection), connection, kill=True)
+                            logger.warning("Timeout processing %s", files[index])
+                            results[index] = (TIMEOUT, now - started, "More than {0} s".format(self.timeout), None)
+                            process, connection = self._start_worker()
+                            workers[connection] = process
+                while next_result in results:
+                    status, elapsed, message, value = results.pop(next_result)
+                    yield files[next_result], status, elapsed, message, value
+                    next_result += 1
+        finally:
+            for connection, process in workers.items():
+                self._stop_worker(process, connection, kill=connection in busy)
@@ -0,0 +1,432 @@
+#!/usr/bin/python
+# coding=utf-8
+""" Resident coreference server.
+
+The language resources, the sieves, catchers, filters, purges, annotators and
+writers are loaded once, when the server starts, before the worker processes
+are forked; the workers share them copy-on-write instead of loading them
+again. The documents are received through HTTP, over a TCP port or a Unix
+socket, and resolved by the pool of workers, each one with the pipeline of
+each language served. The pipelines of every language are kept warm in every
+worker, so documents in different languages are interleaved without reloading
+anything. The response of each document is the output of the writer selected
+at start. A document that takes more than --timeout seconds is answered with
+a 504 error.
+
++ POST / : The body is the NAF document. A JSON body (Content-Type
+  application/json) may also contain the treebank trees and the speakers:
+  {"naf": ..., "treebank": ..., "speakers": ..., "document_id": ...,
+  "language": ...}. The document id and the language can also be given in the
+  query string (?document_id=...&language=...). The language must be the
+  language of the server or one of its extra languages.
++ GET /stats : The request counters, the queue depth and the latencies, in
+  JSON.
+"""
+import json
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from collections import deque
+from multiprocessing import TimeoutError
+
+try:
+    from multiprocessing import get_context
+    # The workers must be forked to share the loaded pipelines
+    _multiprocessing = get_context("fork")
+except ImportError:
+    import multiprocessing as _multiprocessing
+
+try:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn, TCPServer
+    from urlparse import urlparse, parse_qs
+except ImportError:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn, TCPServer
+    from urllib.parse import urlparse, parse_qs
+
+from copy import copy
+
+import configargparse
+
+from corefgraph.process.file import generate_parser as generate_parser_for_file, Pipeline
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+logger = logging.getLogger(__name__)
+
+# The seconds that the handler waits for a worker after its timeout
+TIMEOUT_GRACE = 1.0
+
+# The pipelines by language, loaded before the workers are forked
+_pipelines = {}
+
+
+def served_languages(config):
+    """ The languages served with a configuration: its language first and
+    then its extra languages.
+
+    :param config: The configuration of the server.
+    """
+    languages = [config.language]
+    for language in getattr(config, "languages", None) or ():
+        if language not in languages:
+            languages.append(language)
+    return languages
+
+
+def _load_pipelines(config):
+    """ Load the pipelines, one for each language served, with every
+    processor and resource, so the worker processes forked after this
+    inherit them warm.
+
+    :param config: The configuration of the pipelines.
+    """
+    for language in served_languages(config):
+        language_config = copy(config)
+        language_config.language = language
+        language_config.preload = True
+        _pipelines[language] = Pipeline(language_config)
+
+
+class ResponseBuffer(object):
+    """ The output stream of a document. The writers may write str or unicode
+    (as the NAF writer), so the unicode chunks are encoded.
+    """
+
+    def __init__(self, encoding):
+        """
+        :param encoding: The encoding of the unicode chunks.
+        """
+        self.encoding = encoding
+        self.chunks = []
+
+    def write(self, data):
+        if not isinstance(data, bytes):
+            data = data.encode(self.encoding)
+        self.chunks.append(data)
+
+    def getvalue(self):
+        """ The bytes written."""
+        return b"".join(self.chunks)
+
+
+class ResolveError(Exception):
+    """ A document could not be resolved in a worker process. Only the
+    message of the original error is kept, because some errors (as the lxml
+    ones) can not be sent back from the worker.
+    """
+
+
+class ResolveTimeout(ResolveError):
+    """ A document took more than the timeout of the server."""
+
+
+def _alarm(signum, frame):
+    raise ResolveTimeout("More than the timeout")
+
+
+def _resolve(document, document_id, language, encoding, timeout=None):
+    """ Resolve a document in a worker process.
+
+    :param document: The tuple of the NAF, the trees and the speakers.
+    :param document_id: The id of the document used by the writer.
+    :param language: The language of the document, one of the served.
+    :param encoding: The encoding of the response.
+    :param timeout: The seconds that the document can take, None for no
+        limit. The document is interrupted after them, so the worker is free
+        for the next one.
+    :return: The writer output and the processing time.
+    """
+    start = time.time()
+    output = ResponseBuffer(encoding)
+    if timeout:
+        signal.signal(signal.SIGALRM, _alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        _pipelines[language].process(document=document, output=output, document_id=document_id)
+    except ResolveTimeout:
+        logger.warning("Timeout resolving document %s", document_id)
+        raise ResolveTimeout("More than {0} s".format(timeout))
+    except Exception as ex:
+        logger.exception("Error resolving document %s", document_id)
+        raise ResolveError("{0}: {1}".format(type(ex).__name__, ex))
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return output.getvalue(), time.time() - start
+
+
+class ServerStats(object):
+    """ Counters and latencies of the requests of the server."""
+
+    def __init__(self, workers, window=1000):
+        """ Prepare the counters.
+
+        :param workers: The number of workers that resolve documents.
+        :param window: The number of last requests used for the latencies.
+        """
+        self.lock = threading.Lock()
+        self.workers = workers
+        self.started = time.time()
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.latencies = deque(maxlen=window)
+        self.processing = deque(maxlen=window)
+
+    def queue_depth(self):
+        """ The requests waiting for a free worker."""
+        return max(0, self.in_flight - self.workers)
+
+    def start_request(self):
+        """ Register a new request.
+
+        :return: The queue depth when the request arrives.
+        """
+        with self.lock:
+            self.in_flight += 1
+            return self.queue_depth()
+
+    def end_request(self, latency, processing=None, timed_out=False):
+        """ Register the end of a request.
+
+        :param latency: The time since the request arrived.
+        :param processing: The time spent by the worker, None if the
+            request failed.
+        :param timed_out: The request failed because of the timeout.
+        """
+        with self.lock:
+            self.in_flight -= 1
+            self.requests += 1
+            self.latencies.append(latency)
+            if timed_out:
+                self.timeouts += 1
+            if processing is None:
+                self.errors += 1
+            else:
+                self.processing.append(processing)
+
+    @staticmethod
+    def _summary(times):
+        """ The mean, median, 95th percentile and max of a list of times, in
+        milliseconds."""
+        if not times:
+            return {}
+        times = sorted(times)
+        return {
+            "mean": sum(times) / len(times) * 1000,
+            "p50": times[len(times) // 2] * 1000,
+            "p95": times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+            "max": times[-1] * 1000,
+        }
+
+    def get_stats(self):
+        """ Get the counters in a json compatible structure."""
+        with self.lock:
+            return {
+                "uptime": time.time() - self.started,
+                "workers": self.workers,
+                "requests": self.requests,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queue_depth(),
+                "latency_ms": self._summary(self.latencies),
+                "processing_ms": self._summary(self.processing),
+            }
+
+
+class CorefgraphRequestHandler(BaseHTTPRequestHandler):
+    """ Resolve the posted documents and report the server stats."""
+
+    def log_message(self, message_format, *args):
+        logger.debug(message_format, *args)
+
+    def _send(self, code, body, content_type="text/plain", headers=()):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for header, value in headers:
+            self.send_header(header, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlparse(self.path).path != "/stats":
+            self._send(404, b"Not found\n")
+            return
+        self._send(
+            200, json.dumps(self.server.stats.get_stats()).encode("utf-8"),
+            content_type="application/json")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path not in ("/", "/resolve"):
+            self._send(404, b"Not found\n")
+            return
+        start = time.time()
+        queue_depth = self.server.stats.start_request()
+        processing = None
+        code = 500
+        timeout = self.server.timeout
+        try:
+            document, document_id, language = self._read_document(parse_qs(url.query))
+            if language is None:
+                language = self.server.languages[0]
+            elif language not in self.server.languages:
+                raise ValueError("Language not served: {0}".format(language))
+            result = self.server.pool.apply_async(_resolve, (document, document_id, language, self.server.encoding, timeout))
+            if timeout:
+                # The time in the queue also counts
+                output, processing = result.get(max(timeout - (time.time() - start), 0) + TIMEOUT_GRACE)
+            else:
+                output, processing = result.get()
+            code = 200
+        except (ResolveTimeout, TimeoutError):
+            logger.warning("Timeout resolving document after %s s", timeout)
+            output = "More than {0} s\n".format(timeout).encode("utf-8")
+            code = 504
+        except Exception as ex:
+            logger.warning("Error resolving document: %s", ex)
+            output = "{0}\n".format(ex).encode("utf-8")
+        latency = time.time() - start
+        self.server.stats.end_request(latency, processing, timed_out=code == 504)
+        self._send(
+            code, output,
+            content_type="text/plain; charset={0}".format(self.server.encoding),
+            headers=(("X-Latency-Ms", "{0:.3f}".format(latency * 1000)),
+                     ("X-Queue-Depth", str(queue_depth))))
+
+    def _read_document(self, query):
+        """ Read the document of the request.
+
+        :param query: The parsed query string of the request.
+        :return: The document tuple, the document id and the language (None
+            if the request does not set it).
+        """
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        document_id = query.get("document_id", [None])[0]
+        language = query.get("language", [None])[0]
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            request = json.loads(body.decode(self.server.encoding))
+            return ((request["naf"], request.get("treebank"), request.get("speakers")),
+                    request.get("document_id", document_id), request.get("language", language))
+        return (body.decode(self.server.encoding), None, None), document_id, language
+
+
+class CorefgraphServer(ThreadingMixIn, HTTPServer):
+    """ HTTP server over TCP that resolves documents with a worker pool."""
+
+    daemon_threads = True
+
+    def __init__(self, server_address, pool, stats, encoding, languages, timeout=None):
+        HTTPServer.__init__(self, server_address, CorefgraphRequestHandler)
+        self.pool = pool
+        self.stats = stats
+        self.encoding = encoding
+        self.languages = languages
+        self.timeout = timeout or None
+
+
+class UnixCorefgraphServer(CorefgraphServer):
+    """ HTTP server over a Unix socket that resolves documents with a worker
+    pool."""
+
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        TCPServer.server_bind(self)
+        self.server_name = self.server_address
+        self.server_port = 0
+
+    def get_request(self):
+        request, _ = self.socket.accept()
+        # Unix sockets have no client address, but the handler expects one
+        return request, ("unix", 0)
+
+
+def generate_parser():
+    """ Parse command line arguments and get the values needed to serve.
+    Inherited all the properties of the file processor.
+
+    :return The parser
+    """
+    parser = configargparse.ArgumentParser(
+        parents=[generate_parser_for_file()], add_help=False)
+    parser.add_argument(
+        '--host', dest='host', action='store', default="127.0.0.1",
+        help="The address where the server listens.")
+    parser.add_argument(
+        '--port', '-p', dest='port', action='store', type=int, default=8080,
+        help="The TCP port where the server listens.")
+    parser.add_argument(
+        '--socket', dest='socket', action='store', default=None,
+        help="Listen in this Unix socket instead of a TCP port.")
+    parser.add_argument(
+        '--workers', dest='workers', action='store', type=int, default=1,
+        help="The number of processes that resolve documents.")
+    parser.add_argument(
+        '--languages', dest='languages', action='append', default=[],
+        help="Another language served, selected with the language of each request.")
+    parser.add_argument(
+        '--stats_window', dest='stats_window', action='store', type=int,
+        default=1000, help="The number of last requests used in latency stats.")
+    parser.add_argument(
+        '--timeout', dest='timeout', action='store', type=float, default=0,
+        help="The seconds that a document can take before a 504 error, 0 for no limit.")
+    return parser
+
+
+def create_server(config):
+    """ Load the resources, start the workers and create the server.
+
+    :param config: The configuration of the pipeline and the server.
+    :return: The server, ready to serve_forever.
+    """
+    # Load everything before the workers are forked, so they inherit it warm
+    _load_pipelines(config)
+    pool = _multiprocessing.Pool(processes=config.workers)
+    stats = ServerStats(workers=config.workers, window=config.stats_window)
+    languages = served_languages(config)
+    if config.socket:
+        server = UnixCorefgraphServer(
+            config.socket, pool, stats, config.encoding, languages, config.timeout)
+        logger.info("Listening in %s", config.socket)
+    else:
+        server = CorefgraphServer(
+            (config.host, config.port), pool, stats, config.encoding, languages, config.timeout)
+        logger.info("Listening in %s:%s", config.host, server.server_port)
+    return server
+
+
+def main(config_files=False):
+    """ Invoked when the module is uses directly from as CLI tool.
+
+    :param config_files: The name of the parameter file
+    """
+    parser = generate_parser()
+    if config_files:
+        parser._default_config_files = config_files
+    arguments = parser.parse_args()
+    server = create_server(arguments)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Stopping server")
+    finally:
+        server.server_close()
+        server.pool.terminate()
+        if arguments.socket and os.path.exists(arguments.socket):
+            os.remove(arguments.socket)
+
+
+if __name__ == "__main__":
+    main()
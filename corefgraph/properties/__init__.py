@@ -45,56 +45,21 @@ module_path = os.path.split(__path__[0])[0]
 
 
 def set_lang(lang_code, encoding_code):
-    """ set the module properties from  a specific language properties
+    """ set the module properties from  a specific language properties and
+    activate the language context of the language, created the first time.
 
 
     :param lang_code: A string that determines de language used in the system. lowercase and
+    :param encoding_code: The encoding of the documents.
+    :return: The language context.
     """
     logger = logging.getLogger(__name__)
     try:
-        lang_properties = __import__("properties_{0}".format(lang_code), globals=globals(), locals=locals())
+        __import__("properties_{0}".format(lang_code), globals=globals(), locals=locals())
     except ImportError as io:
         logger.error("No module for language %s", lang_code)
         exit(-1)
-    global encoding
-
-    global lang
-    global pos_tag_set
-    global constituent_tag_set
-    global ner_tag_set
-    global dep_tag_set
-
-    encoding = encoding_code
-    if lang and lang == lang_code:
-        return
-    lang = lang_properties.lang
-    try:
-        pos_tag_set = lang_properties.pos_tag_set
-    except Exception as Ex:
-        logger.warning("Warning using default Part Of Speech tagset.", )
-        logger.exception("Exception")
-        pos_tag_set = default_pos_tag_set
-    try:
-        constituent_tag_set = lang_properties.constituent_tag_set
-    except Exception as Ex:
-        logger.warning("Warning using default constituent tagset.", )
-        logger.exception("Exception")
-        constituent_tag_set = default_constituent_tag_set
-    try:
-        ner_tag_set = lang_properties.ner_tag_set
-    except Exception as Ex:
-        logger.warning("Warning using default Named Entity tagset.", )
-        logger.exception("Exception")
-        ner_tag_set = default_ner_tag_set
-    try:
-        dep_tag_set = lang_properties.dep_tag_set
-    except Exception as Ex:
-        logger.warning("Warning using default dependency tagset.", )
-        logger.exception("Exception")
-        dep_tag_set = default_dep_tag_set
-
-    logger.info("Language: %s.", lang)
-    logger.info("Part of speech: %s.", pos_tag_set)
-    logger.info("Constituent TagSet: %s.", constituent_tag_set)
-    logger.info("Dependency: %s.", dep_tag_set)
-    logger.info("Named entities: %s.", ner_tag_set)
+    from corefgraph.resources.language import LanguageContext
+    context = LanguageContext.get(lang_code, encoding_code)
+    context.activate()
+    return context
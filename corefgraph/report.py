@@ -0,0 +1,61 @@
+# coding=utf-8
+""" The meta info report of a document.
+
+The analytics of a document (histograms, counters, the catchers, filters,
+purges and sieves results...) are not collected while the document is
+processed. Each part of the system adds to the report a section with the
+function that computes it, and the section is only computed the first time a
+consumer asks for it.
+"""
+
+from collections import OrderedDict
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+
+class Report(object):
+    """ A lazily computed meta info report. The sections are reached as the
+    items of a dict.
+    """
+
+    def __init__(self):
+        self._sections = OrderedDict()
+        self._values = {}
+
+    def add(self, name, function, *args):
+        """ Add a section, or replace it.
+
+        :param name: The name of the section.
+        :param function: The function that computes the section.
+        :param args: The arguments of the function.
+        """
+        self._sections[name] = (function, args)
+        self._values.pop(name, None)
+
+    def __getitem__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            function, args = self._sections[name]
+            value = self._values[name] = function(*args)
+            return value
+
+    def __contains__(self, name):
+        return name in self._sections
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self):
+        return len(self._sections)
+
+    def keys(self):
+        """ The names of the sections."""
+        return list(self._sections)
+
+    def to_dict(self):
+        """ Compute every section.
+
+        :return: A dict of the sections by name.
+        """
+        return dict((name, self[name]) for name in self._sections)
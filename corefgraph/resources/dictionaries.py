@@ -1,22 +1,22 @@
 # coding=utf-8
+""" The dictionaries of the active language context. There is a view for each
+dictionary module of any language; each dictionary module is imported the
+first time it is used.
+"""
 
-from corefgraph.properties import lang, default_lang
-from logging import getLogger
-from importlib import import_module
-from os import walk
+from os import path, walk
 
-__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
-
-logger = getLogger(__name__)
+from corefgraph.properties import module_path
+from corefgraph.resources.language import view
 
-
-_m = import_module("corefgraph.resources.languages.{0}.dictionaries".format(lang), __name__)
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
 
 
-for (dirpath, dirnames, filenames) in walk(_m.__path__[0]):
+for (dirpath, dirnames, filenames) in walk(path.join(module_path, "resources", "languages")):
+    if path.basename(dirpath) != "dictionaries":
+        continue
     for file in filenames:
         if file[0] == "_" or file[-3:] != ".py":
             continue
         name = file[:-3]
-        globals()[name] = import_module("corefgraph.resources.languages.{0}.dictionaries.{1}".format(lang, name), __name__)
-    break
+        globals()[name] = view(name)
@@ -1,28 +1,58 @@
 # coding=utf-8
-""" This modules load language specific gazetteers files into lists. As fallback create empty list for missing files or
-in case of unexpected errors.
+""" This modules load language specific gazetteers files into sets. As fallback create empty sets for missing files or
+in case of unexpected errors. If the compiled resource store of the language is built, its tables are used instead.
+
+The gazetteers of each language context are loaded the first time one of them is used. The names of this module
+are views of the gazetteers of the active language context.
 """
 
 import os
 from logging import getLogger
-from corefgraph.properties import lang, module_path
-from corefgraph.resources.files import utils
+from corefgraph.properties import module_path
+from corefgraph.resources.files import utils, store
+from corefgraph.resources.language import view
 
 __author__ = 'josubg'
 
 
 logger = getLogger(__name__)
-_name = os.path.join(module_path, "resources/languages/{0}/animate/animate_unigrams.txt".format(lang))
-try:
-    animate_words = utils.load_file(_name)
-except IOError as ex:
-    logger.warning("Error loading animate word file: %s", _name)
-    animate_words = ()
-
-_name = os.path.join(module_path, "resources/languages/{0}/animate/inanimate_unigrams.txt".format(lang))
-try:
-    inanimate_words = utils.load_file(_name)
-except IOError as ex:
-    logger.warning("Error loading inanimate word file: %s", _name)
-    inanimate_words = ()
 
+
+def load_tables(lang):
+    """ Load every animacy table of the language.
+
+    :param lang: The language code (as en or es).
+    :return: A dict of the tables by name.
+    """
+    _store = store.language_store(lang)
+    if _store is not None:
+        return {
+            "animate_words": _store.table("animate_words"),
+            "inanimate_words": _store.table("inanimate_words"),
+        }
+
+    tables = {}
+    _name = os.path.join(module_path, "resources/languages/{0}/animate/animate_unigrams.txt".format(lang))
+    try:
+        tables["animate_words"] = utils.load_file(_name)
+    except IOError as ex:
+        logger.warning("Error loading animate word file: %s", _name)
+        tables["animate_words"] = frozenset()
+
+    _name = os.path.join(module_path, "resources/languages/{0}/animate/inanimate_unigrams.txt".format(lang))
+    try:
+        tables["inanimate_words"] = utils.load_file(_name)
+    except IOError as ex:
+        logger.warning("Error loading inanimate word file: %s", _name)
+        tables["inanimate_words"] = frozenset()
+    return tables
+
+
+# The tables of load_tables
+TABLES = (
+    "animate_words",
+    "inanimate_words",
+)
+
+animate_words = view("animate_words")
+inanimate_words = view("inanimate_words")
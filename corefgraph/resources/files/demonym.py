@@ -1,28 +1,33 @@
 # coding=utf-8
 """ This modules load language specific gazetteers files into lists. As fallback create empty list for missing files or
 in case of unexpected errors.
+
+The lists of each language context are loaded the first time one of them is used. The names of this module are
+views of the lists of the active language context.
 """
 
 import os
 from logging import getLogger
-from corefgraph.properties import lang, module_path
+from corefgraph.properties import module_path
+from corefgraph.resources.language import view
 
 __author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
 __date__ = '5/30/14'
 
 logger = getLogger(__name__)
 
-demonyms = []
-locations = []
-locations_and_demonyms = []
-demonyms_locations_coincidences = set()
-demonym_by_location = {}
-locations_by_demonyms = {}
-
 
 def load_demonym_file(file_name):
-    """ Load the demonym and place in memory."""
-    global demonyms_locations_coincidences
+    """ Load the demonym and place in memory.
+
+    :param file_name: The name(path) of the file to load.
+    :return: A dict of the demonym lists by name.
+    """
+    demonyms = []
+    locations = []
+    locations_and_demonyms = []
+    demonym_by_location = {}
+    locations_by_demonyms = {}
 
     demonym_file = open(file_name)
     for line in demonym_file:
@@ -49,12 +54,50 @@ def load_demonym_file(file_name):
                 except KeyError:
                     locations_by_demonyms[demonym] = [line_location]
     locations_and_demonyms.extend(locations_and_demonyms)
-    demonyms_locations_coincidences = set(demonyms).intersection(locations)
+    return {
+        "demonyms": demonyms,
+        "locations": locations,
+        "locations_and_demonyms": locations_and_demonyms,
+        "demonyms_locations_coincidences": set(demonyms).intersection(locations),
+        "demonym_by_location": demonym_by_location,
+        "locations_by_demonyms": locations_by_demonyms,
+    }
+
+
+def load_tables(lang):
+    """ Load the demonym lists of the language.
+
+    :param lang: The language code (as en or es).
+    :return: A dict of the lists by name.
+    """
+    _name = "resources/languages/{0}/demonym/data.txt".format(lang)
+    try:
+        return load_demonym_file(os.path.join(module_path, _name))
+    except IOError as ex:
+        logger.warning("Demonym file %s error", _name)
+        return {
+            "demonyms": [],
+            "locations": [],
+            "locations_and_demonyms": [],
+            "demonyms_locations_coincidences": set(),
+            "demonym_by_location": {},
+            "locations_by_demonyms": {},
+        }
 
 
-_name = "resources/languages/{0}/demonym/data.txt".format(lang)
+# The lists of load_tables
+TABLES = (
+    "demonyms",
+    "locations",
+    "locations_and_demonyms",
+    "demonyms_locations_coincidences",
+    "demonym_by_location",
+    "locations_by_demonyms",
+)
 
-try:
-    load_demonym_file(os.path.join(module_path, _name))
-except IOError as ex:
-    logger.warning("Demonym file %s error", _name)
\ No newline at end of file
+demonyms = view("demonyms")
+locations = view("locations")
+locations_and_demonyms = view("locations_and_demonyms")
+demonyms_locations_coincidences = view("demonyms_locations_coincidences")
+demonym_by_location = view("demonym_by_location")
+locations_by_demonyms = view("locations_by_demonyms")
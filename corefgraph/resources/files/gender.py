@@ -1,55 +1,86 @@
 # coding=utf-8
-""" This modules load language specific gazetteers files into lists. As fallback create empty list for missing files or
-in case of unexpected errors.
+""" This modules load language specific gazetteers files into sets. As fallback create empty sets for missing files or
+in case of unexpected errors. If the compiled resource store of the language is built, its tables are used instead.
+
+The gazetteers of each language context are loaded the first time one of them is used. The names of this module
+are views of the gazetteers of the active language context.
 """
 
 import os
 from logging import getLogger
-from corefgraph.properties import lang, module_path
-from corefgraph.resources.files import utils
+from corefgraph.properties import module_path
+from corefgraph.resources.files import utils, store
+from corefgraph.resources.language import view
 
 __author__ = 'josubg'
 
 logger = getLogger(__name__)
 
-neutral_words = ()
-male_words = ()
-female_words = ()
-female_names = ()
-male_names = ()
-bergma_counter = {}
 
-_name = os.path.join(module_path, "resources/languages/{0}/gender/neutral_unigrams.txt".format(lang))
-try:
-    neutral_words = utils.load_file(_name)
-except IOError as ex:
-    logger.exception("Error loading neutral word file: %s", _name)
+def load_tables(lang):
+    """ Load every gender table of the language.
+
+    :param lang: The language code (as en or es).
+    :return: A dict of the tables by name.
+    """
+    _store = store.language_store(lang)
+    if _store is not None:
+        return dict((name, _store.table(name)) for name in TABLES)
 
+    tables = {
+        "neutral_words": frozenset(),
+        "male_words": frozenset(),
+        "female_words": frozenset(),
+        "female_names": frozenset(),
+        "male_names": frozenset(),
+        "bergma_counter": {},
+    }
+    _name = os.path.join(module_path, "resources/languages/{0}/gender/neutral_unigrams.txt".format(lang))
+    try:
+        tables["neutral_words"] = utils.load_file(_name)
+    except IOError as ex:
+        logger.exception("Error loading neutral word file: %s", _name)
 
-_name = os.path.join(module_path, "resources/languages/{0}/gender/male_unigrams.txt".format(lang))
-try:
-    male_words = utils.load_file(_name)
-except IOError as ex:
-    logger.warning("Error loading male word file: %s", _name)
+    _name = os.path.join(module_path, "resources/languages/{0}/gender/male_unigrams.txt".format(lang))
+    try:
+        tables["male_words"] = utils.load_file(_name)
+    except IOError as ex:
+        logger.warning("Error loading male word file: %s", _name)
 
+    _name = os.path.join(module_path, "resources/languages/{0}/gender/female_unigrams.txt".format(lang))
+    try:
+        tables["female_words"] = utils.load_file(_name)
+    except IOError as ex:
+        logger.warning("Error loading female word file: %s", _name)
 
-_name = os.path.join(module_path, "resources/languages/{0}/gender/female_unigrams.txt".format(lang))
-try:
-    female_words = utils.load_file(_name)
-except IOError as ex:
-    logger.warning("Error loading female word file: %s", _name)
+    _name = os.path.join(module_path, "resources/languages/{0}/gender/names_combine.txt".format(lang))
+    try:
+        tables["female_names"], tables["male_names"] = utils.split_gendername_file(_name)
+    except IOError as ex:
+        logger.warning("Error loading names file: %s", _name)
 
+    try:
+        tables["bergma_counter"] = utils.bergma_split(
+            os.path.join(module_path, "resources/languages/{0}/gender/data.txt".format(lang)))
+        logger.debug("Bergma dict: %i", len(tables["bergma_counter"]))
+    except IOError as ex:
+        logger.warning("Error loading Bersgma file")
+    return tables
 
-_name = os.path.join(module_path, "resources/languages/{0}/gender/names_combine.txt".format(lang))
-try:
-    female_names, male_names = utils.split_gendername_file(_name)
-except IOError as ex:
-    logger.warning("Error loading names file: %s", _name)
 
-try:
-    bergma_counter = utils.bergma_split(
-        os.path.join(module_path, "resources/languages/{0}/gender/data.txt".format(lang)))
-    logger.debug("Bergma dict: %i", len(bergma_counter))
-except IOError as ex:
-    logger.warning("Error loading Bersgma file")
+# The tables of load_tables
+TABLES = (
+    "neutral_words",
+    "male_words",
+    "female_words",
+    "female_names",
+    "male_names",
+    "bergma_counter",
+)
 
+neutral_words = view("neutral_words")
+male_words = view("male_words")
+female_words = view("female_words")
+female_names = view("female_names")
+male_names = view("male_names")
+bergma_counter = view("bergma_counter")
@@ -1,11 +1,15 @@
 # coding=utf-8
-""" This modules load language specific gazetteers files into lists. As fallback create empty list for missing files or
-in case of unexpected errors.
+""" This modules load language specific gazetteers files into sets. As fallback create empty sets for missing files or
+in case of unexpected errors. If the compiled resource store of the language is built, its tables are used instead.
+
+The gazetteers of each language context are loaded the first time one of them is used. The names of this module
+are views of the gazetteers of the active language context.
 """
 import os
 from logging import getLogger
 import corefgraph.properties as properties
-from corefgraph.resources.files import utils
+from corefgraph.resources.files import utils, store
+from corefgraph.resources.language import view
 
 __author__ = 'josubg'
 
@@ -13,19 +17,42 @@ logger = getLogger(__name__)
 
 # Unigrams files
 
-plural_words = ()
-singular_words = ()
-
-_name = os.path.join(
-    properties.module_path, "resources/languages/{0}/number/plural_unigrams.txt".format(properties.lang))
-try:
-    plural_words = utils.load_file(_name)
-except IOError as ex:
-    logger.warning("Error Loading plural word file: %s", _name)
-
-_name = os.path.join(
-    properties.module_path, "resources/languages/{0}/number/singular_unigrams.txt".format(properties.lang))
-try:
-    singular_words = utils.load_file(_name)
-except IOError as ex:
-    logger.warning("Error loading singular word file: %s", _name)
+
+def load_tables(lang):
+    """ Load every number table of the language.
+
+    :param lang: The language code (as en or es).
+    :return: A dict of the tables by name.
+    """
+    _store = store.language_store(lang)
+    if _store is not None:
+        return {
+            "plural_words": _store.table("plural_words"),
+            "singular_words": _store.table("singular_words"),
+        }
+
+    tables = {"plural_words": frozenset(), "singular_words": frozenset()}
+    _name = os.path.join(
+        properties.module_path, "resources/languages/{0}/number/plural_unigrams.txt".format(lang))
+    try:
+        tables["plural_words"] = utils.load_file(_name)
+    except IOError as ex:
+        logger.warning("Error Loading plural word file: %s", _name)
+
+    _name = os.path.join(
+        properties.module_path, "resources/languages/{0}/number/singular_unigrams.txt".format(lang))
+    try:
+        tables["singular_words"] = utils.load_file(_name)
+    except IOError as ex:
+        logger.warning("Error loading singular word file: %s", _name)
+    return tables
+
+
+# The tables of load_tables
+TABLES = (
+    "plural_words",
+    "singular_words",
+)
+
+plural_words = view("plural_words")
+singular_words = view("singular_words")
@@ -0,0 +1,392 @@
+# coding=utf-8
+""" Compiled resource store shared by every process through the page cache.
+
+The gazetteers and the Bergsma counters of a language are compiled into a
+single binary file that is memory mapped read-only. Each table keeps:
+
++ The keys (the bytes of the words) sorted and concatenated.
++ An offset table with the start of each key (and the end of the last one).
++ A hash index (CRC32, open addressing) with the position of each key.
++ The packed integer values of each key, for counter tables.
+
+The lookups hash the word and compare the mapped bytes, so no table is copied
+into the heap of the process and every worker shares one copy of the file. A
+word is found in the store only if it is found in the set or dict read from
+the text files (see _encode).
+
+Build the stores with:
+
+    corefgraph_resources [language ...]
+
+and compare them with the text files with:
+
+    corefgraph_resources --check [language ...]
+"""
+
+import mmap
+import os
+import struct
+import sys
+from logging import getLogger
+from zlib import crc32
+
+from corefgraph.resources.files import utils
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+logger = getLogger(__name__)
+
+STORE_NAME = "resources.bin"
+
+MAGIC = b"CGRS"
+VERSION = 1
+HEADER = struct.Struct("<4sII")
+# name, keys, values per key, hash buckets, offsets position, keys position,
+# values position, buckets position
+TABLE_HEADER = struct.Struct("<64sIIIQQQQ")
+OFFSET = struct.Struct("<I")
+BUCKET = struct.Struct("<I")
+EMPTY_BUCKET = 0xFFFFFFFF
+
+# The tables of a language store: The names of the tables, the source file
+# (relative to the language directory) and the function that reads it.
+TABLES = (
+    (("neutral_words",), "gender/neutral_unigrams.txt", utils.load_file),
+    (("male_words",), "gender/male_unigrams.txt", utils.load_file),
+    (("female_words",), "gender/female_unigrams.txt", utils.load_file),
+    (("female_names", "male_names"), "gender/names_combine.txt", utils.split_gendername_file),
+    (("bergma_counter",), "gender/data.txt", utils.load_bergma_file),
+    (("plural_words",), "number/plural_unigrams.txt", utils.load_file),
+    (("singular_words",), "number/singular_unigrams.txt", utils.load_file),
+    (("animate_words",), "animate/animate_unigrams.txt", utils.load_file),
+    (("inanimate_words",), "animate/inanimate_unigrams.txt", utils.load_file),
+)
+
+
+# The text loaders return native strings, so a word is a key of the store as
+# it compares with them: A python 2 unicode is only equal to the str of the
+# same ASCII characters, and a python 3 bytes is never equal to a str.
+if str is bytes:
+    def _encode(word):
+        """ The key of a word, or None if no key is equal to it."""
+        if isinstance(word, str):
+            return word
+        try:
+            return word.encode("ascii")
+        except (AttributeError, UnicodeError):
+            return None
+
+    def _decode(key):
+        return key
+else:
+    def _encode(word):
+        """ The key of a word, or None if no key is equal to it."""
+        if isinstance(word, str):
+            return word.encode("utf-8")
+        return None
+
+    def _decode(key):
+        return key.decode("utf-8")
+
+
+class ResourceTable(object):
+    """ A read-only table of a store. Used as the set or the dict of the
+    resource: supports in, get, len and iteration over the keys.
+    """
+
+    def __init__(self, data, count, width, buckets, offsets, keys, values, bucket_index):
+        self._data = data
+        self._count = count
+        self._width = width
+        self._buckets = buckets
+        self._offsets = offsets
+        self._keys = keys
+        self._values = values
+        self._bucket_index = bucket_index
+        self._value = struct.Struct("<{0}q".format(width)) if width else None
+
+    def _key(self, index):
+        start, end = struct.unpack_from(
+            "<II", self._data, self._offsets + OFFSET.size * index)
+        return self._data[self._keys + start:self._keys + end]
+
+    def _find(self, word):
+        """ Get the position of a word in the table.
+
+        :param word: The word to find.
+        :return: The position of the word or -1 if the word is not in the table.
+        """
+        if not self._buckets:
+            return -1
+        key = _encode(word)
+        if key is None:
+            return -1
+        slot = (crc32(key) & 0xFFFFFFFF) % self._buckets
+        while True:
+            index, = BUCKET.unpack_from(self._data, self._bucket_index + BUCKET.size * slot)
+            if index == EMPTY_BUCKET:
+                return -1
+            if self._key(index) == key:
+                return index
+            slot = (slot + 1) % self._buckets
+
+    def __contains__(self, word):
+        return self._find(word) >= 0
+
+    def get(self, word, default=None):
+        """ Get the values of a word.
+
+        :param word: The word to find.
+        :param default: The value returned if the word is not in the table.
+        :return: The tuple of integer values of the word or True if the
+            table has no values.
+        """
+        index = self._find(word)
+        if index < 0:
+            return default
+        if not self._width:
+            return True
+        return self._value.unpack_from(self._data, self._values + self._value.size * index)
+
+    def __getitem__(self, word):
+        value = self.get(word)
+        if value is None:
+            raise KeyError(word)
+        return value
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield _decode(self._key(index))
+
+
+class ResourceStore(object):
+    """ A compiled store mapped read-only in memory."""
+
+    def __init__(self, filename):
+        """ Map the store.
+
+        :param filename: The path of the store file.
+        """
+        self.filename = filename
+        with open(filename, "rb") as store_file:
+            self._data = mmap.mmap(store_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, tables = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise IOError("Not a resource store (version {0}): {1}".format(VERSION, filename))
+        self.tables = {}
+        for index in range(tables):
+            header = TABLE_HEADER.unpack_from(
+                self._data, HEADER.size + TABLE_HEADER.size * index)
+            name = header[0].rstrip(b"\0").decode("ascii")
+            self.tables[name] = ResourceTable(self._data, *header[1:])
+
+    def table(self, name):
+        """ Get a table of the store.
+
+        :param name: The name of the table.
+        """
+        return self.tables[name]
+
+
+def _pad(position):
+    return position + (-position % 8)
+
+
+def _compile_table(name, content):
+    """ Pack a table.
+
+    :param name: The name of the table.
+    :param content: An iterable of words or a dict of tuples of integers.
+    :return: The counts of the table header and its parts.
+    """
+    keys = sorted(set(_encode(word) for word in content))
+    width = len(next(iter(content.values()))) if isinstance(content, dict) and content else 0
+    by_key = dict((_encode(word), value) for word, value in content.items()) if width else {}
+
+    offsets = [0]
+    for key in keys:
+        offsets.append(offsets[-1] + len(key))
+    buckets = 2 * len(keys) + 1 if keys else 0
+    index = [EMPTY_BUCKET] * buckets
+    for position, key in enumerate(keys):
+        slot = (crc32(key) & 0xFFFFFFFF) % buckets
+        while index[slot] != EMPTY_BUCKET:
+            slot = (slot + 1) % buckets
+        index[slot] = position
+    value = struct.Struct("<{0}q".format(width))
+    return (
+        name, len(keys), width, buckets,
+        struct.pack("<{0}I".format(len(offsets)), *offsets),
+        b"".join(keys),
+        b"".join(value.pack(*by_key[key]) for key in keys) if width else b"",
+        struct.pack("<{0}I".format(buckets), *index))
+
+
+def build_store(filename, tables):
+    """ Compile the tables into a store file.
+
+    :param filename: The path of the store file.
+    :param tables: A dict of table names and its content; an iterable of
+        words or a dict of tuples of integers of the same length.
+    """
+    compiled = [_compile_table(name, content) for name, content in sorted(tables.items())]
+    position = HEADER.size + TABLE_HEADER.size * len(compiled)
+    headers, parts = [], []
+    for name, count, width, buckets, offsets, keys, values, index in compiled:
+        table_positions = []
+        for part in (offsets, keys, values, index):
+            position = _pad(position)
+            table_positions.append(position)
+            parts.append((position, part))
+            position += len(part)
+        headers.append(TABLE_HEADER.pack(
+            name.encode("ascii"), count, width, buckets, *table_positions))
+    temporal_filename = filename + ".tmp"
+    with open(temporal_filename, "wb") as store_file:
+        store_file.write(HEADER.pack(MAGIC, VERSION, len(compiled)))
+        for header in headers:
+            store_file.write(header)
+        for part_position, part in parts:
+            store_file.write(b"\0" * (part_position - store_file.tell()))
+            store_file.write(part)
+    os.rename(temporal_filename, filename)
+
+
+def language_path(language):
+    """ The directory of the resources of a language."""
+    from corefgraph.properties import module_path
+    return os.path.join(module_path, "resources", "languages", language)
+
+
+def load_text_tables(language):
+    """ Read the tables of a language from its text resources. The missing
+    resources are read as empty tables.
+
+    :param language: The language code (as en or es).
+    :return: A dict of table names and its content.
+    """
+    path = language_path(language)
+    tables = {}
+    for names, source, loader in TABLES:
+        source_filename = os.path.join(path, source)
+        if os.path.exists(source_filename):
+            content = loader(source_filename)
+            if len(names) == 1:
+                content = (content,)
+        else:
+            logger.warning("Missing resource, stored empty: %s", source_filename)
+            content = ((),) * len(names)
+        tables.update(zip(names, content))
+    return tables
+
+
+def build_language_store(language):
+    """ Compile the store of a language from its text resources. The missing
+    resources are stored as empty tables.
+
+    :param language: The language code (as en or es).
+    :return: The path of the store file.
+    """
+    filename = os.path.join(language_path(language), STORE_NAME)
+    build_store(filename, load_text_tables(language))
+    logger.info("Resource store built: %s", filename)
+    return filename
+
+
+def language_store(language):
+    """ Open the compiled store of a language.
+
+    :param language: The language code (as en or es).
+    :return: The store or None if it is not built or any of its source files
+        is newer than it.
+    """
+    path = language_path(language)
+    filename = os.path.join(path, STORE_NAME)
+    try:
+        store_time = os.path.getmtime(filename)
+    except OSError:
+        logger.debug("No resource store for %s", language)
+        return None
+    for names, source, loader in TABLES:
+        source_filename = os.path.join(path, source)
+        if os.path.exists(source_filename) and os.path.getmtime(source_filename) > store_time:
+            logger.warning("Resource store outdated, using text files: %s", filename)
+            return None
+    try:
+        return ResourceStore(filename)
+    except (IOError, ValueError, struct.error) as ex:
+        logger.warning("Resource store not loaded %s: %s", filename, ex)
+        return None
+
+
+def _probes(word):
+    """ The lookups of a word of a text table: the word, the word in the other
+    string type and the word with other case.
+    """
+    yield word
+    if isinstance(word, bytes):
+        try:
+            yield word.decode("utf-8")
+        except UnicodeError:
+            pass
+    else:
+        yield word.encode("utf-8")
+    yield word.upper()
+    yield word.lower()
+
+
+def check_language_store(language):
+    """ Compare the tables of the store of a language with the tables read
+    from its text resources: the words of each table and the result of the
+    lookups of each word (see _probes) must be the same.
+
+    :param language: The language code (as en or es).
+    :return: A list of the differences, as tuples of the table name, the word
+        and the text and store results.
+    """
+    store = ResourceStore(os.path.join(language_path(language), STORE_NAME))
+    differences = []
+    for name, content in sorted(load_text_tables(language).items()):
+        table = store.table(name)
+        if len(table) != len(content) or set(table) != set(content):
+            differences.append((name, None, len(content), len(table)))
+        for word in content:
+            for probe in _probes(word):
+                if isinstance(content, dict):
+                    expected, found = content.get(probe), table.get(probe)
+                else:
+                    expected, found = probe in content, probe in table
+                if expected != found:
+                    differences.append((name, probe, expected, found))
+    return differences
+
+
+def main(languages=None):
+    """ Build the resource stores of the languages given in the command
+    line, or of every language if none is given. With --check the built
+    stores are also compared with the text files, and the exit code is 1 if
+    any of them differs.
+    """
+    arguments = sys.argv[1:] if languages is None else list(languages)
+    check = "--check" in arguments
+    languages = [argument for argument in arguments if argument != "--check"] or sorted(
+        language for language in os.listdir(language_path(""))
+        if os.path.isdir(language_path(language)) and not language.startswith("_"))
+    differ = False
+    for language in languages:
+        sys.stdout.write("{0}\n".format(build_language_store(language)))
+        if check:
+            differences = check_language_store(language)
+            for difference in differences[:10]:
+                sys.stdout.write("  {0} {1!r}: text {2!r} store {3!r}\n".format(*difference))
+            sys.stdout.write("  {0}: {1} differences\n".format(language, len(differences)))
+            differ = differ or bool(differences)
+    if differ:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
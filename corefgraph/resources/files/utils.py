@@ -13,13 +13,13 @@ logger = logging.getLogger(__name__)
 
 
 def load_file(file_name):
-    """ Load a file into a line list and remove the next line ending character.
+    """ Load a file into a line set and remove the next line ending character.
 
     :param file_name: The name of the file to load
-    :return: A list of file lines
+    :return: A frozenset of file lines
     """
     data_file = open(file_name, 'r')
-    data = [line[:-1] for line in data_file]
+    data = frozenset(line[:-1] for line in data_file)
     data_file.close()
     return data
 
@@ -32,22 +32,43 @@ def split_gendername_file(filename):
 
 
     :param filename: The name(path) of the file to load.
-    :return: return a female anf
+    :return: return a female and a male frozenset of words
     """
     combined = open(filename, 'r')
-    male = []
-    female = []
+    male = set()
+    female = set()
     for index, line in enumerate(combined):
         try:
             name, gender = line.replace('\n', '').split('\t')
             if gender == "MALE":
-                male.append(name)
+                male.add(name)
             elif gender == "FEMALE":
-                female.append(name)
+                female.add(name)
         except Exception as ex:
             logger.exception("ERROR in combine name file line: %s", index)
     combined.close()
-    return female, male
+    return frozenset(female), frozenset(male)
+
+
+def load_bergma_file(filename):
+    """ Load the bergsma file into a dict of tuples.
+
+    The file is a two column per line text file: The first column is the form
+    and the second the counts separated by spaces.
+
+    :param filename: The name(path) of the file to load.
+    :return: A dict of tuples of counts by form.
+    """
+    with open(filename, 'r') as data_file:
+        data = dict()
+        for index, line in enumerate(data_file):
+            try:
+                form, stats = line.split("\t")
+                data[form] = tuple([int(x) for x in stats.split()])
+            except Exception as ex:
+                pass
+                logger.debug("line(%s) sipped: %s", index, ex)
+    return data
 
 
 def bergma_split(filename):
@@ -63,21 +84,13 @@ def bergma_split(filename):
     except IOError as ex:
         logger.info("No marshal file")
         logger.debug("Reason: %s", ex)
-        with open(filename, 'r') as data_file:
-            data = dict()
-            for index, line in enumerate(data_file):
-                try:
-                    form, stats = line.split("\t")
-                    data[form] = tuple([int(x) for x in stats.split()])
-                except Exception as ex:
-                    pass
-                    logger.debug("line(%s) sipped: %s", index, ex)
-            try:
-                with open(marshal_filename, 'w') as store_file:
-                    marshal.dump(data, store_file, -1)
-                logger.warning("Created marshal file")
-                logger.debug("path: %s", marshal_filename)
-            except IOError as ex:
-                logger.warning("Marshal file not created %s", marshal_filename)
-                pass
+        data = load_bergma_file(filename)
+        try:
+            with open(marshal_filename, 'w') as store_file:
+                marshal.dump(data, store_file, -1)
+            logger.warning("Created marshal file")
+            logger.debug("path: %s", marshal_filename)
+        except IOError as ex:
+            logger.warning("Marshal file not created %s", marshal_filename)
+            pass
         return data
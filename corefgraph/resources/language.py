@@ -0,0 +1,240 @@
+# coding=utf-8
+""" Language contexts.
+
+A language context holds every resource of a language configuration: the
+tagsets, the rules, the dictionaries and the gazetteers. Each context is
+created once and kept, so a process can switch from one language to another
+without loading anything again.
+
+The modules that use the resources import them from the resources modules
+(tagset, rules, dictionaries and files) as always. Those names are views of the
+resources of the active context. Activate the context of a language before
+processing a document in that language.
+"""
+
+from importlib import import_module
+from logging import getLogger
+from operator import getitem
+from os import walk
+from types import ModuleType
+
+from corefgraph import properties
+from corefgraph.resources.lazy import LazyModule, LazyResource
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+logger = getLogger(__name__)
+
+# The views of the resources by name
+_views = {}
+# The contexts created by language configuration and encoding
+_contexts = {}
+# The context whose resources are bound to the views
+_active = None
+
+
+class ResourceView(object):
+    """ A resource of the active language context.
+
+    The attributes of a module resource are copied into the view the first
+    time one of them is used after each activation, so they cost the same as
+    in the module. Sets and dicts resources are reached through in, iteration,
+    len and indexing.
+    """
+
+    def __init__(self, name):
+        """ Create an unbound view.
+
+        :param name: The name of the resource in the contexts.
+        """
+        self._name = name
+        self._resource = None
+        self._copied = ()
+
+    def bind(self, resource):
+        """ Show a resource of a new active context.
+
+        :param resource: The resource or None if the context does not have it.
+        """
+        for attribute in self._copied:
+            del self.__dict__[attribute]
+        self._copied = ()
+        self._resource = resource
+
+    def _get(self):
+        if self._resource is None:
+            raise LookupError(
+                "No {0} resource in the active language context".format(self._name))
+        return self._resource
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        resource = self._get()
+        if isinstance(resource, LazyModule):
+            resource = resource.load()
+        if isinstance(resource, ModuleType) and not self._copied:
+            self._copied = tuple(
+                attribute for attribute in vars(resource)
+                if not attribute.startswith("__") and not hasattr(ResourceView, attribute) and
+                attribute not in self.__dict__)
+            for attribute in self._copied:
+                self.__dict__[attribute] = getattr(resource, attribute)
+        return getattr(resource, name)
+
+    def __contains__(self, item):
+        return item in self._get()
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def __len__(self):
+        return len(self._get())
+
+    def __getitem__(self, key):
+        return self._get()[key]
+
+    def __nonzero__(self):
+        return bool(self._get())
+
+    __bool__ = __nonzero__
+
+
+def view(name):
+    """ Get the view of a resource, created the first time.
+
+    :param name: The name of the resource in the contexts.
+    """
+    try:
+        return _views[name]
+    except KeyError:
+        resource_view = _views[name] = ResourceView(name)
+        if _active is not None:
+            resource_view.bind(_active.resources.get(name))
+        return resource_view
+
+
+class LanguageContext(object):
+    """ The tagsets, rules, dictionaries and gazetteers of a language
+    configuration. The dictionaries and gazetteers are lazy resources, loaded
+    the first time they are used.
+    """
+
+    def __init__(self, lang_code, encoding):
+        """ Load the resources of a language configuration.
+
+        :param lang_code: The name of the language configuration (as en_conll).
+        :param encoding: The encoding of the documents.
+        """
+        lang_properties = import_module("corefgraph.properties.properties_{0}".format(lang_code))
+        self.code = lang_code
+        self.encoding = encoding
+        self.lang = lang_properties.lang
+        self.pos_tag_set = self._tag_set(
+            lang_properties, "pos_tag_set", properties.default_pos_tag_set, "Part Of Speech")
+        self.constituent_tag_set = self._tag_set(
+            lang_properties, "constituent_tag_set", properties.default_constituent_tag_set, "constituent")
+        self.ner_tag_set = self._tag_set(
+            lang_properties, "ner_tag_set", properties.default_ner_tag_set, "Named Entity")
+        self.dep_tag_set = self._tag_set(
+            lang_properties, "dep_tag_set", properties.default_dep_tag_set, "dependency")
+
+        logger.info("Language: %s.", self.lang)
+        logger.info("Part of speech: %s.", self.pos_tag_set)
+        logger.info("Constituent TagSet: %s.", self.constituent_tag_set)
+        logger.info("Dependency: %s.", self.dep_tag_set)
+        logger.info("Named entities: %s.", self.ner_tag_set)
+
+        self.resources = {}
+        self._load_tagsets()
+        self._load_dictionaries()
+        self._load_rules()
+        self._load_gazetteers()
+
+    @staticmethod
+    def _tag_set(lang_properties, name, default, description):
+        try:
+            return getattr(lang_properties, name)
+        except Exception as Ex:
+            logger.warning("Warning using default %s tagset.", description)
+            logger.exception("Exception")
+            return default
+
+    def _load_tagsets(self):
+        for name, module, tag_set, default in (
+                ("pos_tags", "partofspeech", self.pos_tag_set, properties.default_pos_tag_set),
+                ("constituent_tags", "constituent", self.constituent_tag_set,
+                 properties.default_constituent_tag_set),
+                ("ner_tags", "namedentities", self.ner_tag_set, properties.default_ner_tag_set),
+                ("dependency_tags", "dependency", self.dep_tag_set, properties.default_dep_tag_set)):
+            try:
+                self.resources[name] = import_module(
+                    "corefgraph.resources.tagsets.{0}.{1}".format(tag_set, module))
+            except IOError:
+                logger.exception("Error loading %s tagset. Using default tagset", module)
+                self.resources[name] = import_module(
+                    "corefgraph.resources.tagsets.{0}.{1}".format(default, module))
+
+    def _load_dictionaries(self):
+        package = import_module("corefgraph.resources.languages.{0}.dictionaries".format(self.lang))
+        for (dirpath, dirnames, filenames) in walk(package.__path__[0]):
+            for file_name in filenames:
+                if file_name[0] == "_" or file_name[-3:] != ".py":
+                    continue
+                name = file_name[:-3]
+                self.resources[name] = LazyModule(
+                    "corefgraph.resources.languages.{0}.dictionaries.{1}".format(self.lang, name))
+            break
+
+    def _load_rules(self):
+        try:
+            self.resources["rules"] = import_module(
+                "corefgraph.resources.languages.{0}.rules".format(self.lang))
+        except (IOError, ImportError) as ex:
+            logger.exception("Resource fail (rules) loading default")
+            self.resources["rules"] = import_module(
+                "corefgraph.resources.languages.{0}.rules".format(properties.default_lang))
+
+    def _load_gazetteers(self):
+        from corefgraph.resources.files import animate, demonym, gender, number
+        for module in (gender, number, animate, demonym):
+            tables = LazyResource(module.load_tables, self.lang)
+            for name in module.TABLES:
+                self.resources[name] = LazyResource(getitem, tables, name)
+
+    def activate(self):
+        """ Bind the resources of this context to the views, and its
+        properties to the corefgraph properties.
+        """
+        global _active
+        properties.lang = self.lang
+        properties.encoding = self.encoding
+        properties.pos_tag_set = self.pos_tag_set
+        properties.constituent_tag_set = self.constituent_tag_set
+        properties.ner_tag_set = self.ner_tag_set
+        properties.dep_tag_set = self.dep_tag_set
+        if _active is self:
+            return
+        for name, resource_view in _views.items():
+            resource_view.bind(self.resources.get(name))
+        _active = self
+        logger.debug("Language context: %s", self.code)
+
+    @classmethod
+    def get(cls, lang_code, encoding):
+        """ Get the context of a language configuration, created the first
+        time.
+
+        :param lang_code: The name of the language configuration (as en_conll).
+        :param encoding: The encoding of the documents.
+        """
+        try:
+            return _contexts[(lang_code, encoding)]
+        except KeyError:
+            context = _contexts[(lang_code, encoding)] = cls(lang_code, encoding)
+            return context
+
+
+def active():
+    """ The active language context or None if no context is activated."""
+    return _active
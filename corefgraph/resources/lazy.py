@@ -0,0 +1,98 @@
+# coding=utf-8
+""" Proxies of the language resources that are loaded the first time they are
+used, so the resources that the configured annotators, filters and sieves never
+touch are never read.
+
+The proxies are registered when they are created; preload() loads every
+registered resource, to load them eagerly before the worker processes are
+forked.
+"""
+
+from logging import getLogger
+from importlib import import_module
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+logger = getLogger(__name__)
+
+# Every proxy created, in creation order
+_resources = []
+
+
+class LazyResource(object):
+    """ A set or dict resource loaded with its loader the first time it is
+    used. Supports in, iteration, len, indexing and the other methods of the
+    loaded resource.
+    """
+
+    def __init__(self, loader, *args):
+        """ Register the resource without loading it.
+
+        :param loader: The function that loads the resource.
+        :param args: The arguments of the loader.
+        """
+        self._loader = loader
+        self._args = args
+        self._resource = None
+        self._loaded = False
+        _resources.append(self)
+
+    def load(self):
+        """ Load the resource if is not loaded yet.
+
+        :return: The loaded resource.
+        """
+        if not self._loaded:
+            self._resource = self._loader(*self._args)
+            self._loaded = True
+        return self._resource
+
+    def __contains__(self, item):
+        return item in self.load()
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __nonzero__(self):
+        return bool(self.load())
+
+    __bool__ = __nonzero__
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+
+class LazyModule(LazyResource):
+    """ A module imported the first time one of its attributes is used. Once
+    imported, the attributes of the module are copied into the proxy, so the
+    next accesses cost the same as in the module.
+    """
+
+    def __init__(self, name):
+        """ Register the module without importing it.
+
+        :param name: The full name of the module.
+        """
+        super(LazyModule, self).__init__(import_module, name)
+
+    def load(self):
+        if self._loaded:
+            return self._resource
+        module = super(LazyModule, self).load()
+        for name, value in module.__dict__.items():
+            if name not in self.__dict__ and not name.startswith("__"):
+                self.__dict__[name] = value
+        return module
+
+
+def preload():
+    """ Load every resource registered until now."""
+    for resource in _resources:
+        resource.load()
+    logger.debug("Resources preloaded: %s", len(_resources))
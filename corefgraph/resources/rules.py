@@ -1,18 +1,8 @@
 # coding=utf-8
+""" The rules of the active language context."""
 
-from corefgraph.properties import lang, default_lang
-from logging import getLogger
-from importlib import import_module
+from corefgraph.resources.language import view
 
 __author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
 
-logger = getLogger(__name__)
-
-try:
-    rules = import_module("corefgraph.resources.languages.{0}.rules".format(lang), __name__)
-except IOError as ex:
-    logger.exception("Resource fail (rules) loading default")
-    rules = import_module("corefgraph.resources.languages.{0}.rules".format(default_lang), __name__)
-except ImportError as ex:
-    logger.exception("Resource fail (rules) loading default")
-    rules = import_module("corefgraph.resources.languages.{0}.rules".format(default_lang), __name__)
+rules = view("rules")
@@ -0,0 +1,119 @@
+# coding=utf-8
+""" Wall and CPU time, and item counts, of the stages of the resolution.
+
+Each processed document records its stages (reading, graph building, mention
+extraction, feature annotation, each sieve by its short name, purging and
+writing) in a Timings. The timings of many documents are merged into one to
+know where the time goes in a corpus.
+"""
+
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+__author__ = 'Josu Bermudez <josu.bermudez@deusto.es>'
+
+# The wall clock and the CPU time of the process
+wall_clock = getattr(time, "perf_counter", time.time)
+try:
+    cpu_clock = time.process_time
+except AttributeError:
+    cpu_clock = time.clock
+
+
+class Stage(object):
+    """ The time and the counts of a stage."""
+    __slots__ = ("name", "wall", "cpu", "documents", "counts")
+
+    def __init__(self, name):
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.documents = 0
+        self.counts = Counter()
+
+
+class Timings(object):
+    """ The stages of a document, or of a corpus, in the order they are first
+    recorded.
+    """
+
+    def __init__(self):
+        self.stages = OrderedDict()
+
+    def reset(self):
+        """ Discard the recorded stages."""
+        self.stages.clear()
+
+    def get_stage(self, name):
+        """ Get a stage, created the first time.
+
+        :param name: The name of the stage.
+        """
+        try:
+            return self.stages[name]
+        except KeyError:
+            stage = self.stages[name] = Stage(name)
+            return stage
+
+    @contextmanager
+    def measure(self, name):
+        """ Add the time spent inside the with block to a stage. The stage is
+        returned, to add its counts.
+
+        :param name: The name of the stage.
+        """
+        stage = self.get_stage(name)
+        wall, cpu = wall_clock(), cpu_clock()
+        try:
+            yield stage
+        finally:
+            stage.wall += wall_clock() - wall
+            stage.cpu += cpu_clock() - cpu
+
+    def get_meta(self):
+        """ The stages in json compatible values.
+
+        :return: A list with a dict for each stage with its name, wall and cpu
+            seconds and counts.
+        """
+        meta = []
+        for stage in self.stages.values():
+            stage_meta = {"stage": stage.name, "wall": stage.wall, "cpu": stage.cpu}
+            stage_meta.update(stage.counts)
+            meta.append(stage_meta)
+        return meta
+
+    def merge(self, meta):
+        """ Add the stages of a document to these ones.
+
+        :param meta: The stages of the document as returned by get_meta.
+        """
+        for stage_meta in meta:
+            stage = self.get_stage(stage_meta["stage"])
+            stage.documents += 1
+            for key, value in stage_meta.items():
+                if key == "wall":
+                    stage.wall += value
+                elif key == "cpu":
+                    stage.cpu += value
+                elif key != "stage":
+                    stage.counts[key] += value
+
+    def write_csv(self, stream):
+        """ Write the merged stages as comma separated values: the name, the
+        documents, the total and per document wall and CPU seconds, and each
+        count.
+
+        :param stream: The stream where the values are written.
+        """
+        counts = sorted(set(key for stage in self.stages.values() for key in stage.counts))
+        stream.write(",".join(
+            ["stage", "documents", "wall", "cpu", "wall_per_document", "cpu_per_document"] + counts) + "\n")
+        for stage in self.stages.values():
+            documents = stage.documents or 1
+            stream.write(",".join(
+                [stage.name, str(stage.documents),
+                 "{0:.6f}".format(stage.wall), "{0:.6f}".format(stage.cpu),
+                 "{0:.6f}".format(stage.wall / documents), "{0:.6f}".format(stage.cpu / documents)] +
+                [str(stage.counts.get(key, 0)) for key in counts]) + "\n")
@@ -78,6 +78,8 @@ setup(
     entry_points={
         'console_scripts': [
             'corefgraph=corefgraph.process.file:main',
-            'corefgraph_corpus=corefgraph.process.corpus:main']
+            'corefgraph_corpus=corefgraph.process.corpus:main',
+            'corefgraph_server=corefgraph.process.server:main',
+            'corefgraph_resources=corefgraph.resources.files.store:main']
     }
 )